@@ -1,34 +1,73 @@
-from langchain_groq import ChatGroq
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import SystemMessage, HumanMessage
-from langchain.memory import ConversationBufferMemory
 import os
+import sys
+import time
 from dotenv import load_dotenv
+from utils.telemetry import CallRecord, estimate_tokens, telemetry
+from agents.model_router import AUTO_MODEL, ModelRouter, estimate_cost, estimate_latency_ms, is_timeout_error
 
 # Load environment variables
 load_dotenv()
 
+# Messages an agent keeps as conversation history; older ones are dropped
+AGENT_MEMORY_MAX_MESSAGES = int(os.getenv("AGENT_MEMORY_MAX_MESSAGES", "20"))
+
+# langchain_core and langchain_groq are imported inside the methods that need them, so
+# agents that never call the LLM (MonitorAgent, RoadmapAgent without an API key)
+# don't pay for importing the LLM stack
+
 class BaseAgent:
     """Base agent configuration for all specialized agents"""
     
     def __init__(self, model_name=None):
         self.model_name = model_name or os.getenv("DEFAULT_MODEL", "llama3-70b-8192")
-        self.llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model_name=self.model_name
-        )
-        self.memory = ConversationBufferMemory(return_messages=True)
         
+        # "auto" routes each call to a model; the largest one is the cost/latency baseline
+        self.router = None
+        if self.model_name == AUTO_MODEL:
+            self.router = ModelRouter.from_env()
+            self.model_name = self.router.largest_model
+        
+        from langchain_core.chat_history import InMemoryChatMessageHistory
+        
+        # Chat model clients are created on first call, see get_llm()
+        self._llms = {}
+        self.memory = InMemoryChatMessageHistory()
+        
+    @property
+    def llm(self):
+        """Chat model client for the agent's model, created on first use"""
+        return self.get_llm(self.model_name)
+        
+    def get_llm(self, model_name):
+        """Get a (cached) chat model client for the given model"""
+        if model_name not in self._llms:
+            from langchain_groq import ChatGroq
+            
+            options = {}
+            if self.router is not None and self.router.timeout_s:
+                options["timeout"] = self.router.timeout_s
+            self._llms[model_name] = ChatGroq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                model_name=model_name,
+                **options
+            )
+        return self._llms[model_name]
+    
     def create_system_prompt(self, instructions):
         """Create a system prompt with the given instructions"""
+        from langchain_core.messages import SystemMessage
         return SystemMessage(content=instructions)
     
     def create_human_message(self, content):
         """Create a human message with the given content"""
+        from langchain_core.messages import HumanMessage
         return HumanMessage(content=content)
     
     def create_chat_prompt(self, system_instructions, human_template, input_variables=None):
         """Create a chat prompt template"""
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_core.messages import SystemMessage, HumanMessage
+        
         if input_variables is None:
             input_variables = []
             
@@ -37,21 +76,109 @@ class BaseAgent:
         
         return ChatPromptTemplate.from_messages([system_message, human_message_template])
     
-    def run_with_memory(self, prompt, input_dict=None):
+    def run_with_memory(self, prompt, input_dict=None, task=None):
         """Run the agent with memory"""
         if input_dict is None:
             input_dict = {}
+        
+        # Tag telemetry with the calling agent method unless given explicitly
+        method = task or sys._getframe(1).f_code.co_name
             
         # Get chat history from memory
-        chat_history = self.memory.chat_memory.messages
+        chat_history = self.memory.messages
         
         # Combine history with new messages
         messages = chat_history + [prompt.format_messages(**input_dict)[0]]
         
-        # Run the model
-        response = self.llm.invoke(messages)
+        # Pick the model for this call and the smaller models to fall back to
+        tokens_estimate = estimate_tokens(self._messages_text(messages))
+        if self.router is not None:
+            model_name = self.router.route(method, tokens_estimate)
+            candidates = [model_name] + self.router.fallbacks(model_name, tokens_estimate)
+        else:
+            candidates = [self.model_name]
         
-        # Update memory
-        self.memory.chat_memory.add_message(response)
+        # Run the model, retrying on a smaller model if the call times out
+        for attempt, model_name in enumerate(candidates):
+            start = time.perf_counter()
+            try:
+                response = self.get_llm(model_name).invoke(messages)
+                break
+            except Exception as e:
+                telemetry.record(CallRecord(
+                    agent=type(self).__name__,
+                    method=method,
+                    model=model_name,
+                    tokens_in=tokens_estimate,
+                    wall_ms=(time.perf_counter() - start) * 1000,
+                    tokens_estimated=True,
+                    error=type(e).__name__
+                ))
+                if is_timeout_error(e) and attempt < len(candidates) - 1:
+                    continue
+                raise
+        wall_ms = (time.perf_counter() - start) * 1000
         
-        return response
\ No newline at end of file
+        record = self._build_call_record(method, model_name, messages, response, wall_ms)
+        record.fallback_from = candidates[0] if attempt > 0 else None
+        self._add_routing_estimates(record)
+        telemetry.record(record)
+        
+        # Update memory, keeping only the most recent messages
+        self.memory.add_message(response)
+        del self.memory.messages[:-AGENT_MEMORY_MAX_MESSAGES]
+        
+        return response
+    
+    def _add_routing_estimates(self, record):
+        """Attach estimated cost and savings versus the baseline model to a call record"""
+        record.baseline_model = self.model_name
+        record.cost_usd = estimate_cost(record.model, record.tokens_in, record.tokens_out)
+        baseline_cost = estimate_cost(self.model_name, record.tokens_in, record.tokens_out)
+        if record.cost_usd is not None and baseline_cost is not None:
+            record.cost_saved_usd = baseline_cost - record.cost_usd
+            record.latency_saved_ms = (
+                estimate_latency_ms(self.model_name, record.tokens_in, record.tokens_out)
+                - estimate_latency_ms(record.model, record.tokens_in, record.tokens_out)
+            )
+    
+    def _messages_text(self, messages):
+        """Concatenate message contents for token estimation"""
+        return "\n".join(str(m.content) for m in messages)
+    
+    def _build_call_record(self, method, model_name, messages, response, wall_ms):
+        """Extract token usage, time-to-first-token and cache status from a response"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        metadata = getattr(response, "response_metadata", None) or {}
+        token_usage = metadata.get("token_usage") or {}
+        
+        tokens_in = usage.get("input_tokens") or token_usage.get("prompt_tokens")
+        tokens_out = usage.get("output_tokens") or token_usage.get("completion_tokens")
+        estimated = tokens_in is None or tokens_out is None
+        if tokens_in is None:
+            tokens_in = estimate_tokens(self._messages_text(messages))
+        if tokens_out is None:
+            tokens_out = estimate_tokens(str(response.content))
+        
+        # Groq reports queue and prompt processing time; together they approximate TTFT
+        ttft_ms = None
+        if token_usage.get("prompt_time") is not None:
+            ttft_ms = ((token_usage.get("queue_time") or 0) + token_usage["prompt_time"]) * 1000
+        
+        cached_tokens = (
+            (usage.get("input_token_details") or {}).get("cache_read")
+            or (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+            or 0
+        )
+        
+        return CallRecord(
+            agent=type(self).__name__,
+            method=method,
+            model=model_name,
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            wall_ms=wall_ms,
+            ttft_ms=ttft_ms,
+            cache_hit=cached_tokens > 0,
+            tokens_estimated=estimated
+        )
@@ -0,0 +1,159 @@
+import os
+
+# Selectbox value that turns on per-call routing
+AUTO_MODEL = "auto"
+
+# Groq models available to the agents, smallest first.
+# Costs are USD per 1M tokens; latency figures are rough planning estimates.
+MODEL_CATALOG = {
+    "gemma-7b": {
+        "tier": 0,
+        "context_window": 8192,
+        "cost_in": 0.07,
+        "cost_out": 0.07,
+        "base_latency_ms": 150,
+        "prefill_tps": 8000,
+        "decode_tps": 800
+    },
+    "mixtral-8x7b": {
+        "tier": 1,
+        "context_window": 32768,
+        "cost_in": 0.24,
+        "cost_out": 0.24,
+        "base_latency_ms": 250,
+        "prefill_tps": 5000,
+        "decode_tps": 500
+    },
+    "llama3-70b-8192": {
+        "tier": 2,
+        "context_window": 8192,
+        "cost_in": 0.59,
+        "cost_out": 0.79,
+        "base_latency_ms": 400,
+        "prefill_tps": 3000,
+        "decode_tps": 300
+    }
+}
+
+# Minimum model tier per agent method; anything not listed is a short task
+TASK_TIERS = {
+    "process_teacher_feedback": 1,
+    "process_parent_feedback": 1,
+    "reconcile_feedback": 2,
+    "generate_roadmap": 2,
+    "update_roadmap": 1
+}
+
+# Prompts longer than this (in tokens) need at least a mid-size model
+LONG_PROMPT_TOKENS = 1500
+
+# Completion size assumed when estimating latency and cost
+EXPECTED_OUTPUT_TOKENS = 600
+
+
+def estimate_cost(model_name, tokens_in, tokens_out):
+    """Estimated USD cost of a call on the given model"""
+    spec = MODEL_CATALOG.get(model_name)
+    if spec is None:
+        return None
+    return (tokens_in * spec["cost_in"] + tokens_out * spec["cost_out"]) / 1_000_000
+
+
+def estimate_latency_ms(model_name, tokens_in, tokens_out=EXPECTED_OUTPUT_TOKENS):
+    """Estimated wall time of a call on the given model"""
+    spec = MODEL_CATALOG.get(model_name)
+    if spec is None:
+        return None
+    return (
+        spec["base_latency_ms"]
+        + tokens_in / spec["prefill_tps"] * 1000
+        + tokens_out / spec["decode_tps"] * 1000
+    )
+
+
+def is_timeout_error(error):
+    """Check whether an exception raised by the LLM client is a timeout"""
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower()
+
+
+class ModelRouter:
+    """Pick a model per call from prompt size, task type and latency/cost budgets"""
+
+    def __init__(self, models=None, latency_budget_ms=None, cost_budget_usd=None, timeout_s=None):
+        self.models = sorted(
+            models or MODEL_CATALOG.keys(),
+            key=lambda m: MODEL_CATALOG[m]["tier"]
+        )
+        self.latency_budget_ms = latency_budget_ms
+        self.cost_budget_usd = cost_budget_usd
+        self.timeout_s = timeout_s
+
+    @classmethod
+    def from_env(cls):
+        """Create a router configured from ROUTER_* environment variables"""
+        latency = os.getenv("ROUTER_LATENCY_BUDGET_MS")
+        cost = os.getenv("ROUTER_COST_BUDGET_USD")
+        timeout = os.getenv("ROUTER_TIMEOUT_S", "30")
+        return cls(
+            latency_budget_ms=float(latency) if latency else None,
+            cost_budget_usd=float(cost) if cost else None,
+            timeout_s=float(timeout) if timeout else None
+        )
+
+    @property
+    def largest_model(self):
+        return self.models[-1]
+
+    def _fits_context(self, model_name, tokens_in):
+        return tokens_in + EXPECTED_OUTPUT_TOKENS <= MODEL_CATALOG[model_name]["context_window"]
+
+    def _within_budget(self, model_name, tokens_in):
+        if self.latency_budget_ms is not None:
+            if estimate_latency_ms(model_name, tokens_in) > self.latency_budget_ms:
+                return False
+        if self.cost_budget_usd is not None:
+            if estimate_cost(model_name, tokens_in, EXPECTED_OUTPUT_TOKENS) > self.cost_budget_usd:
+                return False
+        return True
+
+    def required_tier(self, task, tokens_in):
+        """Minimum model tier for a task given its prompt size"""
+        tier = TASK_TIERS.get(task, 0)
+        if tokens_in > LONG_PROMPT_TOKENS:
+            tier = max(tier, 1)
+        return tier
+
+    def route(self, task, tokens_in):
+        """Choose the model for one call
+
+        Args:
+            task: Name of the agent method making the call
+            tokens_in: Estimated prompt size in tokens
+
+        Returns:
+            str: The smallest model that meets the task tier, fits the prompt
+            and stays within the configured budgets. If no model satisfies the
+            budgets at the required tier, the largest model within budget is
+            used, or the fastest model that fits the prompt if none is.
+        """
+        tier = self.required_tier(task, tokens_in)
+        fitting = [m for m in self.models if self._fits_context(m, tokens_in)]
+        if not fitting:
+            # Nothing fits; the model with the largest window has the best chance
+            return max(self.models, key=lambda m: MODEL_CATALOG[m]["context_window"])
+
+        for model_name in fitting:
+            if MODEL_CATALOG[model_name]["tier"] >= tier and self._within_budget(model_name, tokens_in):
+                return model_name
+
+        # The budget cannot be met at the required tier; use the largest model that meets it
+        within_budget = [m for m in fitting if self._within_budget(m, tokens_in)]
+        return within_budget[-1] if within_budget else fitting[0]
+
+    def fallbacks(self, model_name, tokens_in):
+        """Smaller models to retry with, largest first, when a call times out"""
+        tier = MODEL_CATALOG[model_name]["tier"]
+        return [
+            m for m in reversed(self.models)
+            if MODEL_CATALOG[m]["tier"] < tier and self._fits_context(m, tokens_in)
+        ]
@@ -1,36 +1,133 @@
 from agents.base_agent import BaseAgent
+from utils.progress_parser import parse_completed_tasks, parse_time_spent, parse_assessment_results
+from utils.batches import ProgressBatch
+from utils.progress_analytics import analyze_progress_history, render_progress_report
+from utils.state import DataStore
+
+# Assessments scoring below this percentage are flagged as focus areas
+FOCUS_THRESHOLD = 80
 
 class MonitorAgent(BaseAgent):
     """Agent responsible for monitoring student progress"""
-    
+
     def __init__(self, model_name=None):
         # Skip API initialization to avoid errors
         # super().__init__(model_name)
         pass
-    
+
     def analyze_progress(self, roadmap, completed_tasks, time_spent, assessment_results):
-        """Analyze student progress based on their updates"""
-        # Simple progress analysis that doesn't rely on the API
-        
+        """Analyze student progress based on their updates
+
+        Accepts either the free-text form fields or already structured
+        values (Dict[str, bool], Dict[str, int] minutes, List[Dict]).
+        """
+        # Parse into typed values so the analysis is computed locally, without the API
+        tasks = parse_completed_tasks(completed_tasks)
+        minutes = parse_time_spent(time_spent)
+        assessments = parse_assessment_results(assessment_results, subjects=minutes.keys())
+
+        # Completed tasks
+        if tasks:
+            done = [task for task, completed in tasks.items() if completed]
+            pending = [task for task, completed in tasks.items() if not completed]
+            tasks_section = f"**{len(done)} of {len(tasks)} tasks completed**\n"
+            tasks_section += "".join(f"\n- ✅ {task}" for task in done)
+            tasks_section += "".join(f"\n- ⏳ {task}" for task in pending)
+        else:
+            tasks_section = "No tasks reported as completed."
+
+        # Time spent per subject
+        if minutes:
+            total = sum(minutes.values())
+            time_section = f"**Total study time: {total / 60:.1f} hours**\n\n| Subject | Hours | Share |\n|---|---|---|\n"
+            for subject, subject_minutes in sorted(minutes.items(), key=lambda item: -item[1]):
+                time_section += f"| {subject} | {subject_minutes / 60:.1f} | {subject_minutes / total:.0%} |\n"
+        elif time_spent:
+            time_section = str(time_spent)
+        else:
+            time_section = "No time tracking reported."
+
+        # Assessment scores
+        if assessments:
+            scores = [a["score"] for a in assessments]
+            assessment_section = (
+                f"**Average score: {sum(scores) / len(scores):.1f}%** "
+                f"(best {max(scores):.0f}%, lowest {min(scores):.0f}%)\n\n"
+                "| Assessment | Subject | Score |\n|---|---|---|\n"
+            )
+            for a in assessments:
+                assessment_section += f"| {a['title']} | {a['subject'] or '-'} | {a['score']:.0f}% |\n"
+        elif assessment_results:
+            assessment_section = str(assessment_results)
+        else:
+            assessment_section = "No assessment results reported."
+
+        # Recommendations driven by the numbers above
+        weak = [a for a in assessments if a["score"] < FOCUS_THRESHOLD]
+        if weak:
+            focus = ", ".join(f"{a['title']} ({a['score']:.0f}%)" for a in weak)
+            focus_line = f"Pay special attention to topics scoring below {FOCUS_THRESHOLD}%: {focus}"
+        else:
+            focus_line = f"Pay special attention to any topics where you scored below {FOCUS_THRESHOLD}%"
+        least_studied = ""
+        if len(minutes) > 1:
+            subject = min(minutes, key=minutes.get)
+            least_studied = f"\n   - {subject} got the least study time this period ({minutes[subject] / 60:.1f} hours)"
+
         analysis = f"""# Progress Analysis
 
 ## Completed Tasks
-{completed_tasks if completed_tasks else "No tasks reported as completed."}
+{tasks_section}
 
 ## Time Spent
-{time_spent if time_spent else "No time tracking reported."}
+{time_section}
 
 ## Assessment Results
-{assessment_results if assessment_results else "No assessment results reported."}
+{assessment_section}
 
 ## Recommendations
 1. **Continue With Your Plan**: Stay consistent with your study schedule
-2. **Focus Areas**: Pay special attention to any topics where you scored below 80%
-3. **Next Steps**: 
+2. **Focus Areas**: {focus_line}
+3. **Next Steps**:
    - Review any concepts you found challenging
    - Increase practice for areas with lower assessment scores
-   - Consider getting help with difficult topics
+   - Consider getting help with difficult topics{least_studied}
 
 Continue tracking your progress and make adjustments to your study plan as needed.
 """
-        return analysis
\ No newline at end of file
+        return analysis
+
+    def analyze_history(self, student_id, roadmap_id=None, plan_hours=None):
+        """Analyze a student's full progress history
+
+        Returns the analytics dict from analyze_progress_history with the
+        rendered report under "markdown".
+        """
+        history = ProgressBatch.from_storage(student_id, roadmap_id)
+        result = analyze_progress_history(history, plan_hours=plan_hours, threshold=FOCUS_THRESHOLD)
+        result["markdown"] = render_progress_report(result)
+        return result
+
+    def summarize_progress(self, student_id):
+        """Summarize a student's progress from the running aggregates, without reading history"""
+        summary = DataStore.get_progress_summary(student_id)
+        if summary is None or not summary.entries:
+            return "## Overall Progress\nNo progress updates recorded yet."
+
+        lines = ["## Overall Progress", f"{summary.entries} updates since {summary.first_at:%b %d, %Y}."]
+        if summary.completion_rate is not None:
+            lines.append(f"\n**Task completion:** {summary.completion_rate:.0%} ({summary.tasks_completed} of {summary.tasks_total} tasks)")
+        if summary.average_score is not None:
+            lines.append(f"\n**Average score:** {summary.average_score:.1f}% over {summary.score_count} assessments")
+
+        weekly_hours = summary.weekly_hours()
+        if weekly_hours:
+            lines.append("\n| Subject | Hours/Week |\n|---|---|")
+            lines.extend(f"| {subject} | {hours:.1f} |" for subject, hours in weekly_hours.items())
+
+        weak = sorted(
+            (stats["ewma"], topic) for topic, stats in summary.topics.items() if stats["ewma"] < FOCUS_THRESHOLD
+        )
+        if weak:
+            lines.append(f"\n**Topics trending below {FOCUS_THRESHOLD}%:** " + ", ".join(f"{topic} ({ewma:.0f}%)" for ewma, topic in weak))
+        return "\n".join(lines)
@@ -39,6 +39,8 @@ class RoadmapAgent(BaseAgent):
         subjects = student_data.get("subjects", [])
         if isinstance(subjects, str):
             subjects = [s.strip() for s in subjects.split(",")]
+        # The sample data lists subjects as dicts with scores and topics
+        subjects = [s.get("name", "") if isinstance(s, dict) else s for s in subjects]
         performance = student_data.get("performance", "Not specified")
         goals = student_data.get("goals", "Not specified")
         strengths = student_data.get("strengths", "Not specified")
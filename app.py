@@ -1,19 +1,40 @@
+import time
+_APP_IMPORT_START = time.perf_counter()
+
 import streamlit as st
 import os
+import json
+import logging
 from dotenv import load_dotenv
-from agents.roadmap_agent import RoadmapAgent
-from agents.monitor_agent import MonitorAgent
-from agents.feedback_agent import FeedbackAgent
 from components.student_view import render_student_view
 from components.teacher_view import render_teacher_view
 from components.parent_view import render_parent_view
-from utils.state import initialize_session_state, save_state, load_state
+from components.admin_view import render_admin_view
+from utils.state import (
+    initialize_session_state, save_state, load_state, get_agent, DataStore,
+    remember_id, forget_id, session_record, current_roadmap, save_current_roadmap,
+    save_session_feedback, save_session_analysis, latest_feedback
+)
 from utils.data_models import StudentData, ProgressData, FeedbackData
+from utils.progress_parser import build_progress, extract_planned_hours
+from utils.lazy_tabs import lazy_tabs, is_open
+from utils.session_memory import session_fragment, session_memory
 
 # Load environment variables
 load_dotenv()
 
+# Agents and the LLM stack (langchain, langchain_groq) are imported on first use,
+# so this only covers streamlit, the view components and their chart libraries
+_APP_IMPORT_MS = (time.perf_counter() - _APP_IMPORT_START) * 1000
+
+# Time budget for a session's first render, including module imports
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2000"))
+
+logger = logging.getLogger("roadmap_ai.startup")
+
 def main():
+    render_start = time.perf_counter()
+    
     # Set up page configuration
     st.set_page_config(
         page_title="Roadmap AI System",
@@ -22,7 +43,8 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Initialize session state
+    # Bring back anything spilled while this session was idle, then fill in defaults
+    session_memory.start_run(full=True)
     initialize_session_state()
     
     # Display header
@@ -34,21 +56,19 @@ def main():
         st.header("Navigation")
         user_role = st.radio(
             "Select User Role:",
-            ["Student", "Teacher", "Parent"]
+            ["Student", "Teacher", "Parent", "Admin"]
         )
         
         st.header("Settings")
         model_selection = st.selectbox(
             "AI Model:",
-            ["llama3-70b-8192", "mixtral-8x7b", "gemma-7b"],
-            index=0
+            ["auto", "llama3-70b-8192", "mixtral-8x7b", "gemma-7b"],
+            index=0,
+            help="'auto' routes each call to the smallest model that fits the task and budget"
         )
         
-        # Initialize agents if not already in session state
-        if "roadmap_agent" not in st.session_state:
-            st.session_state.roadmap_agent = RoadmapAgent(model_name=model_selection)
-            st.session_state.monitor_agent = MonitorAgent(model_name=model_selection)
-            st.session_state.feedback_agent = FeedbackAgent(model_name=model_selection)
+        # Agents are created lazily with this model by get_agent()
+        st.session_state.model_selection = model_selection
         
         # Display API status
         api_key = os.getenv("GROQ_API_KEY")
@@ -62,228 +82,268 @@ def main():
         display_student_view()
     elif user_role == "Teacher":
         display_teacher_view()
-    else:  # Parent view
+    elif user_role == "Parent":
         display_parent_view()
+    else:  # Admin view
+        render_admin_view(st.session_state)
     
     # Footer
     st.markdown("---")
     st.caption("Roadmap AI System v1.0 | Powered by Groq LLMs")
+    
+    # Account for this session's state and move idle sessions' large values out of memory
+    session_memory.end_run()
+    
+    # Measure the first render of each session against the startup budget
+    if "startup_ms" not in st.session_state:
+        render_ms = (time.perf_counter() - render_start) * 1000
+        st.session_state.startup_ms = {
+            "import_ms": round(_APP_IMPORT_MS, 1),
+            "first_render_ms": round(render_ms, 1),
+            "budget_ms": STARTUP_BUDGET_MS
+        }
+        logger.info(json.dumps({"event": "startup", **st.session_state.startup_ms}))
+        if _APP_IMPORT_MS + render_ms > STARTUP_BUDGET_MS:
+            logger.warning(
+                "Startup took %.0f ms, over the %.0f ms budget",
+                _APP_IMPORT_MS + render_ms, STARTUP_BUDGET_MS
+            )
 
 def display_student_view():
     """Display the student dashboard"""
-    import streamlit as st
-    
-    # Import rendering functions
-    from render_functions import (
-        render_student_view,
-        render_daily_plan,
-        render_weekly_roadmap,
-        render_performance_metrics,
-        render_swot_analysis
-    )
+    # Tabs for different student functions; only the selected one runs, and each reruns on its own when used
+    tab1, tab2, tab3 = lazy_tabs(["My Roadmap", "Progress Tracking", "Resources"], key="student_tab")
     
-    # Initialize roadmap_agent if not already done
-    if "roadmap_agent" not in st.session_state:
-        from agents.roadmap_agent import RoadmapAgent
-        st.session_state.roadmap_agent = RoadmapAgent()
+    if is_open(tab1):
+        with tab1:
+            display_roadmap_tab()
     
-    if "monitor_agent" not in st.session_state:
-        from agents.monitor_agent import MonitorAgent
-        st.session_state.monitor_agent = MonitorAgent()
+    if is_open(tab2):
+        with tab2:
+            display_progress_tab()
     
-    # Tabs for different student functions
-    tab1, tab2, tab3 = st.tabs(["My Roadmap", "Progress Tracking", "Resources"])
+    if is_open(tab3):
+        with tab3:
+            display_resources_tab()
+
+@session_fragment
+def display_roadmap_tab():
+    """Student information and roadmap generation"""
+    st.header("My Learning Roadmap")
     
-    with tab1:
-        st.header("My Learning Roadmap")
-        
-        # Student information input
-        with st.expander("My Information", expanded=False):
-            if st.button("Use Sample Data"):
-                # Load sample student data
-                from data.sample_data import get_sample_student_data
-                st.session_state.student_data = get_sample_student_data()
-                # Reload the page to ensure the UI updates
-                st.rerun()
-            else:
-                # Form for student data input
-                with st.form("student_info_form"):
-                    name = st.text_input("Name", value=st.session_state.get("name", ""))
-                    grade = st.text_input("Grade/Year", value=st.session_state.get("grade", ""))
-                    subjects = st.multiselect(
-                        "Subjects",
-                        ["Math", "Science","Biology", "Chemistry", "Other"],
-                        default=st.session_state.get("subjects", [])
-                    )
-                    
-                    # Current performance
-                    st.subheader("Current Performance")
-                    performance = st.text_area(
-                        "Describe your current academic performance", 
-                        value=st.session_state.get("performance", "")
-                    )
-                    
-                    # Goals
-                    st.subheader("Goals")
-                    goals = st.text_area(
-                        "What are your academic goals?", 
-                        value=st.session_state.get("goals", "")
-                    )
-                    
-                    # Strengths and weaknesses
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        strengths = st.text_area(
-                            "What are your strengths?", 
-                            value=st.session_state.get("strengths", "")
-                        )
-                    with col2:
-                        weaknesses = st.text_area(
-                            "What areas need improvement?", 
-                            value=st.session_state.get("weaknesses", "")
-                        )
-                    
-                    submit = st.form_submit_button("Save Information")
-                    
-                    if submit:
-                        # Save to session state
-                        st.session_state.student_data = {
-                            "name": name,
-                            "grade": grade,
-                            "subjects": subjects,  # Store as a list, not a joined string
-                            "performance": performance,
-                            "goals": goals,
-                            "strengths": strengths,
-                            "weaknesses": weaknesses
-                        }
-                        st.success("Information saved!")
-        
-        # Generate roadmap
-        if "student_data" in st.session_state:
-            # Add a check to display the current student data (for debugging)
-            with st.expander("Student Data (Debug)"):
-                st.write(st.session_state.student_data)
-            
-            # Generate roadmap button
-            generate_roadmap = st.button("Generate My Roadmap")
-            
-            # Check if roadmap should be displayed
-            if generate_roadmap or "roadmap" in st.session_state:
-                with st.spinner("Creating your personalized roadmap..."):
-                    try:
-                        if generate_roadmap or "roadmap" not in st.session_state:
-                            # Generate new roadmap
-                            roadmap = st.session_state.roadmap_agent.generate_roadmap(
-                                st.session_state.student_data
-                            )
-                            st.session_state.roadmap = roadmap
-                    except Exception as e:
-                        st.error(f"Error generating roadmap: {str(e)}")
-                
-                # Display the roadmap
-                if "roadmap" in st.session_state:
-                    st.markdown("## Your Personalized Roadmap")
-                    st.markdown(st.session_state.roadmap)
-                    
-                    # Allow roadmap to be refreshed
-                    if st.button("Regenerate Roadmap"):
-                        # Remove the roadmap from session state
-                        if "roadmap" in st.session_state:
-                            del st.session_state.roadmap
-                        st.rerun()
+    # Student information input
+    with st.expander("My Information", expanded=False):
+        if st.button("Use Sample Data"):
+            # Load sample student data
+            from data.sample_data import get_sample_student_data
+            st.session_state.student_data = get_sample_student_data()
+            # Reload the page to ensure the UI updates
+            st.rerun()
         else:
-            st.info("Please enter your information to generate a roadmap.")
-    
-    with tab2:
-        st.header("Track Your Progress")
-        
-        # Only show if roadmap exists
-        if "roadmap" in st.session_state:
-            # Progress tracking form
-            with st.form("progress_tracking"):
-                st.subheader("Update Your Progress")
-                
-                # Task completion
-                completed_tasks = st.text_area(
-                    "What tasks have you completed from your roadmap?",
-                    placeholder="List the specific tasks you've completed..."
+            # Form for student data input
+            with st.form("student_info_form"):
+                name = st.text_input("Name", value=st.session_state.get("name", ""))
+                grade = st.text_input("Grade/Year", value=st.session_state.get("grade", ""))
+                subjects = st.multiselect(
+                    "Subjects",
+                    ["Math", "Science","Biology", "Chemistry", "Other"],
+                    default=st.session_state.get("subjects", [])
                 )
                 
-                # Time tracking
-                time_spent = st.text_area(
-                    "How much time have you spent studying each subject?",
-                    placeholder="Math: 4 hours\nScience: 3 hours\n..."
+                # Current performance
+                st.subheader("Current Performance")
+                performance = st.text_area(
+                    "Describe your current academic performance", 
+                    value=st.session_state.get("performance", "")
                 )
                 
-                # Assessment results
-                assessment_results = st.text_area(
-                    "Enter any assessment results or practice scores",
-                    placeholder="Quiz 1: 85%\nPractice Test: 78%\n..."
+                # Goals
+                st.subheader("Goals")
+                goals = st.text_area(
+                    "What are your academic goals?", 
+                    value=st.session_state.get("goals", "")
                 )
                 
-                submit_progress = st.form_submit_button("Submit Progress Update")
+                # Strengths and weaknesses
+                col1, col2 = st.columns(2)
+                with col1:
+                    strengths = st.text_area(
+                        "What are your strengths?", 
+                        value=st.session_state.get("strengths", "")
+                    )
+                with col2:
+                    weaknesses = st.text_area(
+                        "What areas need improvement?", 
+                        value=st.session_state.get("weaknesses", "")
+                    )
                 
-                if submit_progress:
-                    # Store progress data
-                    st.session_state.progress_data = {
-                        "completed_tasks": completed_tasks,
-                        "time_spent": time_spent,
-                        "assessment_results": assessment_results
-                    }
-                    
-                    # Generate progress analysis
-                    with st.spinner("Analyzing your progress..."):
-                        progress_analysis = st.session_state.monitor_agent.analyze_progress(
-                            st.session_state.roadmap,
-                            completed_tasks,
-                            time_spent,
-                            assessment_results
-                        )
-                        st.session_state.progress_analysis = progress_analysis
-                    
-                    st.success("Progress updated!")
-            
-            # Display progress analysis if available
-            if "progress_analysis" in st.session_state:
-                st.markdown("## Progress Analysis")
-                st.markdown(st.session_state.progress_analysis)
+                submit = st.form_submit_button("Save Information")
                 
-                # Option to update roadmap based on progress
-                if st.button("Update My Roadmap Based on Progress"):
-                    with st.spinner("Updating your roadmap..."):
-                        updated_roadmap = st.session_state.roadmap_agent.update_roadmap(
-                            st.session_state.roadmap,
-                            st.session_state.progress_data,
-                            "Student self-reported progress"
-                        )
-                        st.session_state.roadmap = updated_roadmap
-                    
-                    st.success("Roadmap updated!")
-                    st.rerun()
-        else:
-            st.info("Generate a roadmap first to track your progress.")
+                if submit:
+                    # Save to session state
+                    st.session_state.student_data = {
+                        "name": name,
+                        "grade": grade,
+                        "subjects": subjects,  # Store as a list, not a joined string
+                        "performance": performance,
+                        "goals": goals,
+                        "strengths": strengths,
+                        "weaknesses": weaknesses
+                    }
+                    st.success("Information saved!")
     
-    with tab3:
-        st.header("Learning Resources")
+    # Generate roadmap
+    if "student_data" in st.session_state:
+        # Add a check to display the current student data (for debugging)
+        with st.expander("Student Data (Debug)"):
+            st.write(st.session_state.student_data)
+        
+        # Generate roadmap button
+        generate_roadmap = st.button("Generate My Roadmap")
+        
+        if generate_roadmap:
+            with st.spinner("Creating your personalized roadmap..."):
+                try:
+                    # Generate new roadmap; the session keeps only its id
+                    roadmap = get_agent("roadmap_agent").generate_roadmap(
+                        st.session_state.student_data
+                    )
+                    save_current_roadmap(roadmap)
+                except Exception as e:
+                    st.error(f"Error generating roadmap: {str(e)}")
         
-        # Check if student data and roadmap exist
-        if "student_data" in st.session_state and "roadmap" in st.session_state:
-            # Create the tabs that were missing
-            resource_tabs = st.tabs(["Daily Plan", "Weekly Roadmap", "Performance", "SWOT Analysis"])
+        # Display the roadmap
+        roadmap = current_roadmap()
+        if roadmap:
+            st.markdown("## Your Personalized Roadmap")
+            st.markdown(roadmap.content)
             
-            with resource_tabs[0]:  # Daily Plan
-                render_daily_plan(st.session_state)
+            # Allow roadmap to be refreshed
+            if st.button("Regenerate Roadmap"):
+                # Stop viewing the roadmap; the record itself stays in storage
+                forget_id("roadmap_id")
+                st.rerun()
+    else:
+        st.info("Please enter your information to generate a roadmap.")
+
+@session_fragment
+def display_progress_tab():
+    """Progress updates and their analysis"""
+    st.header("Track Your Progress")
+    
+    # Only show if roadmap exists
+    roadmap = current_roadmap()
+    if roadmap:
+        # Progress tracking form
+        with st.form("progress_tracking"):
+            st.subheader("Update Your Progress")
             
-            with resource_tabs[1]:  # Weekly Roadmap
-                render_weekly_roadmap(st.session_state)
+            # Task completion
+            completed_tasks = st.text_area(
+                "What tasks have you completed from your roadmap?",
+                placeholder="List the specific tasks you've completed..."
+            )
             
-            with resource_tabs[2]:  # Performance
-                render_performance_metrics(st.session_state)
+            # Time tracking
+            time_spent = st.text_area(
+                "How much time have you spent studying each subject?",
+                placeholder="Math: 4 hours\nScience: 3 hours\n..."
+            )
             
-            with resource_tabs[3]:  # SWOT Analysis
-                render_swot_analysis(st.session_state)
-        else:
-            st.info("Please generate a roadmap first to view your resources and detailed plans.")
+            # Assessment results
+            assessment_results = st.text_area(
+                "Enter any assessment results or practice scores",
+                placeholder="Quiz 1: 85%\nPractice Test: 78%\n..."
+            )
+            
+            submit_progress = st.form_submit_button("Submit Progress Update")
+            
+            if submit_progress:
+                # Parse the free text into a typed Progress record and persist it
+                progress = build_progress(
+                    roadmap.student_id,
+                    roadmap.id,
+                    completed_tasks,
+                    time_spent,
+                    assessment_results
+                )
+                remember_id("progress_id", save_state(progress, 'progress'))
+                
+                # Generate progress analysis
+                with st.spinner("Analyzing your progress..."):
+                    progress_analysis = get_agent("monitor_agent").analyze_progress(
+                        roadmap.content,
+                        progress.completed_tasks,
+                        progress.time_spent,
+                        progress.assessment_results
+                    )
+                    
+                    # Running totals are kept up to date by save_state, so this does not scan history
+                    progress_analysis += "\n" + get_agent("monitor_agent").summarize_progress(roadmap.student_id)
+                    save_session_analysis("progress_analysis_id", "student", progress_analysis, source_id=progress.id)
+                
+                st.success("Progress updated!")
+        
+        # Display progress analysis if available
+        progress_analysis = session_record("progress_analysis_id", 'analysis')
+        if progress_analysis:
+            st.markdown("## Progress Analysis")
+            st.markdown(progress_analysis.response)
+            
+            # Full trend analysis reads every stored update, so it only runs on request
+            if st.checkbox("Show trends across all my updates"):
+                weeks_data = st.session_state.student_data.get("weeks_data") or []
+                current_week = st.session_state.student_data.get("current_week", 1)
+                if 0 < current_week <= len(weeks_data):
+                    plan_hours = weeks_data[current_week - 1].get("subject_hours")
+                else:
+                    plan_hours = extract_planned_hours(roadmap.content)
+                history = get_agent("monitor_agent").analyze_history(
+                    roadmap.student_id,
+                    plan_hours=plan_hours
+                )
+                st.markdown(history["markdown"])
+            
+            # Option to update roadmap based on progress
+            if st.button("Update My Roadmap Based on Progress"):
+                with st.spinner("Updating your roadmap..."):
+                    progress = session_record("progress_id", 'progress')
+                    updated_roadmap = get_agent("roadmap_agent").update_roadmap(
+                        roadmap.content,
+                        progress.to_dict() if progress else {},
+                        "Student self-reported progress"
+                    )
+                    save_current_roadmap(updated_roadmap)
+                
+                st.success("Roadmap updated!")
+                st.rerun()
+    else:
+        st.info("Generate a roadmap first to track your progress.")
+
+@session_fragment
+def display_resources_tab():
+    """Daily plan, weekly roadmap, performance and SWOT views"""
+    from render_functions import (
+        render_daily_plan,
+        render_weekly_roadmap,
+        render_performance_metrics,
+        render_swot_analysis
+    )
+    
+    st.header("Learning Resources")
+    
+    # Check if student data and roadmap exist
+    if "student_data" in st.session_state and "roadmap_id" in st.session_state:
+        # Create the tabs that were missing; only the selected one is rendered
+        resource_tabs = lazy_tabs(["Daily Plan", "Weekly Roadmap", "Performance", "SWOT Analysis"], key="student_resource_tab")
+        renderers = [render_daily_plan, render_weekly_roadmap, render_performance_metrics, render_swot_analysis]
+        
+        for tab, render in zip(resource_tabs, renderers):
+            if is_open(tab):
+                with tab:
+                    render(st.session_state)
+    else:
+        st.info("Please generate a roadmap first to view your resources and detailed plans.")
 
 def display_teacher_view():
     """Display the teacher dashboard"""
@@ -309,9 +369,10 @@ def display_teacher_view():
         )
         
         # Display current student roadmap if available
-        if "roadmap" in st.session_state:
+        roadmap = current_roadmap()
+        if roadmap:
             st.subheader(f"{selected_student}'s Current Roadmap")
-            st.markdown(st.session_state.roadmap)
+            st.markdown(roadmap.content)
             
             # Teacher feedback form
             with st.form("teacher_feedback_form"):
@@ -326,42 +387,32 @@ def display_teacher_view():
                 
                 if submit_feedback and teacher_feedback:  # Added check for non-empty feedback
                     with st.spinner("Processing feedback..."):
-                        # Initialize feedback_agent if not already done
-                        if "feedback_agent" not in st.session_state:
-                            from agents.feedback_agent import FeedbackAgent
-                            st.session_state.feedback_agent = FeedbackAgent()
-                        
                         try:
-                            feedback_response = st.session_state.feedback_agent.process_teacher_feedback(
-                                st.session_state.roadmap,
+                            feedback_response = get_agent("feedback_agent").process_teacher_feedback(
+                                roadmap.content,
                                 teacher_feedback
                             )
                             # Store feedback and response
-                            st.session_state.teacher_feedback_data = teacher_feedback
-                            st.session_state.feedback_response = feedback_response
+                            save_session_feedback("teacher_feedback_id", "teacher", teacher_feedback, feedback_response)
                             st.success("Feedback submitted!")
                         except Exception as e:
                             st.error(f"Error processing feedback: {str(e)}")
             
             # Display feedback analysis if available - moved outside the form
-            if "feedback_response" in st.session_state and st.session_state.feedback_response:
+            feedback = session_record("teacher_feedback_id", 'feedback')
+            if feedback and feedback.response:
                 st.markdown("## Feedback Analysis")
-                st.markdown(st.session_state.feedback_response)
+                st.markdown(feedback.response)
                 
                 # Option to update roadmap based on feedback
                 if st.button("Update Roadmap Based on Feedback"):
                     with st.spinner("Updating roadmap..."):
-                        # Initialize roadmap_agent if not already done
-                        if "roadmap_agent" not in st.session_state:
-                            from agents.roadmap_agent import RoadmapAgent
-                            st.session_state.roadmap_agent = RoadmapAgent()
-                        
-                        updated_roadmap = st.session_state.roadmap_agent.update_roadmap(
-                            st.session_state.roadmap,
+                        updated_roadmap = get_agent("roadmap_agent").update_roadmap(
+                            roadmap.content,
                             {},  # No progress data in this case
-                            st.session_state.teacher_feedback_data
+                            feedback.content
                         )
-                        st.session_state.roadmap = updated_roadmap
+                        save_current_roadmap(updated_roadmap)
                     
                     st.success("Roadmap updated based on feedback!")
                     st.rerun()
@@ -390,9 +441,10 @@ def display_parent_view():
     selected_child = st.selectbox("Select Child", child_list)
     
     # Display current child roadmap if available
-    if "roadmap" in st.session_state:
+    roadmap = current_roadmap()
+    if roadmap:
         st.subheader(f"{selected_child}'s Current Roadmap")
-        st.markdown(st.session_state.roadmap)
+        st.markdown(roadmap.content)
         
         # Parent feedback form
         with st.form("parent_feedback"):
@@ -406,51 +458,54 @@ def display_parent_view():
             
             if submit_feedback:
                 with st.spinner("Processing feedback..."):
-                    feedback_response = st.session_state.feedback_agent.process_parent_feedback(
-                        st.session_state.roadmap,
+                    feedback_response = get_agent("feedback_agent").process_parent_feedback(
+                        roadmap.content,
                         parent_feedback
                     )
-                    st.session_state["parent_feedback"] = parent_feedback
-                    st.session_state["parent_response"] = feedback_response
+                    save_session_feedback("parent_feedback_id", "parent", parent_feedback, feedback_response)
                 
                 st.success("Feedback submitted!")
         
         # Display feedback analysis if available
-        if "parent_response" in st.session_state:
+        parent_feedback = session_record("parent_feedback_id", 'feedback')
+        if parent_feedback:
             st.markdown("## Feedback Analysis")
-            st.markdown(st.session_state.parent_response)
+            st.markdown(parent_feedback.response)
             
-            # Option to reconcile feedback if both teacher and parent feedback exist
-            if "teacher_feedback" in st.session_state and "parent_feedback" in st.session_state:
-                if st.button("Reconcile All Feedback"):
-                    with st.spinner("Reconciling feedback from all sources..."):
-                        student_input = st.session_state.progress_data.get("completed_tasks", "No student input available")
-                        reconciled_feedback = st.session_state.feedback_agent.reconcile_feedback(
-                            st.session_state.teacher_feedback,
-                            st.session_state.parent_feedback,
-                            student_input
-                        )
-                        st.session_state.reconciled_feedback = reconciled_feedback
-                    
-                    st.success("Feedback reconciled!")
+            # Reconcile with the latest teacher feedback and progress on this roadmap, from any session
+            if st.button("Reconcile All Feedback"):
+                with st.spinner("Reconciling feedback from all sources..."):
+                    teacher_feedback = latest_feedback(roadmap.id, "teacher")
+                    progress = session_record("progress_id", 'progress') or DataStore.get_student_progress(roadmap.student_id, roadmap.id)
+                    completed = [task for task, done in progress.completed_tasks.items() if done] if progress else []
+                    reconciled_feedback = get_agent("feedback_agent").reconcile_feedback(
+                        teacher_feedback.content if teacher_feedback else "No teacher feedback available",
+                        parent_feedback.content,
+                        "\n".join(completed) or "No student input available"
+                    )
+                    save_session_analysis("reconciled_feedback_id", "parent", reconciled_feedback, source_id=parent_feedback.id)
+                
+                st.success("Feedback reconciled!")
             
             # Display reconciled feedback if available
-            if "reconciled_feedback" in st.session_state:
+            reconciled_feedback = session_record("reconciled_feedback_id", 'analysis')
+            if reconciled_feedback:
                 st.markdown("## Reconciled Feedback")
-                st.markdown(st.session_state.reconciled_feedback)
+                st.markdown(reconciled_feedback.response)
                 
                 # Update roadmap based on reconciled feedback
                 if st.button("Update Roadmap Based on Reconciled Feedback"):
                     with st.spinner("Updating roadmap..."):
-                        updated_roadmap = st.session_state.roadmap_agent.update_roadmap(
-                            st.session_state.roadmap,
-                            st.session_state.progress_data if "progress_data" in st.session_state else {},
-                            st.session_state.reconciled_feedback
+                        progress = session_record("progress_id", 'progress')
+                        updated_roadmap = get_agent("roadmap_agent").update_roadmap(
+                            roadmap.content,
+                            progress.to_dict() if progress else {},
+                            reconciled_feedback.response
                         )
-                        st.session_state.roadmap = updated_roadmap
+                        save_current_roadmap(updated_roadmap)
                     
                     st.success("Roadmap updated based on reconciled feedback!")
-                    st.experimental_rerun()
+                    st.rerun()
     else:
         st.info("No roadmap available for your child yet.")
     
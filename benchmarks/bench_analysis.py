@@ -0,0 +1,110 @@
+"""Benchmark a student's progress analysis from stored rows to the analytics dict
+
+Progress rows come from data.synthetic, decoded from JSON as DataStore stores
+them. Each run builds a ProgressBatch from the rows and analyzes it, as
+MonitorAgent.analyze_history does after reading the files:
+
+  from_rows    ProgressBatch.from_rows(rows)
+  analysis     analyze_progress_history(batch)
+  total        both, from rows to the analytics dict
+
+Usage:
+    python benchmarks/bench_analysis.py                  # 10k entries, budget check
+    python benchmarks/bench_analysis.py --entries 100000 --runs 5
+    python benchmarks/bench_analysis.py --budget-ms 40 --json out.json
+
+Exit status is 1 when the median total exceeds the budget
+(progress_analysis_ms in benchmarks/budgets.json).
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import results as bench_results  # noqa: E402
+from data.synthetic import iter_records  # noqa: E402
+from utils.batches import ProgressBatch  # noqa: E402
+from utils.progress_analytics import analyze_progress_history  # noqa: E402
+
+BUDGETS_FILE = os.path.join(ROOT_DIR, "benchmarks", "budgets.json")
+
+
+def progress_rows(n_entries, seed=0):
+    """n progress updates as dicts (52 per student), decoded back to back as when read from storage"""
+    lines = []
+    for kind, record in iter_records(n_entries // 52 + 1, weeks=52, seed=seed):
+        if kind == "progress":
+            lines.append(json.dumps(record.to_dict()))
+            if len(lines) == n_entries:
+                break
+    return [json.loads(line) for line in lines]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(n_entries, runs):
+    """Latency of each step over runs, with the garbage collector paused while timing"""
+    rows = progress_rows(n_entries)
+    samples = {"from_rows": [], "analysis": [], "total": []}
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            batch, build_ms = _timed(lambda: ProgressBatch.from_rows(rows))
+            _, analysis_ms = _timed(lambda: analyze_progress_history(batch))
+            samples["from_rows"].append(build_ms)
+            samples["analysis"].append(analysis_ms)
+            samples["total"].append(build_ms + analysis_ms)
+    finally:
+        gc.enable()
+    return {name: bench_results.percentiles(times) for name, times in samples.items()}
+
+
+def load_budget():
+    """Read the analysis budget from benchmarks/budgets.json"""
+    if not os.path.exists(BUDGETS_FILE):
+        return None
+    with open(BUDGETS_FILE, "r") as f:
+        return json.load(f).get("progress_analysis_ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark progress analysis from stored rows")
+    parser.add_argument("--entries", type=int, default=10_000, help="Progress updates analyzed per run")
+    parser.add_argument("--runs", type=int, default=20, help="Number of measured runs")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median total exceeds this (overrides budgets.json)")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = run(args.entries, args.runs)
+    budget = args.budget_ms if args.budget_ms is not None else load_budget()
+
+    print(f"Progress analysis of {args.entries} entries ({args.runs} runs):")
+    for name, stats in results.items():
+        print(f"  {name:<10} p50 {stats['p50_ms']:>8.1f} ms  p95 {stats['p95_ms']:>8.1f} ms")
+
+    if args.json_path:
+        output = {"meta": {**bench_results.machine_info(), "entries": args.entries, "runs": args.runs}, "results": results}
+        bench_results.save(output, args.json_path)
+
+    if budget is None:
+        print("\nNo budget configured")
+        return 0
+    if results["total"]["p50_ms"] > budget:
+        print(f"\nFAIL: {results['total']['p50_ms']:.1f} ms exceeds the {budget:.0f} ms analysis budget")
+        return 1
+    print(f"\nOK: within the {budget:.0f} ms analysis budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
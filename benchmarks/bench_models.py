@@ -0,0 +1,146 @@
+"""Benchmark the data model classes: memory per record and conversion throughput
+
+Rows come from data.synthetic, serialized to JSON lines as DataStore and the
+bulk files store them, so loaded records start from freshly decoded strings.
+For each model (Student, Roadmap, Progress, Feedback):
+
+  from_dict_per_s    cls.from_dict(row), one call per record
+  from_dicts_per_s   cls.from_dicts(rows), in chunks of --pool rows
+  to_dict_per_s      record.to_dict(), one call per record
+  to_dicts_per_s     Model.to_dicts(records), in chunks of --pool records
+  record_bytes       memory held per loaded record, including its values,
+                     measured with tracemalloc over --memory-records records
+  object_bytes       the record object itself (sys.getsizeof, plus its
+                     __dict__ if it has one)
+
+Throughput is measured over --records conversions per model, cycling over a
+pool of distinct rows (see sample_lines); the garbage collector is paused
+while timing, as timeit does.
+
+Usage:
+    python benchmarks/bench_models.py                       # 1M conversions per model
+    python benchmarks/bench_models.py --records 100000 --memory-records 10000
+    python benchmarks/bench_models.py --json out.json --save-baseline
+
+Exit status is 1 when any metric is worse than the baseline by more than
+the tolerance (see benchmarks/results.py).
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import results as bench_results  # noqa: E402
+from data.synthetic import MODELS, iter_records  # noqa: E402
+from utils.data_models import Model  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baselines", "models.json")
+
+
+def sample_lines(pool):
+    """Up to pool JSON lines per kind
+
+    Students are simulated until there are pool progress updates (52 per
+    student), so there are fewer distinct students, roadmaps and feedback.
+    """
+    lines = {kind: [] for kind in MODELS}
+    for kind, record in iter_records(pool // 52 + 1, weeks=52):
+        if len(lines[kind]) < pool:
+            lines[kind].append(json.dumps(record.to_dict()))
+    return lines
+
+
+def _throughput(fn, chunk, total):
+    """Records per second for fn(chunk) called until total records are converted"""
+    calls = max(1, total // len(chunk))
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn(chunk)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return round(calls * len(chunk) / elapsed, 1)
+
+
+def record_bytes(model, lines, count):
+    """Memory held per record after decoding and loading count rows"""
+    rows = (lines[i % len(lines)] for i in range(count))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = [model.from_dict(json.loads(line)) for line in rows]
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    sample = records[0]
+    size = sys.getsizeof(sample) + (sys.getsizeof(sample.__dict__) if hasattr(sample, "__dict__") else 0)
+    return round(held / len(records), 1), size
+
+
+def bench_model(model, lines, total, memory_records):
+    rows = [json.loads(line) for line in lines]
+    records = model.from_dicts(rows)
+    from_dict = model.from_dict
+
+    results = {
+        "from_dict_per_s": _throughput(lambda chunk: [from_dict(row) for row in chunk], rows, total),
+        "from_dicts_per_s": _throughput(model.from_dicts, rows, total),
+        "to_dict_per_s": _throughput(lambda chunk: [record.to_dict() for record in chunk], records, total),
+        "to_dicts_per_s": _throughput(Model.to_dicts, records, total)
+    }
+    results["record_bytes"], results["object_bytes"] = record_bytes(model, lines, memory_records)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data model memory and conversion throughput")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Conversions timed per model and direction")
+    parser.add_argument("--pool", type=int, default=10_000, help="Distinct rows per model, cycled over")
+    parser.add_argument("--memory-records", type=int, default=100_000, help="Records held to measure memory per record")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=bench_results.DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    lines = sample_lines(args.pool)
+    output = {
+        "meta": {**bench_results.machine_info(), "records": args.records, "pool": args.pool, "memory_records": args.memory_records},
+        "results": {}
+    }
+    print(f"{'model':<10} {'from_dict/s':>12} {'from_dicts/s':>13} {'to_dict/s':>12} {'to_dicts/s':>12} {'B/record':>9} {'object B':>9}")
+    for kind, model in MODELS.items():
+        results = bench_model(model, lines[kind], args.records, args.memory_records)
+        output["results"][kind] = results
+        print(
+            f"{kind:<10} {results['from_dict_per_s']:>12,.0f} {results['from_dicts_per_s']:>13,.0f} "
+            f"{results['to_dict_per_s']:>12,.0f} {results['to_dicts_per_s']:>12,.0f} "
+            f"{results['record_bytes']:>9,.0f} {results['object_bytes']:>9}"
+        )
+
+    if args.json_path:
+        bench_results.save(output, args.json_path)
+
+    regressions = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        print(f"\nCompared with {os.path.relpath(args.baseline)}:")
+        rows = bench_results.compare(output["results"], bench_results.load(args.baseline)["results"], args.tolerance)
+        regressions = bench_results.print_comparison(rows, args.tolerance)
+    if args.save_baseline:
+        bench_results.save(output, args.baseline)
+        print(f"\nSaved baseline to {os.path.relpath(args.baseline)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""Benchmark dashboard reruns headlessly with Streamlit's AppTest
+
+app.py is driven with streamlit.testing.v1.AppTest, with synthetic data
+from data.synthetic / data.sample_data loaded into session state:
+
+  teacher/students=N/<tab>   render_teacher_view with an N-student roster
+  parent/weeks=W/<tab>       render_parent_view, two children with W weeks
+  student/weeks=W/<tab>      the student Resources tab, W weeks of roadmap
+
+Scenarios run in a temporary working directory, so nothing is read from or
+written to the repository's data/storage; the teacher and parent scenarios
+first save the same simulated students there through DataStore.
+
+Each scenario is warmed up with one run (which fills the process-wide caches
+a real server would already have), then timed over --runs reruns. Per rerun
+it records wall time (including AppTest's own element-tree parsing), the
+size of the delta messages sent to the browser and, in one extra run under
+tracemalloc, peak Python memory. The same three numbers are broken down per
+render function by wrapping the functions listed in RENDER_FUNCTIONS; a
+function's numbers include the functions it calls.
+
+Usage:
+    python benchmarks/bench_render.py                           # 100 and 1000 students, 12 and 52 weeks
+    python benchmarks/bench_render.py --students 100,1000,10000 --weeks 52 --runs 10
+    python benchmarks/bench_render.py --views teacher --json out.json --save-baseline
+
+Exit status is 1 when any metric is worse than the baseline by more than
+the tolerance (see benchmarks/results.py).
+"""
+import argparse
+import contextlib
+import functools
+import importlib
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks import results as bench_results  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baselines", "render.json")
+
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+# Functions timed individually, by module
+RENDER_FUNCTIONS = {
+    "components.teacher_view": [
+        "render_teacher_view", "render_student_overview", "render_student_details",
+        "render_roadmap_reviews", "render_performance_analytics", "render_communication_hub"
+    ],
+    "components.parent_view": [
+        "render_parent_view", "render_progress_overview", "render_weekly_insights",
+        "render_feedback_form", "render_communication_hub"
+    ],
+    "render_functions": [
+        "render_daily_plan", "render_weekly_roadmap", "render_performance_metrics", "render_swot_analysis"
+    ]
+}
+
+TEACHER_TABS = ["Student Overview", "Roadmap Reviews", "Performance Analytics", "Communication Hub"]
+PARENT_TABS = ["Progress Overview", "Weekly Insights", "Provide Feedback", "Communication"]
+STUDENT_TABS = ["Daily Plan", "Weekly Roadmap", "Performance", "SWOT Analysis"]
+
+
+class Profiler:
+    """Per-function wall time, delta bytes and peak memory for the current run"""
+
+    def __init__(self):
+        self.payload_bytes = 0
+        self.traced = False
+        self.calls = {}
+        self._stack = []
+        self._lock = threading.Lock()
+
+    def reset(self, traced=False):
+        self.payload_bytes = 0
+        self.traced = traced
+        self.calls = {}
+        self._stack = []
+
+    def count(self, msg):
+        with self._lock:
+            self.payload_bytes += msg.ByteSize()
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            self._enter()
+            start = time.perf_counter()
+            start_bytes = self.payload_bytes
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                peak = self._exit()
+                stats = self.calls.setdefault(name, {"calls": 0, "wall_ms": 0.0, "payload_bytes": 0})
+                stats["calls"] += 1
+                stats["wall_ms"] += (time.perf_counter() - start) * 1000
+                stats["payload_bytes"] += self.payload_bytes - start_bytes
+                if peak is not None:
+                    stats["peak_memory_bytes"] = max(stats.get("peak_memory_bytes", 0), peak)
+        return timed
+
+    # tracemalloc has a single peak counter, so nested calls carry their
+    # parent's peak on a stack instead of resetting it away
+    def _enter(self):
+        if not self.traced:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        self._stack.append([current, 0])
+        tracemalloc.reset_peak()
+
+    def _exit(self):
+        if not self.traced or not self._stack:
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        base, carried = self._stack.pop()
+        peak = max(peak, carried)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        return peak - base
+
+
+profiler = Profiler()
+
+
+def install_profiler():
+    """Wrap the render functions and count every delta enqueued for the browser"""
+    enqueue = ForwardMsgQueue.enqueue
+
+    def counting_enqueue(queue, msg):
+        profiler.count(msg)
+        return enqueue(queue, msg)
+
+    ForwardMsgQueue.enqueue = counting_enqueue
+    for module_name, names in RENDER_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            setattr(module, name, profiler.wrap(f"{module_name.split('.')[-1]}.{name}", getattr(module, name)))
+
+
+def measure(at, runs):
+    """Time reruns of an already set up AppTest; returns the scenario's results"""
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"App raised: {at.exception[0].message}")
+
+    walls, per_function = [], {}
+    for _ in range(runs):
+        profiler.reset()
+        start = time.perf_counter()
+        at.run()
+        walls.append((time.perf_counter() - start) * 1000)
+        for name, stats in profiler.calls.items():
+            per_function.setdefault(name, []).append(stats)
+    payload = profiler.payload_bytes
+
+    profiler.reset(traced=True)
+    tracemalloc.start()
+    try:
+        at.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    traced_calls = profiler.calls
+
+    functions = {}
+    for name, samples in per_function.items():
+        functions[name] = {
+            "calls": samples[-1]["calls"],
+            "wall_ms": round(statistics.median(s["wall_ms"] for s in samples), 2),
+            "payload_bytes": samples[-1]["payload_bytes"],
+            "peak_memory_bytes": traced_calls.get(name, {}).get("peak_memory_bytes", 0)
+        }
+    return {
+        "rerun": {
+            **bench_results.percentiles(walls),
+            "payload_bytes": payload,
+            "peak_memory_bytes": peak
+        },
+        "functions": functions
+    }
+
+
+def new_app(role):
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.run()
+    at.sidebar.radio[0].set_value(role)
+    return at
+
+
+@contextlib.contextmanager
+def scratch_store(n_students, weeks):
+    """Switch to a new directory under the working one whose data/storage holds the simulated class
+
+    Students are simulated with the same seed as the dashboards, so the
+    stored records belong to the roster in session state.
+    """
+    from data.synthetic import iter_records, write_datastore
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="store_", dir=cwd))
+    try:
+        write_datastore(iter_records(n_students, weeks))
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def teacher_scenarios(n_students, weeks, runs):
+    from data.synthetic import teacher_dashboard
+
+    with scratch_store(n_students, weeks):
+        at = new_app("Teacher")
+        at.session_state["teacher_data"] = teacher_dashboard(n_students, weeks)
+        for tab in TEACHER_TABS:
+            at.session_state["teacher_tab"] = tab
+            yield f"teacher/students={n_students}/{tab}", measure(at, runs)
+
+
+def parent_scenarios(weeks, runs):
+    from data.synthetic import parent_dashboard
+
+    with scratch_store(2, weeks):
+        at = new_app("Parent")
+        at.session_state["parent_data"] = parent_dashboard(2, weeks)
+        for tab in PARENT_TABS:
+            at.session_state["parent_tab"] = tab
+            yield f"parent/weeks={weeks}/{tab}", measure(at, runs)
+
+
+def student_scenarios(weeks, runs):
+    from data.sample_data import generate_sample_students, get_sample_student_data
+    from utils.data_models import Roadmap
+    from utils.state import DataStore
+
+    at = new_app("Student")
+    student_data = {**get_sample_student_data(), **next(generate_sample_students(1, weeks))}
+    content = "# Roadmap\n\n" + "\n".join(f"## Week {w + 1}\n- Study plan" for w in range(weeks))
+    at.session_state["student_data"] = student_data
+    at.session_state["roadmap_id"] = DataStore.save_roadmap(Roadmap(None, student_data.get("id"), content))
+    at.session_state["student_tab"] = "Resources"
+    for tab in STUDENT_TABS:
+        at.session_state["student_resource_tab"] = tab
+        yield f"student/weeks={weeks}/{tab}", measure(at, runs)
+
+
+def print_scenario(name, results):
+    rerun = results["rerun"]
+    print(
+        f"\n{name}: rerun p50 {rerun['p50_ms']:.1f} ms, "
+        f"{rerun['payload_bytes'] / 1024:.1f} KiB deltas, peak {rerun['peak_memory_bytes'] / 2**20:.1f} MiB"
+    )
+    for fn, stats in sorted(results["functions"].items(), key=lambda item: -item[1]["wall_ms"]):
+        print(
+            f"  {fn:<45} {stats['wall_ms']:>9.1f} ms {stats['payload_bytes'] / 1024:>9.1f} KiB"
+            f" {stats['peak_memory_bytes'] / 2**20:>8.1f} MiB  x{stats['calls']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard reruns with Streamlit's AppTest")
+    parser.add_argument("--views", default="teacher,parent,student", help="Comma-separated views to run")
+    parser.add_argument("--students", default="100,1000", help="Comma-separated teacher roster sizes")
+    parser.add_argument("--weeks", default="12,52", help="Comma-separated weeks of history for parent and student views")
+    parser.add_argument("--runs", type=int, default=5, help="Timed reruns per scenario")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=bench_results.DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    baseline = os.path.abspath(args.baseline)
+    # The app reads and writes data/storage relative to the working directory; teacher
+    # and parent scenarios each get a store of their own under it (see scratch_store)
+    workdir = tempfile.mkdtemp(prefix="bench_render_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    install_profiler()
+
+    views = {v.strip() for v in args.views.split(",")}
+    students = [int(n) for n in args.students.split(",") if n.strip()]
+    weeks = [int(w) for w in args.weeks.split(",") if w.strip()]
+    scenarios = []
+    if "teacher" in views:
+        scenarios += [functools.partial(teacher_scenarios, n, max(weeks), args.runs) for n in students]
+    if "parent" in views:
+        scenarios += [functools.partial(parent_scenarios, w, args.runs) for w in weeks]
+    if "student" in views:
+        scenarios += [functools.partial(student_scenarios, w, args.runs) for w in weeks]
+
+    output = {"meta": {**bench_results.machine_info(), "runs": args.runs}, "results": {}}
+    try:
+        for scenario in scenarios:
+            for name, results in scenario():
+                output["results"][name] = results
+                print_scenario(name, results)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if json_path:
+        bench_results.save(output, json_path)
+
+    regressions = 0
+    if os.path.exists(baseline) and not args.save_baseline:
+        print(f"\nCompared with {os.path.relpath(baseline)}:")
+        rows = bench_results.compare(output["results"], bench_results.load(baseline)["results"], args.tolerance)
+        regressions = bench_results.print_comparison(rows, args.tolerance)
+    if args.save_baseline:
+        bench_results.save(output, baseline)
+        print(f"\nSaved baseline to {os.path.relpath(baseline)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Benchmark the DataStore storage layer
+
+For each scale (total stored records), a scratch data/storage is filled
+with synthetic students, roadmaps, progress and feedback in the mix
+data.synthetic produces (about 52 progress updates per student). Then:
+
+  save_*       latency of DataStore.save_student/roadmap/progress/feedback
+  get_*        latency of the by-id getters
+  scan/*       cost of the full-directory scans get_student_roadmap,
+               get_student_progress, get_student_progress_history and
+               get_roadmap_feedback, and of building the column batches
+               the analytics read (ProgressBatch, FeedbackBatch), also per
+               stored record
+  concurrent/* save_progress throughput with 1, 4 and 16 writer threads,
+               and how many writes each student's summary is missing
+
+The store is filled by writing DataStore's files directly (much faster than
+the save path being measured); each scale runs in its own temp directory.
+
+Usage:
+    python benchmarks/bench_storage.py                          # 1k and 10k records
+    python benchmarks/bench_storage.py --scales 1000,10000,100000,1000000
+    python benchmarks/bench_storage.py --json out.json --save-baseline
+    python benchmarks/bench_storage.py --baseline benchmarks/baselines/storage.json
+
+Exit status is 1 when any metric is worse than the baseline by more than
+the tolerance (--tolerance, default BENCH_TOLERANCE or 25%).
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import results as bench_results  # noqa: E402
+from data.synthetic import iter_records  # noqa: E402
+from utils.batches import FeedbackBatch, ProgressBatch  # noqa: E402
+from utils.state import DataStore  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baselines", "storage.json")
+
+# Ids kept per kind for the lookups and scans
+SAMPLE_IDS = 200
+
+WRITER_COUNTS = [1, 4, 16]
+
+
+def populate(n_records, seed=0):
+    """Fill ./data/storage with n synthetic records; returns sample ids per kind"""
+    os.makedirs("data/storage", exist_ok=True)
+    ids = {"student": [], "roadmap": [], "progress": [], "feedback": []}
+    # About 56 records per student for 52 weeks, so this always yields enough
+    records = iter_records(n_records // 40 + 1, weeks=52, seed=seed)
+    for _, (kind, record) in zip(range(n_records), records):
+        with open(f"data/storage/{kind}_{record.id}.json", "w") as f:
+            json.dump(record.to_dict(), f, indent=2)
+        if len(ids[kind]) < SAMPLE_IDS:
+            ids[kind].append(record.id)
+    return ids
+
+
+def _time_calls(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _fresh_records(ops, seed):
+    """New records of every kind to save, with ids cleared so each save creates a file"""
+    fresh = {"student": [], "roadmap": [], "progress": [], "feedback": []}
+    for kind, record in iter_records(ops, weeks=4, seed=seed):
+        if len(fresh[kind]) < ops:
+            record.id = None
+            fresh[kind].append(record)
+    return fresh
+
+
+def bench_single(ids, ops, scan_runs):
+    results = {}
+
+    fresh = _fresh_records(ops, seed=1)
+    savers = {
+        "student": DataStore.save_student,
+        "roadmap": DataStore.save_roadmap,
+        "progress": DataStore.save_progress,
+        "feedback": DataStore.save_feedback
+    }
+    for kind, save in savers.items():
+        results[f"save_{kind}"] = bench_results.percentiles(_time_calls(save, [(r,) for r in fresh[kind]]))
+
+    getters = {
+        "student": DataStore.get_student,
+        "roadmap": DataStore.get_roadmap,
+        "progress": DataStore.get_progress,
+        "feedback": DataStore.get_feedback
+    }
+    for kind, get in getters.items():
+        sample = (ids[kind] * (ops // max(1, len(ids[kind])) + 1))[:ops]
+        results[f"get_{kind}"] = bench_results.percentiles(_time_calls(get, [(i,) for i in sample]))
+
+    scans = {
+        "get_student_roadmap": (DataStore.get_student_roadmap, ids["student"]),
+        "get_student_progress": (DataStore.get_student_progress, ids["student"]),
+        "get_student_progress_history": (DataStore.get_student_progress_history, ids["student"]),
+        "get_roadmap_feedback": (DataStore.get_roadmap_feedback, ids["roadmap"]),
+        "progress_batch": (ProgressBatch.from_storage, ids["student"]),
+        "feedback_batch": (lambda roadmap_id: FeedbackBatch.from_storage(roadmap_id=roadmap_id), ids["roadmap"])
+    }
+    stored = len(os.listdir("data/storage"))
+    results["scan"] = {}
+    for name, (scan, keys) in scans.items():
+        stats = bench_results.percentiles(_time_calls(scan, [(k,) for k in keys[:scan_runs]]))
+        stats["per_record_us"] = round(stats["p50_ms"] * 1000 / stored, 3)
+        results["scan"][name] = stats
+    results["stored_files"] = stored
+    return results
+
+
+def bench_concurrent(ops, writers):
+    """save_progress throughput with the given number of writer threads, one student each"""
+    fresh = _fresh_records(writers, seed=2)["progress"]
+    batches = [(f"bench-writer-{writers}-{w}", fresh[w % len(fresh)]) for w in range(writers)]
+
+    def write(batch):
+        student_id, template = batch
+        data = {**template.to_dict(), "id": None, "student_id": student_id}
+        for _ in range(ops):
+            DataStore.save_progress(dict(data))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(write, batches))
+    elapsed = time.perf_counter() - start
+
+    # Each student's running summary should have counted every write
+    lost = 0
+    for student_id, _ in batches:
+        summary = DataStore.get_progress_summary(student_id)
+        lost += ops - (summary.entries if summary else 0)
+    return {
+        "writes": ops * writers,
+        "wall_ms": round(elapsed * 1000, 1),
+        "writes_per_s": round(ops * writers / elapsed, 1),
+        "lost_summary_updates": lost
+    }
+
+
+def run_scale(n_records, ops, scan_runs, workdir, keep=False):
+    scratch = tempfile.mkdtemp(prefix=f"bench_storage_{n_records}_", dir=workdir)
+    cwd = os.getcwd()
+    os.chdir(scratch)
+    try:
+        start = time.perf_counter()
+        ids = populate(n_records)
+        populate_s = time.perf_counter() - start
+        results = bench_single(ids, ops, scan_runs)
+        results["populate_s"] = round(populate_s, 1)
+        results["concurrent"] = {f"writers_{w}": bench_concurrent(ops, w) for w in WRITER_COUNTS}
+        return results
+    finally:
+        os.chdir(cwd)
+        if not keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def print_scale(n_records, results):
+    print(f"\n{n_records:,} records (filled in {results['populate_s']} s)")
+    for name, stats in results.items():
+        if name.startswith(("save_", "get_")):
+            print(f"  {name:<34} p50 {stats['p50_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms")
+    for name, stats in results["scan"].items():
+        print(f"  scan {name:<29} p50 {stats['p50_ms']:>9.1f} ms  ({stats['per_record_us']:.2f} us/record)")
+    for name, stats in results["concurrent"].items():
+        print(
+            f"  concurrent {name:<23} {stats['writes_per_s']:>9.1f} writes/s"
+            + (f"  ({stats['lost_summary_updates']} lost summary updates)" if stats["lost_summary_updates"] else "")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DataStore storage layer")
+    parser.add_argument("--scales", default="1000,10000", help="Comma-separated stored record counts")
+    parser.add_argument("--ops", type=int, default=100, help="Calls per save/get measurement and writes per writer thread")
+    parser.add_argument("--scan-runs", type=int, default=3, help="Calls per scan measurement")
+    parser.add_argument("--workdir", default=None, help="Where the scratch stores are created (default: system temp)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch stores")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=bench_results.DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    output = {"meta": {**bench_results.machine_info(), "ops": args.ops, "scan_runs": args.scan_runs}, "results": {}}
+    for n_records in scales:
+        results = run_scale(n_records, args.ops, args.scan_runs, args.workdir, args.keep)
+        output["results"][str(n_records)] = results
+        print_scale(n_records, results)
+
+    if args.json_path:
+        bench_results.save(output, args.json_path)
+
+    regressions = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        print(f"\nCompared with {os.path.relpath(args.baseline)}:")
+        rows = bench_results.compare(output["results"], bench_results.load(args.baseline)["results"], args.tolerance)
+        regressions = bench_results.print_comparison(rows, args.tolerance)
+    if args.save_baseline:
+        bench_results.save(output, args.baseline)
+        print(f"\nSaved baseline to {os.path.relpath(args.baseline)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Cold-start import profiler for the Streamlit app
+
+Runs ``python -X importtime -c "import app"`` in fresh interpreters, attributes
+the import cost to each module and to the project module (app.py,
+components/*_view.py, utils/...) that pulled it in, and fails when the total
+cold-start import time of app.py exceeds the configured budget.
+
+Usage:
+    python benchmarks/import_profile.py                 # report + budget check
+    python benchmarks/import_profile.py --runs 5 --top 30
+    python benchmarks/import_profile.py --json results.json
+    python benchmarks/import_profile.py --budget-ms 1500
+
+Exit status is 1 when the median total exceeds the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS_FILE = os.path.join(ROOT_DIR, "benchmarks", "budgets.json")
+
+# Top-level names of modules that belong to this project
+PROJECT_PACKAGES = ("app", "agents", "components", "data", "utils", "render_functions")
+
+
+class ImportNode:
+    """One line of -X importtime output, with the imports it triggered"""
+
+    def __init__(self, name, self_us, cumulative_us, depth):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+        self.children = []
+
+    @property
+    def package(self):
+        return self.name.split(".")[0]
+
+    @property
+    def is_project(self):
+        return self.package in PROJECT_PACKAGES
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into a list of root ImportNodes
+
+    The interpreter prints each module after its own imports, indented by
+    nesting depth, so children are collected until their parent line appears.
+    """
+    pending = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        name = name[1:]  # drop the separator space; the rest is indentation
+        self_us = int(self_us)
+        cumulative_us = int(cumulative_us)
+        depth = (len(name) - len(name.lstrip())) // 2
+        node = ImportNode(name.strip(), self_us, cumulative_us, depth)
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def walk(nodes):
+    """Yield every node of an import tree"""
+    for node in nodes:
+        yield node
+        yield from walk(node.children)
+
+
+def run_once(target):
+    """Import the target module in a fresh interpreter and return the import tree"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def profile(target="app", runs=3):
+    """Profile cold-start imports of a module over several runs
+
+    Returns:
+        dict: Median total import time, per-module self/cumulative time,
+        per-package totals and the heavy imports attributed to each project module
+    """
+    # Warm-up run so bytecode compilation is not counted
+    run_once(target)
+
+    totals = []
+    module_self = {}
+    module_cumulative = {}
+    attribution = {}
+    for _ in range(runs):
+        roots = run_once(target)
+        target_node = next((n for n in roots if n.name == target), None)
+        totals.append(target_node.cumulative_us if target_node else sum(n.cumulative_us for n in roots))
+
+        for node in walk(roots):
+            module_self.setdefault(node.name, []).append(node.self_us)
+            module_cumulative.setdefault(node.name, []).append(node.cumulative_us)
+            if node.is_project:
+                # Third-party imports made directly by this project module
+                for child in node.children:
+                    if not child.is_project:
+                        attribution.setdefault(node.name, {}).setdefault(child.name, []).append(child.cumulative_us)
+
+    modules = [
+        {
+            "module": name,
+            "self_ms": statistics.median(module_self[name]) / 1000,
+            "cumulative_ms": statistics.median(module_cumulative[name]) / 1000
+        }
+        for name in module_self
+    ]
+
+    packages = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + module["self_ms"]
+
+    return {
+        "target": target,
+        "runs": runs,
+        "total_ms": statistics.median(totals) / 1000,
+        "modules": sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True),
+        "packages": dict(sorted(packages.items(), key=lambda p: p[1], reverse=True)),
+        "attribution": {
+            owner: {
+                dep: statistics.median(times) / 1000
+                for dep, times in sorted(deps.items(), key=lambda d: -statistics.median(d[1]))
+            }
+            for owner, deps in sorted(attribution.items())
+        }
+    }
+
+
+def load_budget(target):
+    """Read the import budget for a target from benchmarks/budgets.json"""
+    env_budget = os.getenv("IMPORT_BUDGET_MS")
+    if env_budget:
+        return float(env_budget)
+    if not os.path.exists(BUDGETS_FILE):
+        return None
+    with open(BUDGETS_FILE, "r") as f:
+        return json.load(f).get(f"import_{target}_ms")
+
+
+def print_report(results, top):
+    """Print a human-readable report"""
+    print(f"Cold-start import of '{results['target']}': {results['total_ms']:.1f} ms (median of {results['runs']} runs)\n")
+
+    print("Packages by self time:")
+    for package, ms in list(results["packages"].items())[:top]:
+        print(f"  {package:<40} {ms:>9.1f} ms")
+
+    print("\nHeavy imports by project module (cumulative):")
+    for owner, deps in results["attribution"].items():
+        print(f"  {owner}")
+        for dep, ms in list(deps.items())[:5]:
+            print(f"    {dep:<38} {ms:>9.1f} ms")
+
+    print(f"\nTop {top} modules by cumulative time:")
+    for module in results["modules"][:top]:
+        print(f"  {module['module']:<40} {module['cumulative_ms']:>9.1f} ms  (self {module['self_ms']:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile cold-start import time of the app")
+    parser.add_argument("--target", default="app", help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of measured runs")
+    parser.add_argument("--top", type=int, default=20, help="Rows to show per section")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the total exceeds this (overrides budgets.json)")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    results = profile(args.target, args.runs)
+    budget = args.budget_ms if args.budget_ms is not None else load_budget(args.target)
+    results["budget_ms"] = budget
+    results["over_budget"] = budget is not None and results["total_ms"] > budget
+
+    print_report(results, args.top)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if budget is None:
+        print("\nNo budget configured")
+        return 0
+    if results["over_budget"]:
+        print(f"\nFAIL: {results['total_ms']:.1f} ms exceeds the {budget:.0f} ms import budget")
+        return 1
+    print(f"\nOK: within the {budget:.0f} ms import budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
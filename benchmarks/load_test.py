@@ -0,0 +1,469 @@
+"""Load test the Streamlit app with many concurrent sessions
+
+Starts `streamlit run app.py` on a free local port with the stub LLM from
+benchmarks/stub_llm.py behind the agents, then opens N websocket sessions
+that click through app.py the way a browser would:
+
+  student  Use Sample Data -> Generate My Roadmap -> Progress Tracking tab
+           -> Submit Progress Update
+  teacher  Use Sample Data -> Generate My Roadmap -> Teacher role
+           -> Submit Feedback (one LLM call)
+  parent   Use Sample Data -> Generate My Roadmap -> Parent role
+           -> Submit Feedback (one LLM call)
+
+Sessions speak Streamlit's websocket protocol directly: each action sends
+the widget states a browser would (built with streamlit.testing's element
+tree) and waits for the rerun it causes to finish. Widgets inside fragments
+rerun only their fragment, as in a browser.
+
+Per scale it reports throughput (actions and flows per second), latency
+percentiles per action, and per-session memory as the server's RSS growth
+with every session open, divided by the number of sessions. The server is
+restarted for each scale so memory starts clean.
+
+Usage:
+    python benchmarks/load_test.py                              # 10 and 50 sessions
+    python benchmarks/load_test.py --sessions 100,200 --mix 6:2:2 --llm-latency-ms 1500
+    python benchmarks/load_test.py --url http://localhost:8501  # an already running server
+    python benchmarks/load_test.py --json out.json --save-baseline
+
+Exit status is 1 when any action fails, or when a metric is worse than the
+baseline by more than the tolerance (see benchmarks/results.py).
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import websockets  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+from streamlit.testing.v1.element_tree import parse_tree_from_messages  # noqa: E402
+
+from benchmarks import results as bench_results  # noqa: E402
+from benchmarks.stub_llm import StubLLMServer  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baselines", "load.json")
+
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+ROLES = ("student", "teacher", "parent")
+
+PROGRESS_UPDATE = {
+    "What tasks have you completed from your roadmap?": "- [x] Algebra practice set\n- [x] Physics chapter 3 notes\n- [ ] Chemistry mock test",
+    "How much time have you spent studying each subject?": "Math: 4 hours\nPhysics: 3 hours\nChemistry: 90 minutes",
+    "Enter any assessment results or practice scores": "Math quiz: 82%\nPhysics practice test: 71%"
+}
+
+TEACHER_FEEDBACK = {
+    "Enter your feedback on the student's roadmap and progress": "Good pace in Math; needs more timed practice for Physics."
+}
+
+PARENT_FEEDBACK = {
+    "Enter your feedback on your child's roadmap and progress": "Studies well in the mornings but gets tired after 8pm."
+}
+
+FINISHED = ForwardMsg.ScriptFinishedStatus
+
+
+class ActionFailed(Exception):
+    """An action did not find its widget or the app raised"""
+
+
+class Session:
+    """One browser tab connected to the app"""
+
+    def __init__(self, url, timeout_s, latencies=None):
+        self.url = url.rstrip("/").replace("http", "ws", 1) + "/_stcore/stream"
+        self.timeout_s = timeout_s
+        self.ws = None
+        self.tree = None
+        self.latencies = [] if latencies is None else latencies
+        self._messages = []
+        self._fragments = {}
+        self._tabs = set()
+        self._values = {}
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        await self._rerun("load")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def click(self, label, action):
+        button = self._find(self.tree.button, label)
+        # Triggers are sent with the next rerun only
+        trigger = WidgetState(id=button.id, trigger_value=True)
+        await self._rerun(action, self._fragments.get(button.id, ""), [trigger])
+
+    async def choose_role(self, role, action):
+        self._set(self.tree.sidebar.radio[0], role.title())
+        await self._rerun(action)
+
+    async def open_tab(self, key, label, action):
+        """Select a lazy tab, as clicking it does for tabs created with on_change="rerun" """
+        tab_id = next((tab_id for tab_id in self._tabs if tab_id.endswith(f"-{key}")), None)
+        if tab_id is None:
+            raise ActionFailed(f"No tabs with key {key!r}")
+        self._values[tab_id] = WidgetState(id=tab_id, string_value=label)
+        await self._rerun(action)
+
+    async def submit(self, fields, submit_label, action):
+        for label, value in fields.items():
+            self._set(self._find(self.tree.text_area, label), value)
+        await self.click(submit_label, action)
+
+    def _find(self, widgets, label):
+        for widget in widgets:
+            if widget.label == label:
+                return widget
+        raise ActionFailed(f"No widget labelled {label!r}")
+
+    def _set(self, widget, value):
+        """Set a radio or text widget, whose value is sent as its (option) string"""
+        # Like a browser, keep sending a value once the user has set it; the
+        # server falls back to defaults for widgets it hears nothing about
+        self._values[widget.id] = WidgetState(id=widget.id, string_value=value)
+
+    async def _rerun(self, action, fragment_id="", triggers=()):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = ""
+        state.page_script_hash = ""
+        state.fragment_id = fragment_id
+        state.widget_states.widgets.extend(list(self._values.values()) + list(triggers))
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._receive_until_finished(), self.timeout_s)
+        self.latencies.append((action, (time.perf_counter() - start) * 1000))
+
+        self.tree = parse_tree_from_messages(self._messages)
+        if self.tree.exception:
+            raise ActionFailed(f"{action}: app raised {self.tree.exception[0].message}")
+        # app.py shows agent failures it catches as st.error("Error ...")
+        for alert in self.tree.error:
+            if alert.value.startswith("Error "):
+                raise ActionFailed(f"{action}: {alert.value}")
+
+    async def _receive_until_finished(self):
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "new_session" and not msg.new_session.fragment_ids_this_run:
+                # A full run redraws the page; fragment runs add to the last one
+                self._messages = []
+            elif kind == "delta":
+                self._messages.append(msg)
+                self._index(msg)
+            elif kind == "script_finished" and msg.script_finished != FINISHED.FINISHED_EARLY_FOR_RERUN:
+                if msg.script_finished == FINISHED.FINISHED_WITH_COMPILE_ERROR:
+                    raise ActionFailed("app failed to compile")
+                return
+
+    def _index(self, msg):
+        """Remember which fragment each widget is in, and the ids of keyed tabs"""
+        delta = msg.delta
+        if delta.WhichOneof("type") == "new_element":
+            element = getattr(delta.new_element, delta.new_element.WhichOneof("type"))
+            widget_id = getattr(element, "id", "")
+            if widget_id and delta.fragment_id:
+                self._fragments[widget_id] = delta.fragment_id
+        elif delta.WhichOneof("type") == "add_block" and delta.add_block.HasField("tab_container"):
+            if delta.add_block.tab_container.id:
+                self._tabs.add(delta.add_block.tab_container.id)
+
+
+async def student_flow(session):
+    await session.click("Use Sample Data", "use_sample_data")
+    await session.click("Generate My Roadmap", "generate_roadmap")
+    await session.open_tab("student_tab", "Progress Tracking", "open_progress_tab")
+    await session.submit(PROGRESS_UPDATE, "Submit Progress Update", "submit_progress")
+
+
+async def teacher_flow(session):
+    await session.click("Use Sample Data", "use_sample_data")
+    await session.click("Generate My Roadmap", "generate_roadmap")
+    await session.choose_role("teacher", "open_teacher_view")
+    await session.submit(TEACHER_FEEDBACK, "Submit Feedback", "submit_teacher_feedback")
+
+
+async def parent_flow(session):
+    await session.click("Use Sample Data", "use_sample_data")
+    await session.click("Generate My Roadmap", "generate_roadmap")
+    await session.choose_role("parent", "open_parent_view")
+    await session.submit(PARENT_FEEDBACK, "Submit Feedback", "submit_parent_feedback")
+
+
+FLOWS = {"student": student_flow, "teacher": teacher_flow, "parent": parent_flow}
+
+
+async def run_session(url, role, delay_s, think_s, iterations, timeout_s):
+    """Run one user's flow; returns (latencies, errors, flows completed)"""
+    await asyncio.sleep(delay_s)
+    session = Session(url, timeout_s)
+    errors, flows = [], 0
+    try:
+        await session.connect()
+        for _ in range(iterations):
+            await FLOWS[role](ThinkingSession(session, think_s))
+            flows += 1
+            # Start the next iteration in a new session, as a reload would
+            if flows < iterations:
+                await session.close()
+                session = Session(url, timeout_s, session.latencies)
+                await session.connect()
+    except (ActionFailed, asyncio.TimeoutError, websockets.WebSocketException, OSError) as e:
+        errors.append(f"{role}: {type(e).__name__}: {e}")
+    finally:
+        await session.close()
+    return session.latencies, errors, flows
+
+
+class ThinkingSession:
+    """Pauses for a randomised think time before each action"""
+
+    def __init__(self, session, think_s):
+        self._session = session
+        self._think_s = think_s
+
+    def __getattr__(self, name):
+        method = getattr(self._session, name)
+
+        async def act(*args, **kwargs):
+            if self._think_s:
+                await asyncio.sleep(random.uniform(0.5, 1.5) * self._think_s)
+            return await method(*args, **kwargs)
+        return act
+
+
+def role_mix(n_sessions, mix):
+    """Split n sessions between roles in the given ratio, e.g. (3, 1, 1)"""
+    total = sum(mix)
+    counts = [n_sessions * weight // total for weight in mix]
+    weighted = [i for i, weight in enumerate(mix) if weight]
+    for i in range(n_sessions - sum(counts)):
+        counts[weighted[i % len(weighted)]] += 1
+    return [role for role, count in zip(ROLES, counts) for _ in range(count)]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read().decode()
+
+
+def start_server(llm_base_url, workdir):
+    """Start the app on a free port in workdir; returns (process, url)"""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "stub",
+        "GROQ_API_BASE": llm_base_url,
+        "READINESS_MODEL_PATH": os.path.join(ROOT_DIR, "data", "models", "readiness_model.json")
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+            "--logger.level", "error"
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode}")
+        try:
+            if _get(url + "/_stcore/health", timeout=1).strip() == "ok":
+                return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60 s")
+
+
+def rss_bytes(pid):
+    """Resident set size of a local process, or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def run_scale(url, roles, args, pid=None):
+    # One warm-up session pays for imports and caches before anything is measured
+    await run_session(url, "student", 0, 0, 1, args.timeout)
+    rss_before = rss_bytes(pid) if pid else None
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[
+        run_session(url, role, i * args.ramp / max(1, len(roles)), args.think, args.iterations, args.timeout)
+        for i, role in enumerate(roles)
+    ])
+    elapsed = time.perf_counter() - start
+
+    by_action, errors, flows = {}, [], 0
+    for latencies, session_errors, session_flows in outcomes:
+        for action, ms in latencies:
+            by_action.setdefault(action, []).append(ms)
+        errors += session_errors
+        flows += session_flows
+    actions = sum(len(samples) for samples in by_action.values())
+
+    # Memory held by sessions that stay open, as a browser tab would
+    held = [Session(url, args.timeout) for _ in roles]
+    try:
+        for session in held:
+            await session.connect()
+            await session.click("Use Sample Data", "use_sample_data")
+            await session.click("Generate My Roadmap", "generate_roadmap")
+        rss_after = rss_bytes(pid) if pid else None
+    except (ActionFailed, asyncio.TimeoutError, websockets.WebSocketException, OSError) as e:
+        errors.append(f"held sessions: {type(e).__name__}: {e}")
+        rss_after = None
+    finally:
+        for session in held:
+            await session.close()
+
+    results = {
+        "sessions": len(roles),
+        "wall_s": round(elapsed, 2),
+        "flows": flows,
+        "actions": actions,
+        "errors": len(errors),
+        "actions_per_s": round(actions / elapsed, 2),
+        "flows_per_s": round(flows / elapsed, 3),
+        "latency": {action: bench_results.percentiles(samples) for action, samples in sorted(by_action.items())},
+        "memory": {}
+    }
+    if rss_before is not None and rss_after is not None:
+        results["memory"]["server_rss_bytes"] = rss_after
+        results["memory"]["rss_per_session_bytes"] = max(0, rss_after - rss_before) // len(roles)
+    return results, errors
+
+
+def print_scale(name, results, errors):
+    print(
+        f"\n{name}: {results['flows']} flows, {results['actions']} actions in {results['wall_s']} s "
+        f"({results['actions_per_s']} actions/s, {results['flows_per_s']} flows/s)"
+    )
+    for action, stats in results["latency"].items():
+        print(f"  {action:<26} p50 {stats['p50_ms']:>9.1f} ms  p95 {stats['p95_ms']:>9.1f} ms  max {stats['max_ms']:>9.1f} ms")
+    memory = results["memory"]
+    if "rss_per_session_bytes" in memory:
+        print(
+            f"  server RSS {memory['server_rss_bytes'] / 2**20:.1f} MiB, "
+            f"{memory['rss_per_session_bytes'] / 1024:.1f} KiB per session"
+        )
+    for error in errors[:10]:
+        print(f"  error: {error}")
+    if len(errors) > 10:
+        print(f"  ... and {len(errors) - 10} more errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app with concurrent student, teacher and parent sessions")
+    parser.add_argument("--sessions", default="10,50", help="Comma-separated numbers of concurrent sessions")
+    parser.add_argument("--mix", default="3:1:1", help="Student:teacher:parent ratio")
+    parser.add_argument("--iterations", type=int, default=1, help="Flows each session runs")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean pause before each action, in seconds")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which sessions are started")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for one rerun")
+    parser.add_argument("--llm-latency-ms", type=float, default=500, help="Mean stub LLM answer time")
+    parser.add_argument("--url", help="Test an already running server instead (it must use the stub LLM itself)")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=bench_results.DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    mix = [int(part) for part in args.mix.split(":")]
+    if len(mix) != len(ROLES) or min(mix) < 0 or sum(mix) <= 0:
+        parser.error("--mix needs three non-negative weights, e.g. 3:1:1")
+    scales = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    output = {
+        "meta": {
+            **bench_results.machine_info(),
+            "mix": args.mix,
+            "iterations": args.iterations,
+            "think_s": args.think,
+            "llm_latency_ms": args.llm_latency_ms
+        },
+        "results": {}
+    }
+    all_errors = []
+    llm = None if args.url else StubLLMServer(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_latency_ms / 5)
+    if llm:
+        llm.serve_in_background()
+    try:
+        for n_sessions in scales:
+            roles = role_mix(n_sessions, mix)
+            if args.url:
+                results, errors = asyncio.run(run_scale(args.url, roles, args))
+            else:
+                # The app writes data/storage relative to its working directory
+                workdir = tempfile.mkdtemp(prefix=f"load_test_{n_sessions}_")
+                process, url = start_server(llm.base_url, workdir)
+                try:
+                    results, errors = asyncio.run(run_scale(url, roles, args, process.pid))
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+                    shutil.rmtree(workdir, ignore_errors=True)
+            name = f"sessions={n_sessions}"
+            output["results"][name] = results
+            all_errors += errors
+            print_scale(name, results, errors)
+    finally:
+        if llm:
+            llm.shutdown()
+            print(f"\nStub LLM answered {llm.requests} completions")
+
+    if args.json_path:
+        bench_results.save(output, args.json_path)
+
+    regressions = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        print(f"\nCompared with {os.path.relpath(args.baseline)}:")
+        rows = bench_results.compare(output["results"], bench_results.load(args.baseline)["results"], args.tolerance)
+        regressions = bench_results.print_comparison(rows, args.tolerance)
+    if args.save_baseline:
+        bench_results.save(output, args.baseline)
+        print(f"\nSaved baseline to {os.path.relpath(args.baseline)}")
+    return 1 if regressions or all_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
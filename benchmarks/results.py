@@ -0,0 +1,119 @@
+"""Shared result handling for the benchmark scripts
+
+Results are nested dicts whose leaves are numbers. Medians (p50_ms),
+wall times (wall_ms) and sizes (*_bytes) are costs, lower is better;
+*_per_s leaves are throughput, higher is better. Tail latencies and
+everything else are reported but not compared, being too noisy to gate on.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Leaves compared against a baseline, by suffix
+COSTS = ("p50_ms", "wall_ms", "_bytes")
+THROUGHPUTS = ("_per_s",)
+
+# Relative slowdown tolerated before a metric counts as a regression
+DEFAULT_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.25"))
+
+
+def percentiles(samples_ms):
+    """p50 / p95 / max of a list of timings in ms"""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+    return {
+        "n": len(ordered),
+        "p50_ms": round(ordered[int(0.5 * (len(ordered) - 1))], 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+
+def machine_info():
+    """Where and on what the results were measured"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b_ms": 1}} -> {"a/b_ms": 1}"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "/"))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results with a baseline of the same shape
+
+    Returns:
+        list: One dict per metric present in both, with baseline, current,
+        change (relative, positive is worse) and regression flag
+    """
+    current, previous = flatten(results), flatten(baseline)
+    rows = []
+    for path in sorted(current.keys() & previous.keys()):
+        if path.endswith(COSTS):
+            worse = 1
+        elif path.endswith(THROUGHPUTS):
+            worse = -1
+        else:
+            continue
+        before, after = previous[path], current[path]
+        if not before:
+            continue
+        change = worse * (after - before) / before
+        rows.append({
+            "metric": path,
+            "baseline": before,
+            "current": after,
+            "change": round(change, 3),
+            "regression": change > tolerance
+        })
+    return rows
+
+
+def print_comparison(rows, tolerance=DEFAULT_TOLERANCE):
+    """Print a comparison table; returns the number of regressions"""
+    if not rows:
+        print("No metrics in common with the baseline")
+        return 0
+    width = max(len(row["metric"]) for row in rows)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"  {row['metric']:<{width}}  {row['baseline']:>12,.3f} -> {row['current']:>12,.3f}  {row['change']:>+7.0%}  {flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} of {len(rows)} metrics worse than the baseline by more than {tolerance:.0%}")
+    return regressions
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(data, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,131 @@
+"""A stand-in for the Groq chat completions API, for load tests
+
+Answers POST /openai/v1/chat/completions (the path langchain_groq calls
+under GROQ_API_BASE) with a canned reply after a fixed latency plus jitter,
+so agent calls cost what a real model call would without any network or
+API key. Token usage is estimated from the request and reply lengths.
+
+Usage:
+    python benchmarks/stub_llm.py --port 8701 --latency-ms 800
+    GROQ_API_KEY=stub GROQ_API_BASE=http://127.0.0.1:8701 streamlit run app.py
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = """### Summary
+The feedback is clear and specific.
+
+### Recommended Adjustments
+1. Add two short review sessions for the weakest topic each week
+2. Move practice tests to the start of the week
+3. Keep the current schedule for the strongest subjects
+
+### Next Steps
+Revisit the plan after the next assessment."""
+
+
+def _tokens(text):
+    return max(1, len(text) // 4)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            self._send(400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        server = self.server
+        delay = max(0.0, random.gauss(server.latency_s, server.jitter_s))
+        time.sleep(delay)
+
+        prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+        tokens_in, tokens_out = _tokens(prompt), _tokens(REPLY)
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        self._send(200, {
+            "id": f"chatcmpl-stub-{count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": REPLY},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": tokens_in,
+                "completion_tokens": tokens_out,
+                "total_tokens": tokens_in + tokens_out,
+                "prompt_time": delay / 4,
+                "completion_time": delay * 3 / 4,
+                "total_time": delay
+            }
+        })
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Threaded stub server; serve_in_background() returns once it is listening"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency_ms=500, jitter_ms=100, host="127.0.0.1"):
+        super().__init__((host, port), StubLLMHandler)
+        self.latency_s = latency_ms / 1000
+        self.jitter_s = jitter_ms / 1000
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_in_background(self):
+        thread = threading.Thread(target=self.serve_forever, name="stub-llm", daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stub Groq chat completions API")
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--latency-ms", type=float, default=500, help="Mean time to answer a completion")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Standard deviation of the answer time")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.port, args.latency_ms, args.jitter_ms)
+    print(f"Stub LLM listening on {server.base_url} (set GROQ_API_BASE to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import streamlit as st
+import pandas as pd
+import json
+import sys
+from utils.telemetry import telemetry
+from utils.figure_cache import figure_cache
+from utils.session_memory import session_memory
+from utils.state import record_cache
+
+def render_admin_view(state):
+    """Render the admin dashboard with agent call telemetry."""
+    st.title("Admin Dashboard")
+
+    render_startup_metrics(state)
+    render_figure_cache_stats(state)
+    render_record_cache_stats(state)
+    render_session_memory(state)
+    render_agent_telemetry(state)
+
+def render_startup_metrics(state):
+    """Render this session's startup timing and which heavy modules are loaded."""
+    st.subheader("Startup")
+
+    startup = state.get('startup_ms', {})
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("App Import", f"{startup.get('import_ms', 0):.0f} ms")
+    with col2:
+        st.metric("First Render", f"{startup.get('first_render_ms', 0):.0f} ms")
+    with col3:
+        total = startup.get('import_ms', 0) + startup.get('first_render_ms', 0)
+        budget = startup.get('budget_ms', 0)
+        st.metric("Budget", f"{budget:.0f} ms", delta=f"{budget - total:.0f} ms headroom")
+
+    # The LLM stack should only appear here after an agent has actually been used
+    loaded = [m for m in ("langchain", "langchain_groq", "groq") if m in sys.modules]
+    st.caption(f"LLM modules loaded in this process: {', '.join(loaded) if loaded else 'none'}")
+
+def render_figure_cache_stats(state):
+    """Render hit rate and build time saved by the shared chart cache."""
+    st.subheader("Chart Cache")
+
+    stats = figure_cache.stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Cached Charts", f"{stats['entries']} / {stats['max_entries']}")
+    with col2:
+        st.metric("Hit Rate", f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else "n/a")
+    with col3:
+        st.metric("Build Time Saved", f"{stats['saved_ms']:.0f} ms", delta=f"{stats['build_ms']:.0f} ms spent building", delta_color="off")
+
+    if st.button("Clear Chart Cache"):
+        figure_cache.clear()
+        st.rerun()
+
+def render_record_cache_stats(state):
+    """Render how often stored records were served from the copy shared by all sessions."""
+    st.subheader("Record Cache")
+
+    stats = record_cache.stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Cached Records", f"{stats['entries']} / {stats['max_entries']}")
+    with col2:
+        st.metric("Hit Rate", f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else "n/a")
+    with col3:
+        st.metric("Loads From Storage", stats['misses'])
+
+    if st.button("Clear Record Cache"):
+        record_cache.clear()
+        st.rerun()
+
+def render_session_memory(state):
+    """Render session state sizes across sessions, largest first, and what was spilled."""
+    st.subheader("Session Memory")
+
+    # Measure this session now rather than at the end of the last run
+    session_memory.measure_current()
+
+    stats = session_memory.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Sessions", stats['sessions'])
+    with col2:
+        st.metric("Resident State", f"{stats['resident_bytes'] / 2**20:.1f} MiB", delta=f"of {stats['budget_bytes'] / 2**20:.0f} MiB budget", delta_color="off")
+    with col3:
+        st.metric("Spilled to Storage", f"{stats['spilled_bytes'] / 2**20:.1f} MiB")
+    with col4:
+        st.metric("Spills / Restores", f"{stats['spills']} / {stats['restores']}")
+
+    sessions = session_memory.sessions()
+    if not sessions:
+        st.info("No sessions measured yet.")
+        return
+
+    sessions_df = pd.DataFrame([{
+        'Session': s['session_id'][:8],
+        'State (KiB)': round(s['total_bytes'] / 1024, 1),
+        'Largest Key': s['largest_key'],
+        'Largest (KiB)': round(s['largest_bytes'] / 1024, 1),
+        'Idle (s)': s['idle_s'],
+        'Spilled (KiB)': round(s['spilled_bytes'] / 1024, 1),
+        'Spilled Keys': ", ".join(s['spilled_keys'] + s['evicted_keys'])
+    } for s in sessions[:50]])
+    st.dataframe(sessions_df, use_container_width=True, hide_index=True)
+
+    # Per-key breakdown for one session
+    labels = {s['session_id'][:8]: s['session_id'] for s in sessions[:50]}
+    selected = st.selectbox("Session keys", list(labels))
+    keys_df = pd.DataFrame(session_memory.key_sizes(labels[selected]), columns=['Key', 'Bytes'])
+    st.dataframe(keys_df, use_container_width=True, hide_index=True)
+
+    if st.button("Spill Idle Sessions Now"):
+        marked = session_memory.sweep()
+        st.success(f"Asked {marked} session(s) to spill at the end of their next run")
+
+def render_agent_telemetry(state):
+    """Render latency, token and cache statistics for every agent method."""
+    st.subheader("Agent Call Telemetry")
+
+    records = telemetry.records()
+
+    if not records:
+        st.info("No agent calls recorded yet. Generate a roadmap or submit feedback to collect telemetry.")
+        return
+
+    # Headline metrics across all calls
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("LLM Calls", len(records))
+    with col2:
+        st.metric("Total Tokens", sum(r.tokens_in + r.tokens_out for r in records))
+    with col3:
+        st.metric("Errors", sum(1 for r in records if r.error))
+    with col4:
+        hits = sum(1 for r in records if r.cache_hit)
+        st.metric("Cache Hit Rate", f"{hits / len(records):.0%}")
+
+    # Per-method percentiles, slowest first
+    st.write("### Latency and Tokens by Method")
+    summary_df = pd.DataFrame(telemetry.summary()).sort_values("p95_ms", ascending=False)
+    st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+    render_routing_savings(records)
+
+    # Raw call log
+    st.write("### Recent Calls")
+    recent = [r.to_dict() for r in reversed(records[-200:])]
+    st.dataframe(pd.DataFrame(recent), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Download Call Log (JSONL)",
+            "\n".join(json.dumps(r.to_dict()) for r in records),
+            file_name="agent_telemetry.jsonl",
+            mime="application/json"
+        )
+    with col2:
+        if st.button("Clear Telemetry", key="clear_telemetry"):
+            telemetry.clear()
+            st.rerun()
+
+def render_routing_savings(records):
+    """Render which models the router picked and the estimated savings."""
+    routed = [r for r in records if r.baseline_model and not r.error]
+    if not routed:
+        return
+
+    st.write("### Model Routing")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        saved = sum(r.cost_saved_usd or 0 for r in routed)
+        spent = sum(r.cost_usd or 0 for r in routed)
+        st.metric("Est. Cost Saved", f"${saved:.4f}", delta=f"{saved / (saved + spent):.0%}" if saved + spent else None)
+    with col2:
+        latency_saved = sum(r.latency_saved_ms or 0 for r in routed) / len(routed)
+        st.metric("Est. Latency Saved / Call", f"{latency_saved:.0f} ms")
+    with col3:
+        st.metric("Timeout Fallbacks", sum(1 for r in routed if r.fallback_from))
+
+    # Calls per model
+    model_df = pd.DataFrame({
+        'Model': [r.model for r in routed],
+        'Wall (ms)': [r.wall_ms for r in routed]
+    }).groupby('Model').agg(calls=('Wall (ms)', 'size'), median_ms=('Wall (ms)', 'median')).reset_index()
+    st.dataframe(model_df, use_container_width=True, hide_index=True)
@@ -3,6 +3,12 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 import altair as alt
+from utils.figure_cache import plotly_chart, altair_chart
+from utils.lazy_tabs import lazy_tabs, is_open
+from utils.progress_analytics import weekly_progress
+from utils.progress_snapshot import open_progress_snapshot
+from utils.session_memory import session_fragment
+from utils.state import DataStore
 
 def render_parent_view(state):
     """Render the parent dashboard view with insights and feedback options."""
@@ -36,25 +42,29 @@ def render_parent_view(state):
         st.progress(progress/100)
         st.write(f"**Overall Progress: {progress}%**")
     
-    # Main Dashboard Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    # Main Dashboard Tabs; only the selected one runs, and each reruns on its own when used
+    tab1, tab2, tab3, tab4 = lazy_tabs([
         "Progress Overview", 
         "Weekly Insights", 
         "Provide Feedback", 
         "Communication"
-    ])
+    ], key="parent_tab")
     
-    with tab1:
-        render_progress_overview(state, child_data)
+    if is_open(tab1):
+        with tab1:
+            render_progress_overview(state, child_data)
         
-    with tab2:
-        render_weekly_insights(state, child_data)
+    if is_open(tab2):
+        with tab2:
+            render_weekly_insights(state, child_data)
         
-    with tab3:
-        render_feedback_form(state, child_data)
+    if is_open(tab3):
+        with tab3:
+            render_feedback_form(state, child_data)
         
-    with tab4:
-        render_communication_hub(state, child_data)
+    if is_open(tab4):
+        with tab4:
+            render_communication_hub(state, child_data)
     
     # Notifications and Upcoming Events
     with st.sidebar:
@@ -74,10 +84,25 @@ def render_parent_view(state):
                 st.write(f"Date: {event.get('date', '')}")
                 st.write(event.get('description', ''))
 
+@session_fragment
 def render_progress_overview(state, child_data):
     """Render the progress overview section for parents."""
     st.subheader("Progress Overview")
     
+    # Prefer the running aggregates from saved progress updates over static profile values
+    student_id = child_data.get('id') or state.get('student_id')
+    summary = DataStore.get_progress_summary(student_id) if student_id else None
+    if summary is not None and summary.entries:
+        change = summary.week_over_week()
+        child_data = {
+            **child_data,
+            'plan_adherence': round(summary.completion_rate * 100) if summary.completion_rate is not None else child_data.get('plan_adherence', 0),
+            'avg_score': summary.average_score if summary.average_score is not None else child_data.get('avg_score', 0),
+            'avg_score_change': change['average_score'] or 0,
+            'weekly_hours': round(sum(summary.weekly_hours().values()), 1),
+            'weekly_hours_change': change['hours'] or 0
+        }
+    
     # Overall progress metrics
     col1, col2, col3 = st.columns(3)
     
@@ -216,17 +241,71 @@ def render_progress_overview(state, child_data):
                         icon = "✅" if completed else "⏳"
                         st.write(f"{icon} {milestone.get('description', '')}")
 
+def build_study_time_pie(subject_hours):
+    """Pie chart of study hours per subject."""
+    subject_df = pd.DataFrame({
+        'Subject': list(subject_hours.keys()),
+        'Hours': list(subject_hours.values())
+    })
+    
+    return px.pie(
+        subject_df, 
+        values='Hours', 
+        names='Subject',
+        title='Study Time Distribution'
+    )
+
+def build_adherence_chart(schedule_data):
+    """Bar chart of daily schedule adherence, red below 70%."""
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    adherence_df = pd.DataFrame({
+        'Day': days,
+        'Adherence': [schedule_data.get(day, 0) for day in days]
+    })
+    
+    return alt.Chart(adherence_df).mark_bar().encode(
+        x=alt.X('Day', sort=None),
+        y='Adherence',
+        color=alt.condition(
+            alt.datum.Adherence < 70,
+            alt.value('red'),
+            alt.value('green')
+        )
+    ).properties(
+        title='Daily Schedule Adherence (%)'
+    )
+
+@session_fragment
 def render_weekly_insights(state, child_data):
     """Render weekly insights for parents to track their child's progress."""
     st.subheader("Weekly Insights")
     
+    # Prefer weeks computed from the exported progress snapshot over static profile values
+    student_id = child_data.get('id') or state.get('student_id')
+    snapshot = open_progress_snapshot() if student_id else None
+    if snapshot is not None:
+        # Progress saved after the export is read from its files, so new updates show up right away
+        summary = DataStore.get_progress_summary(student_id)
+        if summary is not None and summary.last_at and summary.last_at >= snapshot.created_at:
+            history = weekly_progress(snapshot.current_batch(student_id))
+            source = "Includes progress saved since the export"
+        else:
+            history = weekly_progress(snapshot.batch(student_id))
+            source = f"From progress exported {snapshot.created_at:%b %d, %Y %H:%M}"
+        if history:
+            child_data = {**child_data, 'weekly_data': history, 'current_week': len(history)}
+            st.caption(source)
+    
     # Week selection
-    weeks = [f"Week {i}" for i in range(1, child_data.get('current_week', 1) + 1)]
+    weekly_data = child_data.get('weekly_data', [])
+    weeks = [
+        f"Week {i}" + (f" (from {weekly_data[i - 1]['week_of']})" if i <= len(weekly_data) and 'week_of' in weekly_data[i - 1] else "")
+        for i in range(1, child_data.get('current_week', 1) + 1)
+    ]
     selected_week = st.selectbox("Select Week", weeks, index=len(weeks)-1)
     
     # Get weekly data
     week_index = int(selected_week.split()[1]) - 1
-    weekly_data = child_data.get('weekly_data', [])
     
     if week_index < len(weekly_data):
         week_data = weekly_data[week_index]
@@ -264,18 +343,7 @@ def render_weekly_insights(state, child_data):
         
         if subject_hours:
             # Create a pie chart of time distribution
-            subject_df = pd.DataFrame({
-                'Subject': list(subject_hours.keys()),
-                'Hours': list(subject_hours.values())
-            })
-            
-            fig = px.pie(
-                subject_df, 
-                values='Hours', 
-                names='Subject',
-                title='Study Time Distribution'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(build_study_time_pie, subject_hours)
         
         # Weekly highlights
         st.write("### Weekly Highlights")
@@ -308,32 +376,8 @@ def render_weekly_insights(state, child_data):
         st.write("### Schedule Adherence")
         schedule_data = week_data.get('schedule_adherence', {})
         
-        # Create schedule adherence visualization
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        adherence_data = []
-        
-        for day in days:
-            adherence_data.append({
-                'Day': day,
-                'Adherence': schedule_data.get(day, 0)
-            })
-        
-        adherence_df = pd.DataFrame(adherence_data)
-        
         # Create bar chart for schedule adherence
-        chart = alt.Chart(adherence_df).mark_bar().encode(
-            x=alt.X('Day', sort=None),
-            y='Adherence',
-            color=alt.condition(
-                alt.datum.Adherence < 70,
-                alt.value('red'),
-                alt.value('green')
-            )
-        ).properties(
-            title='Daily Schedule Adherence (%)'
-        )
-        
-        st.altair_chart(chart, use_container_width=True)
+        altair_chart(build_adherence_chart, schedule_data)
         
         # Teacher's weekly notes
         st.write("### Teacher's Notes")
@@ -346,6 +390,7 @@ def render_weekly_insights(state, child_data):
     else:
         st.info("No data available for the selected week")
 
+@session_fragment
 def render_feedback_form(state, child_data):
     """Render feedback form for parents to provide input on their child's progress."""
     st.subheader("Provide Feedback")
@@ -485,6 +530,7 @@ def render_feedback_form(state, child_data):
             if submit_observation:
                 st.success("Your observation has been recorded and will be used to improve your child's learning experience.")
 
+@session_fragment
 def render_communication_hub(state, child_data):
     """Render communication hub for parent-teacher interaction."""
     st.subheader("Communication Hub")
@@ -1,9 +1,39 @@
 import streamlit as st
+import os
+import time
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import altair as alt
+from utils.rollups import get_class_rollups, refresh_class_rollups
+from utils.roster import Roster, subject_names
+from utils.risk import get_risk_scores
+from utils.readiness_model import get_readiness_model
+from utils.figure_cache import plotly_chart
+from utils.lazy_tabs import lazy_tabs, is_open
+from utils.search_index import record_text, search, snippet
+from utils.session_memory import session_fragment
+from utils.state import DataStore
+
+# Student Overview page sizes; the default can be set with TEACHER_PAGE_SIZE
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = int(os.getenv("TEACHER_PAGE_SIZE", "25"))
+
+# Number of at-risk students listed under "Students Requiring Attention"
+AT_RISK_TOP_K = 10
+
+# Results listed for a dashboard search
+SEARCH_RESULTS = 20
+
+# Search scopes offered next to the search box, as filters for search()
+SEARCH_SCOPES = {
+    "Everything": {},
+    "Roadmaps": {"kinds": ["roadmap"]},
+    "Teacher feedback": {"kinds": ["feedback"], "source_type": "teacher"},
+    "Parent feedback": {"kinds": ["feedback"], "source_type": "parent"},
+    "Student feedback": {"kinds": ["feedback"], "source_type": "student"}
+}
 
 def render_teacher_view(state):
     """Render the teacher dashboard view with student monitoring and roadmap review."""
@@ -37,25 +67,32 @@ def render_teacher_view(state):
                 state.teacher_data.get('pending_reviews', 0)
             )
     
-    # Main tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    # Search across stored roadmaps and feedback
+    render_record_search(state)
+    
+    # Main tabs; only the selected one runs, and each reruns on its own when used
+    tab1, tab2, tab3, tab4 = lazy_tabs([
         "Student Overview", 
         "Roadmap Reviews", 
         "Performance Analytics",
         "Communication Hub"
-    ])
+    ], key="teacher_tab")
     
-    with tab1:
-        render_student_overview(state)
+    if is_open(tab1):
+        with tab1:
+            render_student_overview(state)
         
-    with tab2:
-        render_roadmap_reviews(state)
+    if is_open(tab2):
+        with tab2:
+            render_roadmap_reviews(state)
         
-    with tab3:
-        render_performance_analytics(state)
+    if is_open(tab3):
+        with tab3:
+            render_performance_analytics(state)
         
-    with tab4:
-        render_communication_hub(state)
+    if is_open(tab4):
+        with tab4:
+            render_communication_hub(state)
 
     # Notifications and Tasks Sidebar
     with st.sidebar:
@@ -73,6 +110,41 @@ def render_teacher_view(state):
                 st.write(notification.get('message', ''))
                 st.caption(notification.get('time', 'Today'))
 
+@session_fragment
+def render_record_search(state):
+    """Render full-text search over stored roadmaps and feedback."""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input(
+            "Search roadmaps and feedback",
+            key="record_search_query",
+            placeholder="e.g. organic chemistry, sleep, chem*"
+        )
+    with col2:
+        scope = st.selectbox("In", list(SEARCH_SCOPES), key="record_search_scope")
+    
+    if not query.strip():
+        return
+    
+    started = time.perf_counter()
+    hits = search(query, limit=SEARCH_RESULTS, **SEARCH_SCOPES[scope])
+    st.caption(f"{len(hits)} results in {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    for hit in hits:
+        record = DataStore.get_roadmap(hit['id']) if hit['kind'] == 'roadmap' else DataStore.get_feedback(hit['id'])
+        if record is None:
+            continue
+        student = DataStore.get_student(hit['student_id']) if hit['student_id'] else None
+        name = student.name if student else hit['student_id'] or "Unknown student"
+        label = "Roadmap" if hit['kind'] == 'roadmap' else f"{(hit['source_type'] or 'other').title()} feedback"
+        with st.container():
+            st.markdown(f"**{name}** · {label}")
+            st.caption(snippet(record_text(hit['kind'], record.to_dict()), query))
+
+def _go_to_page(state, page):
+    state.student_page = page
+
+@session_fragment
 def render_student_overview(state):
     """Render student overview with filters and sorting options."""
     st.subheader("Student Overview")
@@ -96,85 +168,112 @@ def render_student_overview(state):
             ["Name", "Progress (High to Low)", "Progress (Low to High)", "Last Active"]
         )
     
-    # Get student list with filtering and sorting applied
+    # Get student list with filtering and sorting applied, on the columnar roster
     students = state.teacher_data.get('students', [])
+    roster = state.get('student_roster')
+    if roster is None or not roster.matches(students):
+        roster = Roster(students)
+        state.student_roster = roster
     
-    # Apply filters
-    if subject_filter:
-        students = [s for s in students if any(subj in s.get('subjects', []) for subj in subject_filter)]
-    if progress_filter > 0:
-        students = [s for s in students if s.get('progress', 0) >= progress_filter]
-    
-    # Apply sorting
-    if sort_by == "Name":
-        students = sorted(students, key=lambda s: s.get('name', ''))
-    elif sort_by == "Progress (High to Low)":
-        students = sorted(students, key=lambda s: s.get('progress', 0), reverse=True)
-    elif sort_by == "Progress (Low to High)":
-        students = sorted(students, key=lambda s: s.get('progress', 0))
-    elif sort_by == "Last Active":
-        students = sorted(students, key=lambda s: datetime.strptime(s.get('last_active', '2025-01-01'), '%Y-%m-%d'), reverse=True)
-    
-    # Display student list
-    st.write(f"Showing {len(students)} students")
-    
-    for i, student in enumerate(students):
-        with st.expander(f"{student.get('name', f'Student {i+1}')} - {student.get('progress', 0)}% Complete"):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Target Exam:** {student.get('target_exam', '')}")
-                st.write(f"**Subjects:** {', '.join(student.get('subjects', []))}")
-                st.write(f"**Last Active:** {student.get('last_active', '')}")
-                st.progress(student.get('progress', 0)/100)
-                
-                # Key metrics for this student
-                metrics = student.get('metrics', {})
-                m_col1, m_col2, m_col3 = st.columns(3)
-                with m_col1:
-                    st.metric("Tasks Completed", metrics.get('tasks_completed', 0))
-                with m_col2:
-                    st.metric("Avg. Score", f"{metrics.get('avg_score', 0)}%")
-                with m_col3:
-                    st.metric("Study Hours", metrics.get('study_hours', 0))
-            
-            with col2:
-                # Quick actions for this student
-                st.button("View Roadmap", key=f"view_roadmap_{student.get('id', i)}")
-                st.button("Message", key=f"msg_{student.get('id', i)}")
-                st.button("Review Progress", key=f"review_{student.get('id', i)}")
-            
-            # Alerts for this student
-            alerts = student.get('alerts', [])
-            if alerts:
-                st.write("**Alerts:**")
-                for alert in alerts:
-                    alert_type = alert.get('type', 'info')
-                    if alert_type == 'warning':
-                        st.warning(alert.get('message', ''))
-                    elif alert_type == 'error':
-                        st.error(alert.get('message', ''))
-                    else:
-                        st.info(alert.get('message', ''))
+    # Display one page of the student list; details are only built for rows that are opened
+    positions = roster.query(subject_filter, progress_filter, sort_by)
+    page_size = st.selectbox(
+        "Students per page",
+        PAGE_SIZE_OPTIONS,
+        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE) if DEFAULT_PAGE_SIZE in PAGE_SIZE_OPTIONS else 0,
+        key="student_page_size"
+    )
+    page_count = max(1, -(-len(positions) // page_size))
+    
+    # Go back to the first page whenever the filters or sort change
+    view_key = (tuple(subject_filter), progress_filter, sort_by, page_size, roster.size)
+    if state.get('student_page_view') != view_key:
+        state.student_page_view = view_key
+        state.student_page = 1
+    page = min(state.get('student_page', 1), page_count)
+    
+    start = (page - 1) * page_size
+    page_students = roster.records(positions[start:start + page_size])
+    st.write(f"Showing {start + 1 if page_students else 0}-{start + len(page_students)} of {len(positions)} students")
+    
+    for i, student in enumerate(page_students, start=start):
+        col1, col2, col3, col4 = st.columns([4, 2, 2, 1])
+        col1.write(f"**{student.get('name', f'Student {i+1}')}**")
+        col2.write(f"{student.get('progress', 0)}% Complete")
+        col3.write(f"Last active {student.get('last_active', '-')}")
+        with col4:
+            show_details = st.toggle("Details", key=f"details_{student.get('id', i)}")
+        if show_details:
+            with st.container(border=True):
+                render_student_details(student, i)
+    
+    # Page navigation
+    nav_prev, nav_label, nav_next = st.columns([1, 2, 1])
+    with nav_prev:
+        st.button("← Previous", disabled=page <= 1, key="student_page_prev", on_click=_go_to_page, args=(state, page - 1))
+    with nav_label:
+        st.write(f"Page {page} of {page_count}")
+    with nav_next:
+        st.button("Next →", disabled=page >= page_count, key="student_page_next", on_click=_go_to_page, args=(state, page + 1))
     
     # Students at risk section
     st.subheader("Students Requiring Attention")
     
-    # Get at-risk students
-    at_risk = [s for s in state.teacher_data.get('students', []) if s.get('at_risk', False)]
+    # Highest-risk students from the cached roster-wide risk scores
+    at_risk = get_risk_scores(state, students).top_at_risk(AT_RISK_TOP_K)
     
     if not at_risk:
         st.success("All students are on track!")
     else:
         for student in at_risk:
             with st.container():
-                st.error(f"**{student.get('name', '')}** - {student.get('risk_reason', 'Requires attention')}")
+                st.error(f"**{student.get('name', '')}** ({student['risk_score']:.0f}/100) - {student.get('risk_reason', 'Requires attention')}")
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     st.write(student.get('risk_details', ''))
                 with col2:
                     st.button("Intervene", key=f"intervene_{student.get('id', '')}")
 
+def render_student_details(student, i):
+    """Render the detail panel of one student in the overview."""
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.write(f"**Target Exam:** {student.get('target_exam', '')}")
+        st.write(f"**Subjects:** {', '.join(subject_names(student))}")
+        st.write(f"**Last Active:** {student.get('last_active', '')}")
+        st.progress(student.get('progress', 0)/100)
+        
+        # Key metrics for this student
+        metrics = student.get('metrics', {})
+        m_col1, m_col2, m_col3 = st.columns(3)
+        with m_col1:
+            st.metric("Tasks Completed", metrics.get('tasks_completed', 0))
+        with m_col2:
+            st.metric("Avg. Score", f"{metrics.get('avg_score', 0)}%")
+        with m_col3:
+            st.metric("Study Hours", metrics.get('study_hours', 0))
+    
+    with col2:
+        # Quick actions for this student
+        st.button("View Roadmap", key=f"view_roadmap_{student.get('id', i)}")
+        st.button("Message", key=f"msg_{student.get('id', i)}")
+        st.button("Review Progress", key=f"review_{student.get('id', i)}")
+    
+    # Alerts for this student
+    alerts = student.get('alerts', [])
+    if alerts:
+        st.write("**Alerts:**")
+        for alert in alerts:
+            alert_type = alert.get('type', 'info')
+            if alert_type == 'warning':
+                st.warning(alert.get('message', ''))
+            elif alert_type == 'error':
+                st.error(alert.get('message', ''))
+            else:
+                st.info(alert.get('message', ''))
+
+@session_fragment
 def render_roadmap_reviews(state):
     """Render roadmap review interface for teachers."""
     st.subheader("Roadmap Reviews")
@@ -471,10 +570,88 @@ def render_roadmap_reviews(state):
             for key, value in adjustment_data['details'].items():
                 st.write(f"**{key.replace('_', ' ').title()}:** {value}")
 
+def build_class_average_chart(overall_perf):
+    """Line chart of the class average score per week."""
+    return px.line(
+        pd.DataFrame(overall_perf),
+        x='week',
+        y='avg_score',
+        title="Class Average Score by Week",
+        labels={"week": "Week", "avg_score": "Average Score (%)"}
+    )
+
+def build_subject_performance_chart(subject_df_data):
+    """Line chart of the weekly score of each subject."""
+    return px.line(
+        pd.DataFrame(subject_df_data),
+        x='Week',
+        y='Score',
+        color='Subject',
+        title="Performance by Subject"
+    )
+
+def build_topic_performance_chart(topics_data, topic_subject):
+    """Bar chart of the average score per topic of a subject."""
+    return px.bar(
+        pd.DataFrame(topics_data),
+        x='topic',
+        y='avg_score',
+        title=f"Average Performance by Topic in {topic_subject}",
+        color='avg_score',
+        color_continuous_scale='RdYlGn',
+        labels={"topic": "Topic", "avg_score": "Average Score (%)"}
+    )
+
+def build_readiness_gauge(overall):
+    """Gauge of a student's overall exam readiness."""
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=overall,
+        title={'text': "Overall Exam Readiness"},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 50], 'color': "red"},
+                {'range': [50, 75], 'color': "yellow"},
+                {'range': [75, 100], 'color': "green"}
+            ]
+        }
+    ))
+
+def build_subject_readiness_chart(subjects):
+    """Bar chart of a student's exam readiness per subject."""
+    subject_data = [{'Subject': subject, 'Readiness': score} for subject, score in subjects.items()]
+    return px.bar(
+        pd.DataFrame(subject_data),
+        x='Subject',
+        y='Readiness',
+        title="Exam Readiness by Subject",
+        color='Readiness',
+        color_continuous_scale='RdYlGn'
+    )
+
+@session_fragment
 def render_performance_analytics(state):
     """Render performance analytics for teacher view."""
     st.subheader("Performance Analytics")
     
+    # Fall back to the materialized class rollups when no precomputed data was provided
+    teacher_data = state.teacher_data
+    if not teacher_data.get('performance_data'):
+        rollups = get_class_rollups()
+        teacher_data = {
+            **teacher_data,
+            'performance_data': rollups['performance_data'],
+            'topics_performance': rollups['topics_performance'],
+            'available_subjects': teacher_data.get('available_subjects') or rollups['available_subjects']
+        }
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.caption(f"Class rollups over {len(rollups['students'])} students, refreshed {rollups['refreshed_at'][:16].replace('T', ' ')}")
+        with col2:
+            st.button("Refresh", key="refresh_class_rollups", on_click=refresh_class_rollups)
+    
     # Time period selection
     time_period = st.selectbox(
         "Time Period",
@@ -484,8 +661,8 @@ def render_performance_analytics(state):
     # Subject filter for analytics
     subject_filter = st.multiselect(
         "Filter by Subject",
-        state.teacher_data.get('available_subjects', []),
-        default=state.teacher_data.get('available_subjects', [])[:1],
+        teacher_data.get('available_subjects', []),
+        default=teacher_data.get('available_subjects', [])[:1],
         key="subject_filter_performance_analytics"
     )
     
@@ -493,22 +670,13 @@ def render_performance_analytics(state):
     st.write("### Class Performance Overview")
     
     # Create sample performance data
-    perf_data = state.teacher_data.get('performance_data', {})
+    perf_data = teacher_data.get('performance_data', {})
     
     if perf_data:
         # Overall performance chart
         overall_perf = perf_data.get('overall', [])
         if overall_perf:
-            overall_df = pd.DataFrame(overall_perf)
-            
-            fig = px.line(
-                overall_df, 
-                x='week', 
-                y='avg_score',
-                title="Class Average Score by Week",
-                labels={"week": "Week", "avg_score": "Average Score (%)"}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(build_class_average_chart, overall_perf)
         
         # Subject performance comparison
         subject_perf = perf_data.get('by_subject', {})
@@ -527,16 +695,7 @@ def render_performance_analytics(state):
                     })
             
             if subject_df_data:
-                subject_df = pd.DataFrame(subject_df_data)
-                
-                fig = px.line(
-                    subject_df,
-                    x='Week',
-                    y='Score',
-                    color='Subject',
-                    title="Performance by Subject"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(build_subject_performance_chart, subject_df_data)
     
     # Topic-wise performance analysis
     st.write("### Topic Performance Analysis")
@@ -544,27 +703,18 @@ def render_performance_analytics(state):
     # Select subject for topic analysis
     topic_subject = st.selectbox(
         "Select Subject for Topic Analysis",
-        state.teacher_data.get('available_subjects', [])
+        teacher_data.get('available_subjects', [])
     )
     
     # Get topics for selected subject
-    topics_data = state.teacher_data.get('topics_performance', {}).get(topic_subject, [])
+    topics_data = teacher_data.get('topics_performance', {}).get(topic_subject, [])
     
     if topics_data:
         # Create dataframe for topic performance
         topic_df = pd.DataFrame(topics_data)
         
         # Bar chart for topic performance
-        fig = px.bar(
-            topic_df,
-            x='topic',
-            y='avg_score',
-            title=f"Average Performance by Topic in {topic_subject}",
-            color='avg_score',
-            color_continuous_scale='RdYlGn',
-            labels={"topic": "Topic", "avg_score": "Average Score (%)"}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(build_topic_performance_chart, topics_data, topic_subject)
         
         # Topic strengths and weaknesses
         st.write("### Strengths and Weaknesses")
@@ -592,12 +742,12 @@ def render_performance_analytics(state):
     # Select specific students for comparison
     compare_students = st.multiselect(
         "Select Students to Compare",
-        [s.get('name', '') for s in state.teacher_data.get('students', [])]
+        [s.get('name', '') for s in teacher_data.get('students', [])]
     )
     
     if compare_students:
         # Create sample comparison data
-        students = state.teacher_data.get('students', [])
+        students = teacher_data.get('students', [])
         selected_students = [s for s in students if s.get('name', '') in compare_students]
         
         if selected_students:
@@ -651,66 +801,37 @@ def render_performance_analytics(state):
     # Select student for prediction
     readiness_student = st.selectbox(
         "Select Student",
-        [s.get('name', '') for s in state.teacher_data.get('students', [])],
+        [s.get('name', '') for s in teacher_data.get('students', [])],
         key="readiness_student_selectbox"
     )
     
     # Get student data
-    students = state.teacher_data.get('students', [])
+    students = teacher_data.get('students', [])
     selected_student = next((s for s in students if s.get('name', '') == readiness_student), None)
     
     if selected_student:
-        # Create readiness metrics
+        # Create readiness metrics, predicted locally when not provided
         readiness = selected_student.get('exam_readiness', {})
+        if not readiness:
+            model = get_readiness_model()
+            if model is not None:
+                readiness = model.predict_students([selected_student])[0] or {}
         
-        if readiness:
+        if not readiness:
+            st.info("Not enough subject and topic scores to predict exam readiness for this student.")
+        else:
             col1, col2 = st.columns(2)
             
             with col1:
                 # Overall readiness gauge
-                overall = readiness.get('overall', 0)
-                
-                fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=overall,
-                    title={'text': "Overall Exam Readiness"},
-                    gauge={
-                        'axis': {'range': [0, 100]},
-                        'bar': {'color': "darkblue"},
-                        'steps': [
-                            {'range': [0, 50], 'color': "red"},
-                            {'range': [50, 75], 'color': "yellow"},
-                            {'range': [75, 100], 'color': "green"}
-                        ]
-                    }
-                ))
-                
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(build_readiness_gauge, readiness.get('overall', 0))
             
             with col2:
                 # Readiness by subject
                 subjects = readiness.get('by_subject', {})
                 
                 if subjects:
-                    subject_data = []
-                    for subject, score in subjects.items():
-                        subject_data.append({
-                            'Subject': subject,
-                            'Readiness': score
-                        })
-                    
-                    subject_df = pd.DataFrame(subject_data)
-                    
-                    fig = px.bar(
-                        subject_df,
-                        x='Subject',
-                        y='Readiness',
-                        title="Exam Readiness by Subject",
-                        color='Readiness',
-                        color_continuous_scale='RdYlGn'
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(build_subject_readiness_chart, subjects)
             
             # AI recommendations based on readiness
             recommendations = readiness.get('recommendations', [])
@@ -720,6 +841,7 @@ def render_performance_analytics(state):
                 for i, rec in enumerate(recommendations):
                     st.info(f"**{rec.get('title', f'Recommendation {i+1}')}**: {rec.get('details', '')}")
 
+@session_fragment
 def render_communication_hub(state):
     """Render communication hub for teacher-student interaction."""
     st.subheader("Communication Hub")
@@ -1,11 +1,24 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 import random
+from utils.copy_on_write import CopyOnWriteDict, freeze
 
 def get_sample_student_data():
-    """Generate sample student data for testing the application."""
+    """Get the sample student data for testing the application.
     
-    # Current date
-    current_date = datetime.now()
+    The dataset is built once per process and day and shared by every
+    session; each call returns a copy-on-write view of it, so a session only
+    copies the parts it changes (see CopyOnWriteDict.mutable).
+    """
+    return CopyOnWriteDict(_shared_sample_student_data(datetime.now().date()))
+
+@lru_cache(maxsize=1)
+def _shared_sample_student_data(today):
+    """Frozen sample data, rebuilt only when the date its deadlines are based on changes."""
+    return freeze(_build_sample_student_data(datetime.combine(today, datetime.min.time())))
+
+def _build_sample_student_data(current_date):
+    """Build the sample student data for the given date."""
     
     # Sample student data
     student_data = {
@@ -265,5 +278,176 @@ def get_sample_student_data():
                 ]
 
             },
+            
+            # Week 4
+            {
+                "week": 4,
+                "subject_hours": {
+                    "Physics": 10,
+                    "Chemistry": 10,
+                    "Mathematics": 10
+                },
+                "schedule": {
+                    "Monday": {
+                        "Morning": [{"title": "Physics Lecture", "subject": "Physics"}],
+                        "Afternoon": [{"title": "Chemistry Lab", "subject": "Chemistry"}],
+                        "Evening": [{"title": "Math Problem Solving", "subject": "Mathematics"}]
+                    },
+                    "Tuesday": {
+                        "Morning": [{"title": "Mathematics Revision", "subject": "Mathematics"}],
+                        "Afternoon": [{"title": "Physics Problems", "subject": "Physics"}],
+                        "Evening": [{"title": "Chemistry Notes", "subject": "Chemistry"}]
+                    },
+                    "Wednesday": {
+                        "Morning": [{"title": "Chemistry Lecture", "subject": "Chemistry"}],
+                        "Afternoon": [{"title": "Mathematics Class", "subject": "Mathematics"}],
+                        "Evening": [{"title": "Physics Revision", "subject": "Physics"}]
+                    },
+                    "Thursday": {
+                        "Morning": [{"title": "Physics Lecture", "subject": "Physics"}],
+                        "Afternoon": [{"title": "Mathematics Problems", "subject": "Mathematics"}],
+                        "Evening": [{"title": "Chemistry Practice", "subject": "Chemistry"}]
+                    },
+                    "Friday": {
+                        "Morning": [{"title": "Mathematics Lecture", "subject": "Mathematics"}],
+                        "Afternoon": [{"title": "Physics Lab", "subject": "Physics"}],
+                        "Evening": [{"title": "Chemistry Revision", "subject": "Chemistry"}]
+                    },
+                    "Saturday": {
+                        "Morning": [{"title": "Full Mock Test", "subject": "All Subjects"}],
+                        "Afternoon": [{"title": "Mock Test Review", "subject": "All Subjects"}],
+                        "Evening": [{"title": "Self Study", "subject": "Weak Areas"}]
+                    },
+                    "Sunday": {
+                        "Morning": [{"title": "Revision", "subject": "All Subjects"}],
+                        "Afternoon": [{"title": "Rest", "subject": ""}],
+                        "Evening": [{"title": "Plan Next Week", "subject": ""}]
+                    }
+                },
+                "focus_areas": [
+                    {"subject": "Physics", "topic": "Optics"},
+                    {"subject": "Chemistry", "topic": "Organic Chemistry"},
+                    {"subject": "Mathematics", "topic": "Trigonometry"}
+                ],
+                "assessments": [
+                    {"title": "Physics Test", "day": "Wednesday", "description": "1-hour test on optics"},
+                    {"title": "Full Mock Test", "day": "Saturday", "description": "3-hour JEE pattern mock test"}
+                ]
+            }
+        ],
+        
+        # Weekly average score so far
+        "performance_history": [
+            {"week": 1, "average_score": 72},
+            {"week": 2, "average_score": 75},
+            {"week": 3, "average_score": 77},
+            {"week": 4, "average_score": 82}
+        ],
+        
+        # SWOT analysis
+        "swot": {
+            "strengths": [
+                "Strong foundation in Mathematics, especially Algebra and Calculus",
+                "Consistent study schedule",
+                "Good at Mechanics problems"
+            ],
+            "weaknesses": [
+                "Optics and Organic Chemistry scores are below 70%",
+                "Spends less time on Chemistry than planned"
+            ],
+            "opportunities": [
+                "Weekly mock tests to build exam stamina",
+                "Doubt clearing sessions on Saturdays"
+            ],
+            "threats": [
+                "Limited time left before the exam",
+                "Test anxiety in timed assessments"
+            ],
+            "action_plan": [
+                {"title": "Optics Recovery", "description": "Two extra problem sessions on ray optics each week"},
+                {"title": "Organic Chemistry", "description": "Daily 30-minute revision of named reactions"},
+                {"title": "Timed Practice", "description": "One full-length mock test every Saturday"}
+            ]
+        },
+        
+        # Notifications and deadlines
+        "notifications": [
+            {"message": "New practice test available for Calculus", "time": "2 hours ago"},
+            {"message": "Your teacher commented on your Physics roadmap", "time": "Yesterday"}
+        ],
+        "upcoming_deadlines": [
+            {"title": "Physics Assignment", "date": (current_date + timedelta(days=2)).strftime("%Y-%m-%d")},
+            {"title": "Chemistry Test", "date": (current_date + timedelta(days=5)).strftime("%Y-%m-%d")},
+            {"title": "Full Mock Test", "date": (current_date + timedelta(days=12)).strftime("%Y-%m-%d")}
+        ]
+    }
+    
+    return student_data
 
-            
\ No newline at end of file
+def generate_sample_students(n, weeks=4, seed=0):
+    """Generate n synthetic students shaped like the sample data, each with weeks of data.
+    
+    Students are yielded one at a time for load testing. Scores, hours and
+    history are drawn from a seeded generator, so the same arguments give the
+    same students. Weekly schedules, focus areas and assessments are the
+    shared, read-only ones of the sample data rather than per-student copies.
+    """
+    rng = random.Random(seed)
+    sample = _shared_sample_student_data(datetime.now().date())
+    template_weeks = sample["weeks_data"]
+    today = datetime.now().date()
+    
+    for i in range(n):
+        subjects = []
+        for subject in sample["subjects"]:
+            ability = rng.gauss(72, 11)
+            topics = []
+            for topic in subject["topics"]:
+                score = max(0, min(100, round(ability + rng.gauss(0, 8))))
+                mastery = "High" if score >= 80 else "Medium" if score >= 70 else "Low"
+                topics.append({"name": topic["name"], "score": score, "mastery": mastery})
+            subjects.append({
+                "name": subject["name"],
+                "score": round(sum(t["score"] for t in topics) / len(topics)),
+                "topics": topics
+            })
+        
+        base_hours = rng.uniform(6, 14)
+        weeks_data = []
+        for week in range(weeks):
+            template = template_weeks[week % len(template_weeks)]
+            weeks_data.append({
+                "week": week + 1,
+                "subject_hours": {s["name"]: round(max(0, base_hours + rng.gauss(0, 2)), 1) for s in subjects},
+                "schedule": template["schedule"],
+                "focus_areas": template["focus_areas"],
+                "assessments": template["assessments"]
+            })
+        
+        average = sum(s["score"] for s in subjects) / len(subjects)
+        trend = rng.gauss(0.5, 1.5)
+        history = [
+            {"week": week + 1, "average_score": round(max(0, min(100, average + trend * (week + 1 - weeks) + rng.gauss(0, 2))), 1)}
+            for week in range(weeks)
+        ]
+        
+        yield {
+            "id": f"sample-{seed}-{i}",
+            "name": f"Student {i + 1}",
+            "grade": rng.choice(["Class 11", "Class 12"]),
+            "target_exam": rng.choice(["JEE", "NEET"]),
+            "target_score": f"{rng.choice([85, 90, 95])}%",
+            "current_progress": rng.randint(0, 100),
+            "progress": rng.randint(0, 100),
+            "last_active": (today - timedelta(days=rng.randint(0, 21))).strftime("%Y-%m-%d"),
+            "subjects": subjects,
+            "daily_tasks": sample["daily_tasks"],
+            "current_week": weeks,
+            "weeks_data": weeks_data,
+            "performance_history": history,
+            "metrics": {
+                "avg_score": round(average, 1),
+                "study_hours": round(sum(sum(w["subject_hours"].values()) for w in weeks_data) / max(weeks, 1), 1),
+                "plan_adherence": rng.randint(40, 100)
+            }
+        }
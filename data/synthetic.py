@@ -0,0 +1,337 @@
+import gzip
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from utils.data_models import Student, Roadmap, Progress, Feedback
+from utils.state import DataStore
+
+SUBJECT_TOPICS = {
+    "Physics": ["Mechanics", "Electromagnetism", "Optics", "Modern Physics", "Thermodynamics"],
+    "Chemistry": ["Physical Chemistry", "Organic Chemistry", "Inorganic Chemistry"],
+    "Mathematics": ["Algebra", "Calculus", "Coordinate Geometry", "Trigonometry", "Probability"],
+    "Biology": ["Cell Biology", "Genetics", "Human Physiology", "Ecology"]
+}
+
+# Subjects taken for each target exam
+EXAM_SUBJECTS = {
+    "JEE": ["Physics", "Chemistry", "Mathematics"],
+    "NEET": ["Physics", "Chemistry", "Biology"]
+}
+
+FIRST_NAMES = ["Aditya", "Ananya", "Arjun", "Diya", "Ishaan", "Kavya", "Meera", "Rohan", "Saanvi", "Vihaan", "Zara", "Kabir"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Khan", "Das", "Mehta", "Nair", "Singh"]
+
+TASKS_PER_WEEK = 6
+
+# Chance per student and week of a feedback record, by source
+FEEDBACK_RATES = {"teacher": 0.15, "parent": 0.05, "student": 0.05}
+
+FEEDBACK_TEMPLATES = {
+    "teacher": [
+        "Good progress in {subject}; spend more time on {topic}.",
+        "{topic} scores are slipping, please revise the last two chapters.",
+        "Consistent effort this week. Try timed practice for {subject}."
+    ],
+    "parent": [
+        "Studied late most nights this week, seemed tired.",
+        "Was unwell for two days, please adjust the {subject} plan.",
+        "Enjoying {subject} more since the new schedule."
+    ],
+    "student": [
+        "I find {topic} hard, can we slow down?",
+        "Finished all {subject} tasks early this week.",
+        "I need more practice problems for {topic}."
+    ]
+}
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _mastery(score):
+    return "High" if score >= 80 else "Medium" if score >= 70 else "Low"
+
+
+def _clip(value, low=0, high=100):
+    return max(low, min(high, value))
+
+
+def _simulate_student(rng, index, weeks, start):
+    """Simulate one student's profile, roadmap and weekly history."""
+    exam = rng.choice(list(EXAM_SUBJECTS))
+    subjects = EXAM_SUBJECTS[exam]
+    ability = {subject: rng.gauss(70, 12) for subject in subjects}
+    topic_offset = {
+        (subject, topic): rng.gauss(0, 8)
+        for subject in subjects for topic in SUBJECT_TOPICS[subject]
+    }
+    trend = rng.gauss(0.1, 0.25)
+    base_hours = rng.uniform(4, 14)
+    adherence = rng.betavariate(5, 2)
+
+    student = Student(
+        id=_uuid(rng),
+        name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index + 1}",
+        grade=rng.choice(["Class 11", "Class 12"]),
+        subjects=subjects,
+        strengths=[max(subjects, key=ability.get)],
+        weaknesses=[min(subjects, key=ability.get)],
+        goals={"target_exam": exam, "target_score": rng.choice([85, 90, 95])},
+        performance={subject: round(score) for subject, score in ability.items()}
+    )
+    roadmap = Roadmap(
+        id=_uuid(rng),
+        student_id=student.id,
+        content="\n".join(
+            [f"# {weeks}-Week Roadmap for {student.name}"]
+            + [f"- {subject}: {round(base_hours)} hours/week, focus on {rng.choice(SUBJECT_TOPICS[subject])}" for subject in subjects]
+        ),
+        created_at=start,
+        updated_at=start,
+        version=1 + weeks // 13,
+        approved_by=rng.choice([None, "Teacher"])
+    )
+
+    progress, feedback, weekly = [], [], []
+    for week in range(weeks):
+        at = start + timedelta(weeks=week, days=rng.randint(4, 6), minutes=rng.randint(0, 24 * 60))
+        completed = {f"Week {week + 1} task {k + 1}": rng.random() < adherence for k in range(TASKS_PER_WEEK)}
+        time_spent = {
+            subject: int(round(_clip(base_hours + rng.gauss(0, 2), 0, 40) * 60))
+            for subject in subjects
+        }
+        results = []
+        for _ in range(rng.choice([0, 1, 1, 2])):
+            subject = rng.choice(subjects)
+            topic = rng.choice(SUBJECT_TOPICS[subject])
+            score = round(_clip(ability[subject] + topic_offset[(subject, topic)] + trend * week + rng.gauss(0, 6)), 1)
+            results.append({
+                "title": f"{topic} Quiz",
+                "subject": subject,
+                "topic": topic,
+                "score": score,
+                "raw_score": score / 2,
+                "max_score": 50.0
+            })
+        progress.append(Progress(
+            id=_uuid(rng),
+            student_id=student.id,
+            roadmap_id=roadmap.id,
+            completed_tasks=completed,
+            time_spent=time_spent,
+            assessment_results=results,
+            updated_at=at
+        ))
+
+        for source, rate in FEEDBACK_RATES.items():
+            if rng.random() < rate:
+                subject = rng.choice(subjects)
+                feedback.append(Feedback(
+                    id=_uuid(rng),
+                    student_id=student.id,
+                    roadmap_id=roadmap.id,
+                    source_type=source,
+                    source_id=_uuid(rng),
+                    content=rng.choice(FEEDBACK_TEMPLATES[source]).format(
+                        subject=subject, topic=rng.choice(SUBJECT_TOPICS[subject])
+                    ),
+                    created_at=at + timedelta(hours=rng.randint(1, 48)),
+                    processed=rng.random() < 0.8
+                ))
+
+        scores = [r["score"] for r in results]
+        weekly.append({
+            "week": week + 1,
+            "subject_hours": {subject: round(minutes / 60, 1) for subject, minutes in time_spent.items()},
+            "study_hours": round(sum(time_spent.values()) / 60, 1),
+            "tasks_completed": sum(completed.values()),
+            "total_tasks": TASKS_PER_WEEK,
+            "avg_score": round(sum(scores) / len(scores), 1) if scores else None
+        })
+
+    return {
+        "student": student,
+        "roadmap": roadmap,
+        "progress": progress,
+        "feedback": feedback,
+        "exam": exam,
+        "ability": ability,
+        "topic_offset": topic_offset,
+        "trend": trend,
+        "adherence": adherence,
+        "weekly": weekly,
+        "last_active": progress[-1].updated_at if progress else start
+    }
+
+
+def iter_students(n_students, weeks=52, seed=0, start=None):
+    """Simulate n students one at a time, seeded so the same arguments give the same data.
+
+    Args:
+        n_students: Number of students
+        weeks: Weeks of history per student, one progress update per week
+        seed: Random seed
+        start: First week of the history (default: weeks before today)
+
+    Yields:
+        dict: The student's Student, Roadmap, Progress list and Feedback list,
+        plus the simulated abilities and weekly stats the dashboards are built from
+    """
+    rng = random.Random(seed)
+    start = start or datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(weeks=weeks)
+    for index in range(n_students):
+        yield _simulate_student(rng, index, weeks, start)
+
+
+def iter_records(n_students, weeks=52, seed=0, start=None):
+    """Stream (kind, record) pairs for every simulated Student, Roadmap, Progress and Feedback.
+
+    Only one student's records are held in memory at a time, so 100k
+    students x 52 weeks streams in constant memory.
+    """
+    for simulated in iter_students(n_students, weeks, seed, start):
+        yield "student", simulated["student"]
+        yield "roadmap", simulated["roadmap"]
+        for progress in simulated["progress"]:
+            yield "progress", progress
+        for feedback in simulated["feedback"]:
+            yield "feedback", feedback
+
+
+def write_datastore(records):
+    """Save streamed records through DataStore, returning the count per kind.
+
+    DataStore stamps roadmaps and progress with the save time and keeps each
+    student's progress summary current, exactly as the app does. Use a bulk
+    file to keep the simulated timestamps.
+    """
+    savers = {
+        "student": DataStore.save_student,
+        "roadmap": DataStore.save_roadmap,
+        "progress": DataStore.save_progress,
+        "feedback": DataStore.save_feedback
+    }
+    counts = dict.fromkeys(savers, 0)
+    for kind, record in records:
+        savers[kind](record)
+        counts[kind] += 1
+    return counts
+
+
+def _open(path, mode):
+    return gzip.open(path, mode + "t", compresslevel=1) if path.endswith(".gz") else open(path, mode)
+
+
+def write_bulk(records, path):
+    """Write streamed records as JSON lines ({"type": kind, ...record}), gzipped for a .gz path."""
+    counts = {}
+    with _open(path, "w") as f:
+        for kind, record in records:
+            f.write(json.dumps({"type": kind, **record.to_dict()}))
+            f.write("\n")
+            counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+MODELS = {"student": Student, "roadmap": Roadmap, "progress": Progress, "feedback": Feedback}
+
+
+def read_bulk(path):
+    """Stream (kind, record) pairs back from a bulk file written by write_bulk."""
+    with _open(path, "r") as f:
+        for line in f:
+            data = json.loads(line)
+            kind = data.pop("type")
+            yield kind, MODELS[kind].from_dict(data)
+
+
+def _roster_entry(simulated, today):
+    """A teacher-view student dict for a simulated student."""
+    student = simulated["student"]
+    weekly = simulated["weekly"]
+    recent = weekly[-4:]
+    scores = [w["avg_score"] for w in weekly if w["avg_score"] is not None]
+    last_active = simulated["last_active"]
+    entry = {
+        "id": student.id,
+        "name": student.name,
+        "target_exam": simulated["exam"],
+        "subjects": student.subjects,
+        "progress": round(100 * sum(w["tasks_completed"] for w in weekly) / max(1, sum(w["total_tasks"] for w in weekly))),
+        "last_active": last_active.strftime("%Y-%m-%d"),
+        "metrics": {
+            "avg_score": round(sum(scores) / len(scores), 1) if scores else 0,
+            "tasks_completed": sum(w["tasks_completed"] for w in recent),
+            "study_hours": round(sum(w["study_hours"] for w in recent) / max(1, len(recent)), 1),
+            "plan_adherence": round(100 * simulated["adherence"])
+        },
+        "alerts": []
+    }
+    if (today - last_active).days > 7:
+        entry["alerts"].append({"type": "warning", "message": f"Inactive since {entry['last_active']}"})
+    return entry
+
+
+def teacher_dashboard(n_students, weeks=52, seed=0, start=None):
+    """Teacher view data (state.teacher_data) for a simulated class of n students."""
+    today = datetime.now()
+    students = [_roster_entry(s, today) for s in iter_students(n_students, weeks, seed, start)]
+    subjects = sorted({subject for s in students for subject in s["subjects"]})
+    return {
+        "name": "Synthetic Teacher",
+        "subjects": subjects,
+        "available_subjects": subjects,
+        "student_count": len(students),
+        "avg_progress": round(sum(s["progress"] for s in students) / max(1, len(students))),
+        "pending_reviews": 0,
+        "students": students
+    }
+
+
+def _child_entry(simulated):
+    """A parent-view child dict for a simulated student."""
+    student = simulated["student"]
+    weekly = simulated["weekly"]
+    trend = simulated["trend"] * len(weekly)
+    subjects = [
+        {
+            "name": subject,
+            "score": round(_clip(ability + trend)),
+            "progress": round(100 * simulated["adherence"]),
+            "topics": [
+                {"name": topic, "mastery": _mastery(ability + trend + simulated["topic_offset"][(subject, topic)])}
+                for topic in SUBJECT_TOPICS[subject]
+            ]
+        }
+        for subject, ability in simulated["ability"].items()
+    ]
+    assessments = [r for p in simulated["progress"][-3:] for r in p.assessment_results]
+    scores = [w["avg_score"] for w in weekly if w["avg_score"] is not None]
+    return {
+        "id": student.id,
+        "name": student.name,
+        "target_exam": simulated["exam"],
+        "grade": student.grade,
+        "progress": _roster_entry(simulated, datetime.now())["progress"],
+        "current_week": len(weekly),
+        "plan_adherence": round(100 * simulated["adherence"]),
+        "avg_score": round(sum(scores) / len(scores), 1) if scores else 0,
+        "weekly_hours": weekly[-1]["study_hours"] if weekly else 0,
+        "subjects": subjects,
+        "weekly_data": [{**w, "summary": f"Completed {w['tasks_completed']} of {w['total_tasks']} tasks."} for w in weekly],
+        "recent_assessments": [
+            {"title": a["title"], "subject": a["subject"], "score": a["score"], "topics": [a["topic"]]}
+            for a in assessments
+        ]
+    }
+
+
+def parent_dashboard(n_children=2, weeks=52, seed=0, start=None):
+    """Parent view data (state.parent_data) with n simulated children."""
+    return {
+        "name": "Synthetic Parent",
+        "children": [_child_entry(s) for s in iter_students(n_children, weeks, seed, start)]
+    }
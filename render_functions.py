@@ -3,6 +3,9 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 import altair as alt
+from utils.figure_cache import plotly_chart, altair_chart
+from utils.copy_on_write import CopyOnWriteDict
+from utils.state import DataStore
 
 def render_student_view(state):
     """Render the student dashboard view with personalized roadmap and progress tracking."""
@@ -52,6 +55,26 @@ def render_student_view(state):
             with st.container():
                 st.warning(f"{deadline.get('title', '')}: {days_left} days left")
 
+def _task_key(task, i):
+    """Widget key of a daily task's checkbox"""
+    return f"task_{task.get('id', i)}"
+
+def _session_tasks(state):
+    """Today's tasks as the session's own list, copied from the shared sample data on first change"""
+    if isinstance(state.student_data, CopyOnWriteDict):
+        return state.student_data.mutable('daily_tasks')
+    return state.student_data.setdefault('daily_tasks', [])
+
+def _set_task_completed(state, i, key):
+    """Store a ticked or unticked task in the session's student data"""
+    _session_tasks(state)[i]['completed'] = state[key]
+
+def _mark_all_complete(state):
+    """Complete every task; the checkboxes are reset so they pick up the new values"""
+    for i, task in enumerate(_session_tasks(state)):
+        task['completed'] = True
+        state.pop(_task_key(task, i), None)
+
 def render_daily_plan(state):
     """Render today's study plan."""
     st.subheader("Today's Study Plan")
@@ -67,11 +90,11 @@ def render_daily_plan(state):
         st.info("No tasks scheduled for today. Take some time to review your past materials.")
         return
     
-    # Morning, Afternoon, Evening sections
+    # Morning, Afternoon, Evening sections, keeping each task's position in today's list
     time_sections = {
-        "Morning": [task for task in today_tasks if task.get('time_slot') == 'morning'],
-        "Afternoon": [task for task in today_tasks if task.get('time_slot') == 'afternoon'],
-        "Evening": [task for task in today_tasks if task.get('time_slot') == 'evening']
+        "Morning": [(i, task) for i, task in enumerate(today_tasks) if task.get('time_slot') == 'morning'],
+        "Afternoon": [(i, task) for i, task in enumerate(today_tasks) if task.get('time_slot') == 'afternoon'],
+        "Evening": [(i, task) for i, task in enumerate(today_tasks) if task.get('time_slot') == 'evening']
     }
     
     for section, tasks in time_sections.items():
@@ -80,13 +103,16 @@ def render_daily_plan(state):
             st.write("No tasks scheduled")
             continue
             
-        for i, task in enumerate(tasks):
+        for i, task in tasks:
             col1, col2, col3 = st.columns([5, 3, 2])
             with col1:
+                key = _task_key(task, i)
                 st.checkbox(
                     task.get('title', f'Task {i+1}'),
                     value=task.get('completed', False),
-                    key=f"task_{task.get('id', i)}"
+                    key=key,
+                    on_change=_set_task_completed,
+                    args=(state, i, key)
                 )
             with col2:
                 st.write(f"{task.get('start_time', '')} - {task.get('end_time', '')}")
@@ -116,7 +142,7 @@ def render_daily_plan(state):
             st.session_state.show_reschedule_form = True
             
     with col2:
-        if st.button("Mark All Complete", key="mark_all_complete"):
+        if st.button("Mark All Complete", key="mark_all_complete", on_click=_mark_all_complete, args=(state,)):
             st.success("All tasks marked as complete!")
     
     # Show reschedule form if requested
@@ -138,6 +164,15 @@ def render_daily_plan(state):
                 st.success("Your request has been submitted and will be reviewed!")
                 st.session_state.show_reschedule_form = False
 
+def build_subject_hours_pie(subject_hours):
+    """Pie chart of the week's study hours per subject."""
+    return px.pie(
+        names=list(subject_hours.keys()),
+        values=list(subject_hours.values()),
+        title="Study Hours Distribution",
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+
 def render_weekly_roadmap(state):
     """Render weekly roadmap with subject distribution."""
     st.subheader("Weekly Study Roadmap")
@@ -164,13 +199,7 @@ def render_weekly_roadmap(state):
     # Weekly subject distribution pie chart
     subject_hours = week_data.get('subject_hours', {})
     if subject_hours:
-        fig = px.pie(
-            names=list(subject_hours.keys()),
-            values=list(subject_hours.values()),
-            title="Study Hours Distribution",
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(build_subject_hours_pie, subject_hours)
     
     # Weekly calendar view
     st.write("### Weekly Calendar")
@@ -212,14 +241,48 @@ def render_weekly_roadmap(state):
     for assessment in assessments:
         st.write(f"- **{assessment.get('title', '')}** ({assessment.get('day', '')}): {assessment.get('description', '')}")
 
+def build_subject_scores_chart(subject_scores):
+    """Bar chart of the score per subject."""
+    subject_df = pd.DataFrame({
+        'Subject': list(subject_scores.keys()),
+        'Score': list(subject_scores.values())
+    })
+    
+    return alt.Chart(subject_df).mark_bar().encode(
+        x=alt.X('Subject', sort=None),
+        y='Score',
+        color=alt.Color('Subject', legend=None)
+    ).properties(
+        title='Subject Performance'
+    )
+
+def build_progress_chart(history):
+    """Line chart of the weekly average score."""
+    return alt.Chart(pd.DataFrame(history)).mark_line(point=True).encode(
+        x='week:O',
+        y='average_score',
+        tooltip=['week', 'average_score']
+    ).properties(
+        title='Weekly Average Score'
+    )
+
 def render_performance_metrics(state):
     """Render performance metrics and analytics."""
     st.subheader("My Performance Analytics")
     
-    if not state.student_data.get('subjects', []):
+    # Running aggregates kept by DataStore.save_progress, read without scanning history
+    summary = DataStore.get_progress_summary(state.student_id) if state.get('student_id') else None
+    
+    if not state.student_data.get('subjects', []) and summary is None:
         st.info("No performance data available. Please complete assessments to view your performance metrics.")
         return
     
+    if summary is not None:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Average Score", f"{summary.average_score:.1f}%" if summary.average_score is not None else "-")
+        col2.metric("Tasks Completed", f"{summary.completion_rate:.0%}" if summary.completion_rate is not None else "-")
+        col3.metric("Progress Updates", summary.entries)
+    
     # Overall subject performance
     subjects = state.student_data.get('subjects', [])
     subject_scores = {}
@@ -228,42 +291,25 @@ def render_performance_metrics(state):
             subject_scores[subject.get('name', f'Subject {i}')] = subject.get('score', 0)
         elif isinstance(subject, str):
             subject_scores[subject] = 0
+    if summary is not None:
+        for subject, score in summary.subject_scores().items():
+            if not subject_scores.get(subject):
+                subject_scores[subject] = score
     
     # Create bar chart for subject performance
     if subject_scores:
-        subject_df = pd.DataFrame({
-            'Subject': list(subject_scores.keys()),
-            'Score': list(subject_scores.values())
-        })
-        
-        chart = alt.Chart(subject_df).mark_bar().encode(
-            x=alt.X('Subject', sort=None),
-            y='Score',
-            color=alt.Color('Subject', legend=None)
-        ).properties(
-            title='Subject Performance'
-        )
-        
-        st.altair_chart(chart, use_container_width=True)
+        altair_chart(build_subject_scores_chart, subject_scores)
     
     # Progress over time
     st.write("### Progress Over Time")
     
     # Get historical performance data
     history = state.student_data.get('performance_history', [])
+    if not history and summary is not None:
+        history = [week for week in summary.performance_history() if week['average_score'] is not None]
     if history:
-        history_df = pd.DataFrame(history)
-        
         # Line chart for progress over time
-        progress_chart = alt.Chart(history_df).mark_line(point=True).encode(
-            x='week:O',
-            y='average_score',
-            tooltip=['week', 'average_score']
-        ).properties(
-            title='Weekly Average Score'
-        )
-        
-        st.altair_chart(progress_chart, use_container_width=True)
+        altair_chart(build_progress_chart, history)
     else:
         st.info("No historical performance data available yet.")
     
@@ -0,0 +1,48 @@
+"""Export every stored progress update to the memory-mapped Arrow snapshot
+
+Run periodically (e.g. from cron); dashboards reopen the snapshot when the
+file is replaced. Teacher rollup rebuilds and parent weekly insights read
+it instead of the individual progress files.
+
+Usage:
+    python scripts/export_progress_snapshot.py
+    python scripts/export_progress_snapshot.py --out /tmp/progress.arrow --student <id>
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from utils.progress_snapshot import SNAPSHOT_FILE, ProgressSnapshot, write_progress_snapshot  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored progress to the Arrow snapshot")
+    parser.add_argument("--out", default=SNAPSHOT_FILE, help="Snapshot file to write")
+    parser.add_argument("--student", help="After writing, time reading this student's updates from the snapshot")
+    args = parser.parse_args()
+
+    # DataStore uses paths relative to the repository root
+    os.chdir(ROOT_DIR)
+
+    start = time.perf_counter()
+    path = write_progress_snapshot(args.out)
+    elapsed = time.perf_counter() - start
+    snapshot = ProgressSnapshot(path)
+    print(
+        f"Wrote {len(snapshot)} progress updates for {len(snapshot.student_ids)} students to {path} "
+        f"in {elapsed:.1f} s ({os.path.getsize(path) / 2**20:.1f} MiB)"
+    )
+
+    if args.student:
+        start = time.perf_counter()
+        batch = snapshot.batch(args.student)
+        print(f"Read {len(batch)} updates for {args.student} in {(time.perf_counter() - start) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Generate synthetic students, roadmaps, progress and feedback for benchmarks
+
+Records are streamed, so memory stays flat however many students are asked
+for. They are written as JSON lines to a bulk file (gzipped for .gz), or
+saved one by one through DataStore into data/storage like the app does.
+Teacher and parent dashboard dicts can be written as JSON for loading into
+session state.
+
+Usage:
+    python scripts/generate_synthetic_data.py --students 100000 --weeks 52 --out data/synthetic.jsonl.gz
+    python scripts/generate_synthetic_data.py --students 1000 --weeks 12 --datastore
+    python scripts/generate_synthetic_data.py --students 500 --teacher-json teacher.json --parent-json parent.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from data.synthetic import iter_records, parent_dashboard, teacher_dashboard, write_bulk, write_datastore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic data for benchmarks")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Bulk JSON lines file to write (.gz to compress)")
+    parser.add_argument("--datastore", action="store_true", help="Save through DataStore into data/storage")
+    parser.add_argument("--teacher-json", help="Write teacher dashboard data for the same students here")
+    parser.add_argument("--parent-json", help="Write parent dashboard data (two children) here")
+    args = parser.parse_args()
+
+    if not (args.out or args.datastore or args.teacher_json or args.parent_json):
+        parser.error("nothing to write; pass --out, --datastore, --teacher-json or --parent-json")
+
+    # DataStore uses paths relative to the repository root
+    os.chdir(ROOT_DIR)
+
+    for enabled, label, write in (
+        (args.out, f"bulk file {args.out}", lambda records: write_bulk(records, args.out)),
+        (args.datastore, "DataStore", write_datastore)
+    ):
+        if not enabled:
+            continue
+        start = time.perf_counter()
+        counts = write(iter_records(args.students, args.weeks, args.seed))
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        print(
+            f"Wrote {total} records to {label} in {elapsed:.1f} s ({total / elapsed:,.0f}/s): "
+            + ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        )
+
+    for path, build in (
+        (args.teacher_json, lambda: teacher_dashboard(args.students, args.weeks, args.seed)),
+        (args.parent_json, lambda: parent_dashboard(2, args.weeks, args.seed))
+    ):
+        if path:
+            with open(path, "w") as f:
+                json.dump(build(), f)
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Train and evaluate the exam readiness model
+
+Generates sample_data-shaped student records, derives each subject's features
+with utils.readiness_model.subject_features, fits the ridge regression on a
+training split and reports MAE / R^2 on the held-out split against a baseline
+that predicts the current subject score. Inference latency is measured for a
+single student (the per-rerun call in the teacher view) and for a batch.
+
+Usage:
+    python scripts/train_readiness_model.py                 # train, evaluate, save
+    python scripts/train_readiness_model.py --students 5000 --alpha 3
+    python scripts/train_readiness_model.py --no-save --json results.json
+
+Exit status is 1 when single-student inference exceeds the latency target.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from utils.readiness_model import MODEL_PATH, ReadinessModel, subject_features  # noqa: E402
+
+SUBJECT_TOPICS = {
+    "Physics": ["Mechanics", "Electromagnetism", "Optics", "Modern Physics"],
+    "Chemistry": ["Physical Chemistry", "Organic Chemistry", "Inorganic Chemistry"],
+    "Mathematics": ["Algebra", "Calculus", "Coordinate Geometry", "Trigonometry"]
+}
+
+# p95 latency allowed for predicting one student, in ms
+LATENCY_TARGET_MS = float(os.getenv("READINESS_LATENCY_MS", "5"))
+
+
+def _mastery(score):
+    return "High" if score >= 80 else "Medium" if score >= 70 else "Low"
+
+
+def simulate_students(n, seed=0):
+    """Student records shaped like data.sample_data, with a simulated mock exam score per subject
+
+    Each subject has a latent ability; topic scores scatter around it, and the
+    exam outcome depends on ability, weakest topic, study hours and recent trend.
+    """
+    rng = np.random.default_rng(seed)
+    students, outcomes = [], []
+    for i in range(n):
+        trend = rng.normal(0, 2)
+        weeks = 4
+        history = []
+        subjects, weeks_data, outcome = [], [{"week": w + 1, "subject_hours": {}} for w in range(weeks)], {}
+        for subject, topics in SUBJECT_TOPICS.items():
+            ability = rng.normal(72, 11)
+            hours = max(rng.normal(10 + (ability - 72) / 10, 3), 0)
+            topic_scores = np.clip(ability + rng.normal(0, 8, len(topics)), 0, 100).round()
+            subjects.append({
+                "name": subject,
+                "score": int(np.clip(topic_scores.mean() + rng.normal(0, 3), 0, 100)),
+                "topics": [
+                    {"name": name, "score": int(score), "mastery": _mastery(score)}
+                    for name, score in zip(topics, topic_scores)
+                ]
+            })
+            for week in weeks_data:
+                week["subject_hours"][subject] = round(max(hours + rng.normal(0, 1.5), 0), 1)
+            outcome[subject] = float(np.clip(
+                0.75 * ability + 0.25 * topic_scores.min() + 0.8 * (hours - 10) + 1.5 * trend + rng.normal(0, 4),
+                0, 100
+            ))
+        base = np.mean([s["score"] for s in subjects])
+        history = [{"week": w + 1, "average_score": round(base + trend * (w - weeks + 1) + rng.normal(0, 1), 1)} for w in range(weeks)]
+        students.append({
+            "name": f"Student {i + 1}",
+            "subjects": subjects,
+            "weeks_data": weeks_data,
+            "performance_history": history
+        })
+        outcomes.append(outcome)
+    return students, outcomes
+
+
+def build_dataset(students, outcomes):
+    rows, targets, baseline = [], [], []
+    for student, outcome in zip(students, outcomes):
+        names, matrix = subject_features(student)
+        rows.append(matrix)
+        targets.extend(outcome[name] for name in names)
+        baseline.extend(matrix[:, 0])
+    return np.vstack(rows), np.array(targets), np.array(baseline)
+
+
+def evaluate(y_true, y_pred):
+    residual = y_true - y_pred
+    return {
+        "mae": round(float(np.abs(residual).mean()), 2),
+        "rmse": round(float(np.sqrt((residual ** 2).mean())), 2),
+        "r2": round(float(1 - (residual ** 2).sum() / ((y_true - y_true.mean()) ** 2).sum()), 3)
+    }
+
+
+def measure_latency(model, students, runs=200):
+    """Median / p95 ms for predict_students on one student and on the whole batch"""
+    single = []
+    for i in range(runs):
+        start = time.perf_counter()
+        model.predict_students([students[i % len(students)]])
+        single.append((time.perf_counter() - start) * 1000)
+    batch = []
+    for _ in range(5):
+        start = time.perf_counter()
+        model.predict_students(students)
+        batch.append((time.perf_counter() - start) * 1000)
+    single.sort()
+    return {
+        "single_p50_ms": round(statistics.median(single), 3),
+        "single_p95_ms": round(single[int(0.95 * (len(single) - 1))], 3),
+        "batch_students": len(students),
+        "batch_ms": round(statistics.median(batch), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and evaluate the exam readiness model")
+    parser.add_argument("--students", type=int, default=2000, help="Simulated students to train and test on")
+    parser.add_argument("--test-share", type=float, default=0.25, help="Share of students held out for evaluation")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Ridge regularization strength")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(ROOT_DIR, MODEL_PATH), help="Where to write the model")
+    parser.add_argument("--no-save", action="store_true", help="Evaluate only")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    students, outcomes = simulate_students(args.students, args.seed)
+    split = int(len(students) * (1 - args.test_share))
+    X_train, y_train, _ = build_dataset(students[:split], outcomes[:split])
+    X_test, y_test, baseline = build_dataset(students[split:], outcomes[split:])
+
+    model = ReadinessModel.fit(X_train, y_train, alpha=args.alpha)
+    results = {
+        "train_rows": len(y_train),
+        "test_rows": len(y_test),
+        "model": evaluate(y_test, model.predict(X_test)),
+        "baseline_subject_score": evaluate(y_test, baseline),
+        "latency": measure_latency(model, students[split:]),
+        "latency_target_ms": LATENCY_TARGET_MS
+    }
+    model.metrics = results["model"]
+
+    print(f"Trained on {results['train_rows']} subject rows, evaluated on {results['test_rows']}")
+    for name in ("model", "baseline_subject_score"):
+        m = results[name]
+        print(f"  {name:<24} MAE {m['mae']:>6.2f}  RMSE {m['rmse']:>6.2f}  R^2 {m['r2']:>6.3f}")
+    latency = results["latency"]
+    print(
+        f"Inference: one student p50 {latency['single_p50_ms']:.3f} ms, p95 {latency['single_p95_ms']:.3f} ms; "
+        f"{latency['batch_students']} students {latency['batch_ms']:.1f} ms"
+    )
+
+    if not args.no_save:
+        model.save(args.output)
+        print(f"Saved model to {os.path.relpath(args.output, ROOT_DIR)}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if latency["single_p95_ms"] > LATENCY_TARGET_MS:
+        print(f"\nFAIL: single-student p95 exceeds the {LATENCY_TARGET_MS:.0f} ms target")
+        return 1
+    print(f"\nOK: within the {LATENCY_TARGET_MS:.0f} ms per-call target")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import pytest
+
+from utils.state import record_cache, summary_cache
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """An empty data/storage, with DataStore working in a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    record_cache.clear()
+    summary_cache.clear()
+    yield tmp_path / "data" / "storage"
+    record_cache.clear()
+    summary_cache.clear()
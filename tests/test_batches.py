@@ -0,0 +1,140 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from utils.batches import FeedbackBatch, ProgressBatch
+from utils.data_models import Feedback, Progress
+
+
+def row(pid, student_id="s1", at="2025-03-03T10:00:00", done=(True, False), minutes=None, scores=()):
+    return {
+        "id": pid,
+        "student_id": student_id,
+        "roadmap_id": "r1",
+        "completed_tasks": {f"task {i}": value for i, value in enumerate(done)},
+        "time_spent": minutes or {},
+        "assessment_results": [{"title": title, "subject": subject, "topic": topic, "score": score}
+                               for title, subject, topic, score in scores],
+        "updated_at": at
+    }
+
+
+def scores(batch):
+    """(update id, title, score) for every score in the batch"""
+    codes, titles = batch.score_fields["title"]
+    return [(batch.ids[entry], titles[code], score) for entry, code, score in zip(batch.score_entry, codes, batch.score)]
+
+
+ROWS = [
+    row("p1", minutes={"Physics": 30}, scores=[("Quiz 1", "Physics", "Optics", 60.0)]),
+    row("p2", student_id="s2", done=(), minutes={"Chemistry": 45, "Physics": 15}),
+    row("p3", at=None, done=(True, True), scores=[("Quiz 2", "Physics", None, "85"), ("Lab", None, None, "n/a")]),
+]
+
+
+def test_from_rows_builds_columns():
+    batch = ProgressBatch.from_rows(ROWS)
+
+    assert len(batch) == 3
+    assert batch.student_ids == ["s1", "s2"] and batch.student_codes.tolist() == [0, 1, 0]
+    assert batch.tasks_done.tolist() == [1, 0, 2] and batch.tasks_total.tolist() == [2, 0, 2]
+    assert batch.updated_at[0] == np.datetime64("2025-03-03T10:00:00") and np.isnat(batch.updated_at[2])
+    assert batch.subjects == ["Physics", "Chemistry"]
+    assert batch.minutes_by_subject().tolist() == [45.0, 45.0]
+    assert np.isnan(batch.minutes[2]).all()
+    assert scores(batch)[:2] == [("p1", "Quiz 1", 60.0), ("p3", "Quiz 2", 85.0)]
+    assert np.isnan(batch.score[2])
+    assert batch.updates_per_student() == {"s1": 2, "s2": 1}
+
+
+def test_from_rows_grows_score_columns():
+    rows = [row("p1", scores=[(f"Quiz {i}", "Physics", "Optics", float(i)) for i in range(7)]), row("p2")]
+
+    batch = ProgressBatch.from_rows(rows)
+
+    assert batch.score.tolist() == [float(i) for i in range(7)]
+    assert batch.score_entry.tolist() == [0] * 7
+
+
+def test_from_rows_takes_model_objects():
+    progress = Progress.from_dict(ROWS[0])
+
+    assert scores(ProgressBatch.from_rows([progress])) == scores(ProgressBatch.from_rows(ROWS[:1]))
+
+
+def test_empty_batch():
+    batch = ProgressBatch.from_rows([])
+
+    assert len(batch) == 0 and batch.minutes.shape == (0, 0)
+    assert batch.updates_per_student() == {}
+    assert len(batch.for_student("s1")) == 0
+
+
+def test_score_labels_take_the_first_field_set():
+    batch = ProgressBatch.from_rows(ROWS)
+
+    codes, labels = batch.score_labels(("topic", "subject"))
+
+    assert [labels[code] for code in codes] == ["Optics", "Physics", "General"]
+
+
+def test_take_keeps_scores_with_their_rows():
+    batch = ProgressBatch.from_rows(ROWS)
+
+    taken = batch.take([2, 0])
+
+    assert taken.ids == ["p3", "p1"]
+    assert [entry[:2] for entry in scores(taken)] == [("p3", "Quiz 2"), ("p3", "Lab"), ("p1", "Quiz 1")]
+    assert taken.subjects == ["Physics"]
+    assert batch.select([False, True, False]).ids == ["p2"]
+    assert batch.for_student("s1").ids == ["p1", "p3"]
+    assert len(batch.for_student("nobody")) == 0
+
+
+def test_concat_merges_labels():
+    first = ProgressBatch.from_rows(ROWS[:1])
+    second = ProgressBatch.from_rows([row("p4", student_id="s3", minutes={"Biology": 20},
+                                          scores=[("Quiz 1", "Biology", "Cells", 70.0)])] + ROWS[1:2])
+
+    batch = ProgressBatch.concat([first, second])
+
+    assert batch.ids == ["p1", "p4", "p2"]
+    assert [batch.student_ids[code] for code in batch.student_codes] == ["s1", "s3", "s2"]
+    assert batch.subjects == ["Physics", "Biology", "Chemistry"]
+    assert batch.minutes_by_subject().tolist() == [45.0, 20.0, 45.0]
+    assert scores(batch) == [("p1", "Quiz 1", 60.0), ("p4", "Quiz 1", 70.0)]
+
+
+FEEDBACK = [
+    {"id": "f1", "student_id": "s1", "roadmap_id": "r1", "source_type": "teacher", "source_id": "t1",
+     "content": "Good work", "created_at": "2025-03-03T09:00:00", "processed": True, "response": "Thanks"},
+    {"id": "f2", "student_id": "s1", "roadmap_id": "r1", "source_type": "parent", "source_id": "p1",
+     "content": "More practice", "created_at": "2025-03-05T09:00:00", "processed": False, "response": None},
+    {"id": "f3", "student_id": "s2", "roadmap_id": "r2", "source_type": "teacher", "source_id": "t1",
+     "content": "Missed class", "created_at": "2025-03-04T09:00:00", "processed": False, "response": None},
+]
+
+
+def test_feedback_counts_per_source():
+    batch = FeedbackBatch.from_rows(FEEDBACK)
+
+    assert batch.counts() == {
+        "teacher": {"total": 2, "unprocessed": 1},
+        "parent": {"total": 1, "unprocessed": 1}
+    }
+    assert batch.source_mask("student").tolist() == [False, False, False]
+
+
+@pytest.mark.parametrize("source_type, expected", [(None, 1), ("teacher", 2), ("parent", 1), ("student", None)])
+def test_feedback_latest(source_type, expected):
+    assert FeedbackBatch.from_rows(FEEDBACK).latest(source_type) == expected
+
+
+def test_feedback_record_round_trip():
+    feedback = Feedback.from_dict(FEEDBACK[0])
+
+    record = FeedbackBatch.from_rows([feedback]).record(0)
+
+    assert record.to_dict() == feedback.to_dict()
+    assert record.created_at == datetime(2025, 3, 3, 9)
@@ -0,0 +1,59 @@
+import pytest
+
+from data.sample_data import get_sample_student_data
+from render_functions import _mark_all_complete
+from utils.copy_on_write import FrozenDict, FrozenList
+
+
+class SessionState(dict):
+    """Attribute access over a dict, as st.session_state offers"""
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_write_to_mutable_copy_stays_in_its_session():
+    first, second = get_sample_student_data(), get_sample_student_data()
+
+    tasks = first.mutable('daily_tasks')
+    tasks[0]['completed'] = True
+    first['name'] = "Someone Else"
+
+    assert first['daily_tasks'][0]['completed'] is True
+    for other in (second, get_sample_student_data()):
+        assert other['daily_tasks'][0]['completed'] is False
+        assert other['name'] == "Aditya Sharma"
+
+
+def test_shared_values_are_read_only():
+    student_data = get_sample_student_data()
+
+    assert isinstance(student_data['daily_tasks'], FrozenList)
+    assert isinstance(student_data['daily_tasks'][0], FrozenDict)
+    with pytest.raises(TypeError):
+        student_data['daily_tasks'][0]['completed'] = True
+    with pytest.raises(TypeError):
+        student_data['subjects'].append({"name": "Biology"})
+
+
+def test_mutable_copies_only_on_first_use():
+    student_data = get_sample_student_data()
+
+    subjects = student_data.mutable('subjects')
+    assert student_data.mutable('subjects') is subjects
+    assert type(subjects) is list and type(subjects[0]) is dict
+    # Other keys stay shared
+    assert student_data['daily_tasks'] is get_sample_student_data()['daily_tasks']
+
+
+def test_mark_all_complete_changes_only_that_session():
+    first = SessionState(student_data=get_sample_student_data(), task_1=False)
+    second = SessionState(student_data=get_sample_student_data())
+    shared = [task['completed'] for task in get_sample_student_data()['daily_tasks']]
+
+    _mark_all_complete(first)
+
+    assert all(task['completed'] for task in first.student_data['daily_tasks'])
+    assert 'task_1' not in first
+    assert [task['completed'] for task in second.student_data['daily_tasks']] == shared
+    assert not all(shared)
@@ -0,0 +1,39 @@
+import pytest
+
+from utils.progress_parser import parse_assessment_results, parse_time_spent
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Math: 4 hours\nScience: 1h 30m", {"Mathematics": 240, "Science": 90}),
+    ("Chapter 5 Physics - 2h", {"Chapter 5 Physics": 120}),
+    ("Week 2 Math: 4 hours", {"Week 2 Math": 240}),
+    ("Math: 4 hours (Algebra: ch 2)", {"Mathematics": 240}),
+    ("English - Essay: 3 hours", {"English": 180}),
+    ("Math: 1h30m", {"Mathematics": 90}),
+    ("Math: 1 hr 30 min", {"Mathematics": 90}),
+    ("Math 45 min", {"Mathematics": 45}),
+    ("Math: 2 hours 15", {"Mathematics": 120}),
+])
+def test_parse_time_spent(text, expected):
+    assert parse_time_spent(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", None, "   \n\n", "???", ":: -- ::", "Math:", "studied a lot"])
+def test_parse_time_spent_ignores_empty_and_garbage(text):
+    assert parse_time_spent(text) == {}
+
+
+@pytest.mark.parametrize("text, title, score", [
+    ("Quiz 1: 85%", "Quiz 1", 85.0),
+    ("Unit 3 test - 18 out of 20", "Unit 3 test", 90.0),
+    ("Quiz 1: 85% - good", "Quiz 1", 85.0),
+    ("Midterm - 7/10 - retake", "Midterm", 70.0),
+])
+def test_parse_assessment_results(text, title, score):
+    [result] = parse_assessment_results(text)
+    assert (result["title"], result["score"]) == (title, score)
+
+
+@pytest.mark.parametrize("text", ["", None, "\n", "garbage", "Test: - ", "Test: 5/0"])
+def test_parse_assessment_results_ignores_empty_and_garbage(text):
+    assert parse_assessment_results(text) == []
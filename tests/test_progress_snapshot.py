@@ -0,0 +1,102 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from utils.batches import ProgressBatch
+from utils.data_models import Progress
+from utils.progress_snapshot import ProgressSnapshot, open_progress_snapshot, write_progress_snapshot
+from utils.state import DataStore
+
+
+def store(storage, pid, student_id, day, minutes=None, score=None):
+    """Write a progress file as DataStore would, with a chosen updated_at"""
+    os.makedirs(storage, exist_ok=True)
+    data = {
+        "id": pid,
+        "student_id": student_id,
+        "roadmap_id": "r1",
+        "completed_tasks": {"task": True},
+        "time_spent": minutes or {},
+        "assessment_results": [] if score is None else [{"title": "Quiz", "subject": "Physics", "score": score}],
+        "updated_at": datetime(2025, 3, day).isoformat()
+    }
+    with open(os.path.join(storage, f"progress_{pid}.json"), "w") as f:
+        json.dump(data, f)
+
+
+def scores(batch):
+    return {batch.ids[entry]: score for entry, score in zip(batch.score_entry, batch.score)}
+
+
+@pytest.fixture
+def snapshot(storage):
+    store(storage, "a2", "s2", 4, minutes={"Physics": 30}, score=70.0)
+    store(storage, "b1", "s1", 9, score=90.0)
+    store(storage, "a1", "s1", 2, minutes={"Chemistry": 20})
+    store(storage, "b2", "s2", 1)
+    store(storage, "c1", "s3", 5, score=50.0)
+    return ProgressSnapshot(write_progress_snapshot())
+
+
+def test_rows_are_sorted_by_student_then_time(snapshot):
+    assert len(snapshot) == 5
+    assert snapshot.ids() == ["a1", "b1", "b2", "a2", "c1"]
+    assert snapshot.rows("s2") == (2, 4)
+    assert snapshot.rows("s2", start=datetime(2025, 3, 2)) == (3, 4)
+    assert snapshot.rows("s1", end=datetime(2025, 3, 9)) == (0, 1)
+    assert snapshot.rows("nobody") == (0, 0)
+    with pytest.raises(ValueError):
+        snapshot.rows(start=datetime(2025, 3, 2))
+
+
+def test_batch_round_trips_the_stored_updates(snapshot):
+    stored = ProgressBatch.from_storage()
+    exported = snapshot.batch()
+
+    order = [stored.ids.index(pid) for pid in exported.ids]
+    assert np.array_equal(exported.updated_at, stored.updated_at[order])
+    assert exported.tasks_done.tolist() == stored.tasks_done[order].tolist()
+    assert exported.minutes_by_subject().tolist() == [stored.minutes_by_subject()[stored.subjects.index(s)]
+                                                      for s in exported.subjects]
+    assert scores(exported) == scores(stored)
+    assert exported.updates_per_student() == stored.updates_per_student()
+
+
+def test_student_batch_drops_subjects_nobody_studied(snapshot):
+    batch = snapshot.batch("s1")
+
+    assert batch.ids == ["a1", "b1"]
+    assert batch.subjects == ["Chemistry"]
+    assert scores(batch) == {"b1": 90.0}
+    assert len(snapshot.batch("nobody")) == 0
+
+
+def test_current_batch_reads_updates_saved_since_the_export(snapshot):
+    edited = DataStore.get_progress("b1")
+    edited.assessment_results[0]["score"] = 95.0
+    DataStore.save_progress(edited)
+    DataStore.save_progress(Progress(
+        id=None, student_id="s1", roadmap_id="r1", completed_tasks={}, time_spent={},
+        assessment_results=[{"title": "Quiz", "subject": "Physics", "score": 80.0}]
+    ))
+
+    batch = snapshot.current_batch("s1")
+
+    assert len(batch) == 3 and batch.ids[0] == "a1"
+    assert sorted(scores(batch).values()) == [80.0, 95.0]
+    assert snapshot.current_batch("s2").ids == snapshot.batch("s2").ids
+
+
+def test_open_reopens_a_replaced_snapshot(storage):
+    assert open_progress_snapshot() is None
+
+    store(storage, "a1", "s1", 2)
+    first = open_progress_snapshot(write_progress_snapshot())
+    assert open_progress_snapshot() is first
+
+    store(storage, "a2", "s1", 3)
+    write_progress_snapshot()
+    assert len(open_progress_snapshot()) == 2
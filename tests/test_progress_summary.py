@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from utils.data_models import Progress
+from utils.progress_summary import EWMA_ALPHA, ProgressSummary
+from utils.state import DataStore
+
+
+def progress(student_id="s1", at=None, done=(True, False), minutes=None, scores=()):
+    return Progress(
+        id=None,
+        student_id=student_id,
+        roadmap_id="r1",
+        completed_tasks={f"task {i}": value for i, value in enumerate(done)},
+        time_spent=minutes or {},
+        assessment_results=[{"title": f"Quiz {i}", "subject": subject, "topic": topic, "score": score}
+                            for i, (subject, topic, score) in enumerate(scores)],
+        updated_at=at
+    )
+
+
+def test_update_folds_each_progress_record():
+    summary = ProgressSummary("s1")
+    summary.update(progress(at=datetime(2025, 3, 3), minutes={"Physics": 60},
+                            scores=[("Physics", "Optics", 60.0)]))
+    summary.update(progress(at=datetime(2025, 3, 10), done=(True, True), minutes={"Physics": 30, "Chemistry": 90},
+                            scores=[("Physics", "Optics", 80.0), ("Chemistry", None, 90.0)]))
+
+    assert summary.entries == 2
+    assert (summary.first_at, summary.last_at) == (datetime(2025, 3, 3), datetime(2025, 3, 10))
+    assert summary.completion_rate == 0.75
+    assert summary.minutes_by_subject == {"Physics": 90, "Chemistry": 90}
+    assert summary.average_score == pytest.approx(76.7)
+    assert summary.subject_scores() == {"Chemistry": 90.0, "Physics": 70.0}
+    assert summary.topics["Optics"]["ewma"] == pytest.approx(EWMA_ALPHA * 80 + (1 - EWMA_ALPHA) * 60)
+    # A score without a topic is tracked under its subject
+    assert summary.topics["Chemistry"]["latest"] == 90.0
+    assert summary.week_over_week() == {"average_score": 25.0, "hours": 1.0}
+
+
+def test_round_trip_through_dict():
+    summary = ProgressSummary("s1")
+    for week in range(1, 4):
+        summary.update(progress(at=datetime(2025, 3, week * 7), scores=[("Physics", "Optics", 50.0 + week)]))
+
+    restored = ProgressSummary.from_dict(summary.to_dict())
+
+    assert restored.to_dict() == summary.to_dict()
+    assert restored.performance_history() == summary.performance_history()
+
+
+def test_save_progress_folds_new_records_like_a_rebuild(storage):
+    for week in range(1, 5):
+        DataStore.save_progress(progress(minutes={"Physics": 10 * week}, scores=[("Physics", "Optics", 70.0 + week)]))
+    DataStore.save_progress(progress(student_id="s2"))
+
+    folded = DataStore.get_progress_summary("s1")
+    assert folded.entries == 4
+    assert folded.minutes_by_subject == {"Physics": 100}
+    assert DataStore.rebuild_progress_summary("s1").to_dict() == folded.to_dict()
+    assert DataStore.get_progress_summary("s2").entries == 1
+
+
+def test_saving_an_edited_record_rebuilds_the_summary(storage):
+    first = progress(done=(False, False))
+    DataStore.save_progress(first)
+    DataStore.save_progress(progress())
+
+    first.completed_tasks = {"task 0": True, "task 1": True}
+    DataStore.save_progress(first)
+
+    summary = DataStore.get_progress_summary("s1")
+    assert summary.entries == 2
+    assert (summary.tasks_completed, summary.tasks_total) == (3, 4)
+
+
+def test_summaries_log_lists_students_saved_since_a_version(storage):
+    assert DataStore.get_summaries_version() == 0
+    DataStore.save_progress(progress(student_id="s1"))
+    version = DataStore.get_summaries_version()
+    DataStore.save_progress(progress(student_id="s2"))
+    DataStore.save_progress(progress(student_id="s3"))
+
+    assert DataStore.get_summaries_saved_since(0) == ({"s1", "s2", "s3"}, DataStore.get_summaries_version())
+    assert DataStore.get_summaries_saved_since(version)[0] == {"s2", "s3"}
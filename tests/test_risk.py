@@ -0,0 +1,120 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from utils import risk
+from utils.data_models import Progress
+from utils.risk import RiskInputs, RiskScores, get_risk_inputs, get_risk_scores
+from utils.state import DataStore
+
+TODAY = date(2025, 3, 10)
+
+
+def student(student_id, plan_adherence=None, **fields):
+    """A roster entry whose only known signal is plan adherence, so its score is 100 - plan_adherence"""
+    return {"id": student_id, "name": student_id, "plan_adherence": plan_adherence, **fields}
+
+
+def save_progress(student_id, done):
+    DataStore.save_progress(Progress(
+        id=None, student_id=student_id, roadmap_id="r1",
+        completed_tasks={f"task {i}": value for i, value in enumerate(done)},
+        time_spent={}, assessment_results=[]
+    ))
+
+
+@pytest.fixture
+def risk_inputs(storage, monkeypatch):
+    """Risk inputs read afresh from the temp storage"""
+    monkeypatch.setattr(risk, "_risk_inputs", None)
+    return storage
+
+
+def test_top_at_risk_returns_the_k_highest_above_the_threshold():
+    students = [student(f"s{i}", adherence) for i, adherence in enumerate([90, 20, 45, 60, 5, 35])]
+    scores = RiskScores(students, RiskInputs(), TODAY)
+
+    top = scores.top_at_risk(k=3)
+
+    assert [s["id"] for s in top] == ["s4", "s1", "s5"]
+    assert [s["risk_score"] for s in top] == [95.0, 80.0, 65.0]
+    assert top[0]["risk_reason"] == "Falling behind the study plan"
+    assert top[0]["risk_details"] == "Risk score 95/100 (behind plan 95%)"
+    assert [s["id"] for s in scores.top_at_risk(k=10)] == ["s4", "s1", "s5", "s2"]
+    assert scores.top_at_risk(k=10, threshold=96) == []
+
+
+def test_unknown_signals_are_left_out_and_flags_win():
+    students = [
+        student("idle", last_active="2025-02-24"),
+        student("flagged", 100, at_risk=True, risk_reason="Asked for help"),
+        student("unknown"),
+        student("mixed", 50, missed_assessments=["Quiz 1", "Quiz 2", "Quiz 3"]),
+    ]
+    scores = RiskScores(students, RiskInputs(), TODAY)
+
+    assert scores.score[:3].tolist() == [100.0, 100.0, 0.0]
+    assert scores.score[3] == pytest.approx((0.5 * 0.35 + 1.0 * 0.15) / 0.5 * 100)
+    assert scores.main_signal[0] == "inactivity"
+    assert scores.explain(1)["risk_reason"] == "Asked for help"
+
+
+def test_empty_roster():
+    scores = RiskScores([], RiskInputs(), TODAY)
+
+    assert scores.top_at_risk() == []
+
+
+def test_summaries_win_over_the_roster(risk_inputs):
+    save_progress("s1", (True, False))
+
+    scores = RiskScores([student("s1", 90), student("s2", 90)], today=TODAY)
+
+    assert scores.score.tolist() == pytest.approx([50.0, 10.0])
+
+
+def test_inputs_refresh_only_reads_saved_summaries(risk_inputs, monkeypatch):
+    save_progress("s1", (True, False))
+    save_progress("s2", (True, True))
+    inputs = get_risk_inputs()
+    assert inputs.lookup(["s2", "s1", "s3"])[0][:2].tolist() == [1.0, 0.5]
+
+    read = []
+    get_progress_summary = DataStore.get_progress_summary
+    monkeypatch.setattr(DataStore, "get_progress_summary",
+                        lambda student_id: read.append(student_id) or get_progress_summary(student_id))
+    save_progress("s1", (True, True))
+    get_risk_inputs()
+
+    assert read == ["s1"]
+    assert inputs.lookup(["s1"])[0].tolist() == [0.75]
+    # The refreshed columns were saved for other processes
+    loaded = RiskInputs.load()
+    assert loaded.version == inputs.version
+    assert np.array_equal(loaded.lookup(["s1", "s2"])[0], inputs.lookup(["s1", "s2"])[0])
+
+
+def test_inputs_start_over_when_the_log_shrinks(risk_inputs):
+    save_progress("s1", (True, False))
+    inputs = RiskInputs()
+    inputs.refresh()
+    inputs.version += 100
+
+    assert inputs.refresh()
+    assert inputs.student_ids == ["s1"]
+
+
+def test_cached_scores_match_on_roster_ids(risk_inputs):
+    class State(dict):
+        __getattr__ = dict.__getitem__
+        __setattr__ = dict.__setitem__
+
+    state = State()
+    students = [student("s1", 20), student("s2", 40)]
+    scores = get_risk_scores(state, students)
+
+    assert get_risk_scores(state, [dict(s) for s in students]) is scores
+    assert get_risk_scores(state, students[::-1]) is not scores
+    save_progress("s1", (True, False))
+    assert get_risk_scores(state, students[::-1]).score.tolist() == pytest.approx([60.0, 50.0])
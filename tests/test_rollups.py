@@ -0,0 +1,118 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from utils.data_models import Progress
+from utils.progress_snapshot import write_progress_snapshot
+from utils.rollups import ROLLUPS_INDEX_FILE, ClassRollups, get_class_rollups, refresh_class_rollups
+from utils.state import DataStore
+
+
+def progress(student_id="s1", scores=(), at=None):
+    return Progress(
+        id=None,
+        student_id=student_id,
+        roadmap_id="r1",
+        completed_tasks={"task": True},
+        time_spent={},
+        assessment_results=[{"title": f"Quiz {i}", "subject": subject, "topic": topic, "score": score}
+                            for i, (subject, topic, score) in enumerate(scores)],
+        updated_at=at
+    )
+
+
+def averages(view):
+    return {
+        subject: {row["topic"]: (row["avg_score"], row["assessments"]) for row in topics}
+        for subject, topics in view["topics_performance"].items()
+    }
+
+
+def test_add_sums_scores_per_week_subject_and_topic():
+    rollups = ClassRollups().add([
+        progress("s1", [("Physics", "Optics", 60.0), ("Physics", None, 70.0)], datetime(2025, 3, 3)),
+        progress("s2", [("Physics", "Optics", 80.0)], datetime(2025, 3, 4)),
+        progress("s1", [("Chemistry", "Acids", 90.0), ("Chemistry", "Acids", "n/a")], datetime(2025, 3, 10)),
+    ])
+
+    assert rollups.students == {"s1": 2, "s2": 1}
+    assert rollups.performance_data()["overall"] == [
+        {"week": "2025-W10", "avg_score": 70.0},
+        {"week": "2025-W11", "avg_score": 90.0}
+    ]
+    assert rollups.performance_data()["by_subject"]["Physics"] == [{"week": "2025-W10", "avg_score": 70.0}]
+    # A score without a topic is counted under its title; a score that is not a number is skipped
+    assert averages(rollups.to_dict()) == {
+        "Chemistry": {"Acids": (90.0, 1)},
+        "Physics": {"Optics": (70.0, 2), "Quiz 1": (70.0, 1)}
+    }
+
+
+def test_round_trip_through_dict():
+    rollups = ClassRollups(refreshed_at=datetime(2025, 3, 10)).add([
+        progress("s1", [("Physics", "Optics", 60.0)], datetime(2025, 3, 3))
+    ])
+
+    data = json.loads(json.dumps(rollups.to_dict()))
+
+    assert ClassRollups.from_dict(data).to_dict() == rollups.to_dict()
+
+
+def test_refresh_reads_only_new_progress(storage):
+    DataStore.save_progress(progress("s1", [("Physics", "Optics", 60.0)]))
+    refresh_class_rollups()
+
+    DataStore.save_progress(progress("s2", [("Physics", "Optics", 80.0)]))
+    view = refresh_class_rollups()
+
+    with open(ROLLUPS_INDEX_FILE, 'r') as f:
+        assert len(json.load(f)) == 2
+    assert view["students"] == {"s1": 1, "s2": 1}
+    assert averages(view) == {"Physics": {"Optics": (70.0, 2)}}
+    assert refresh_class_rollups(full=True)["topics"] == view["topics"]
+
+
+def test_editing_a_counted_update_rebuilds(storage):
+    first = progress("s1", [("Physics", "Optics", 60.0)])
+    DataStore.save_progress(first)
+    DataStore.save_progress(progress("s2", [("Physics", "Optics", 80.0)]))
+    refresh_class_rollups()
+
+    first.assessment_results[0]["score"] = 100.0
+    DataStore.save_progress(first)
+    path = os.path.join(storage, f"progress_{first.id}.json")
+    os.utime(path, (os.path.getmtime(path) + 1,) * 2)
+    view = refresh_class_rollups()
+
+    # The old score is not double counted
+    assert averages(view) == {"Physics": {"Optics": (90.0, 2)}}
+
+
+def test_rebuild_starts_from_the_snapshot(storage):
+    DataStore.save_progress(progress("s1", [("Physics", "Optics", 60.0)]))
+    write_progress_snapshot()
+    DataStore.save_progress(progress("s2", [("Physics", "Optics", 80.0)]))
+
+    view = refresh_class_rollups(full=True)
+
+    assert view["students"] == {"s1": 1, "s2": 1}
+    assert averages(view) == {"Physics": {"Optics": (70.0, 2)}}
+
+
+def test_get_class_rollups_refreshes_only_when_stale(storage):
+    DataStore.save_progress(progress("s1", [("Physics", "Optics", 60.0)]))
+    first = get_class_rollups()
+    DataStore.save_progress(progress("s2", [("Physics", "Optics", 80.0)]))
+
+    assert get_class_rollups() == first
+    assert get_class_rollups(max_age_s=0)["students"] == {"s1": 1, "s2": 1}
+
+
+@pytest.mark.parametrize("rows", [[], [progress("s1")]])
+def test_add_without_scores(rows):
+    rollups = ClassRollups().add(rows)
+
+    assert rollups.weeks == {} and rollups.topics_performance() == {}
+    assert rollups.students == ({"s1": 1} if rows else {})
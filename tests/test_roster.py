@@ -0,0 +1,66 @@
+import pytest
+
+from utils.roster import Roster
+
+STUDENTS = [
+    {"name": "Chitra", "progress": 40, "last_active": "2025-03-02", "subjects": ["Physics", "Chemistry"]},
+    {"name": "Aditya", "progress": 75, "last_active": "2025-03-05", "subjects": [{"name": "Mathematics"}]},
+    {"name": "Bela", "progress": 40, "last_active": None, "subjects": ["Physics"]},
+    {"name": "Dev", "progress": 90, "last_active": "not a date", "subjects": []},
+]
+
+
+def names(roster, positions):
+    return [student["name"] for student in roster.records(positions)]
+
+
+@pytest.mark.parametrize("sort_by, expected", [
+    ("Name", ["Aditya", "Bela", "Chitra", "Dev"]),
+    ("Progress (High to Low)", ["Dev", "Aditya", "Chitra", "Bela"]),
+    ("Progress (Low to High)", ["Chitra", "Bela", "Aditya", "Dev"]),
+    # Missing and unparseable dates sort as DEFAULT_LAST_ACTIVE
+    ("Last Active", ["Aditya", "Chitra", "Bela", "Dev"]),
+    ("Unknown option", ["Aditya", "Bela", "Chitra", "Dev"]),
+])
+def test_order_keeps_ties_in_roster_order(sort_by, expected):
+    roster = Roster(STUDENTS)
+
+    assert names(roster, roster.order(sort_by)) == expected
+    assert roster.order(sort_by) is roster.order(sort_by)
+
+
+@pytest.mark.parametrize("subjects, min_progress, expected", [
+    ((), 0, ["Aditya", "Bela", "Chitra", "Dev"]),
+    (["Physics"], 0, ["Bela", "Chitra"]),
+    (["Mathematics", "Chemistry"], 0, ["Aditya", "Chitra"]),
+    (["Physics"], 41, []),
+    ((), 75, ["Aditya", "Dev"]),
+    (["Biology"], 0, []),
+])
+def test_query_filters_then_sorts(subjects, min_progress, expected):
+    roster = Roster(STUDENTS)
+
+    assert names(roster, roster.query(subjects, min_progress, "Name")) == expected
+
+
+def test_subjects_beyond_one_mask_word():
+    students = [{"name": f"Student {i}", "subjects": [f"Subject {i}", "Shared"]} for i in range(100)]
+    roster = Roster(students)
+
+    assert roster.subject_mask.shape == (100, 2)
+    assert names(roster, roster.query(["Subject 99"])) == ["Student 99"]
+    assert names(roster, roster.query(["Subject 3", "Subject 70"])) == ["Student 3", "Student 70"]
+    assert roster.filter_mask(["Shared"]).all()
+
+
+def test_matches_only_the_same_list():
+    roster = Roster(STUDENTS)
+
+    assert roster.matches(STUDENTS)
+    assert not roster.matches(list(STUDENTS))
+
+
+def test_empty_roster():
+    roster = Roster([])
+
+    assert roster.query(["Physics"], 50, "Last Active").size == 0
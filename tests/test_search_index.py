@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+from utils.search_index import SearchIndex, snippet, tokenize
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(path=str(tmp_path / "search_index.npz"), data_dir=str(tmp_path / "storage"))
+    index.add("roadmap", "r1", "Chemistry roadmap: acids and bases, then organic chemistry", student_id="s1")
+    index.add("roadmap", "r2", "Physics roadmap: optics and mechanics", student_id="s2")
+    index.add("feedback", "f1", "Needs more chemical equations practice", student_id="s1", source_type="teacher")
+    index.add("feedback", "f2", "Enjoys optics experiments at home", student_id="s2", source_type="parent")
+    return index
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The Acids and 2 Bases!") == ["acids", "2", "bases"]
+
+
+def test_search_ranks_by_bm25(index):
+    # r1 mentions chemistry twice
+    assert ids(index.search("chemistry")) == ["r1"]
+    assert ids(index.search("optics mechanics")) == ["r2", "f2"]
+    assert index.search("the and") == [] and index.search("biology") == []
+    assert ids(index.search("optics", limit=1)) == ["r2"]
+
+
+def test_prefix_query(index):
+    assert sorted(ids(index.search("chem*"))) == ["f1", "r1"]
+    assert ids(index.search("mech*")) == ["r2"]
+    assert index.search("zz*") == []
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"kinds": ["feedback"]}, ["f1", "f2"]),
+    ({"source_type": "parent"}, ["f2"]),
+    ({"student_id": "s1"}, ["f1", "r1"]),
+    ({"kinds": ["roadmap"], "student_id": "s2"}, ["r2"]),
+])
+def test_filters(index, filters, expected):
+    assert sorted(ids(index.search("chem* optics", **filters))) == expected
+
+
+def test_add_replaces_and_remove_drops(index):
+    index.add("roadmap", "r2", "Biology roadmap: cells", student_id="s2")
+    index.remove("feedback", "f2")
+
+    assert ids(index.search("optics")) == []
+    assert ids(index.search("cells")) == ["r2"]
+    assert len(index) == 3
+    assert index.stats()["dead_documents"] == 2
+
+
+def test_save_compacts_and_load_restores(index):
+    index.remove("feedback", "f1")
+    expected = index.search("chem* optics")
+
+    index.save()
+    assert index.stats()["dead_documents"] == 0
+    assert index.search("chem* optics") == expected
+
+    loaded = SearchIndex(path=index.path, data_dir=index.data_dir)
+    loaded.load()
+    assert len(loaded) == 3
+    assert loaded.search("chem* optics") == expected
+    loaded.add("feedback", "f3", "Chemistry quiz went well", student_id="s1", source_type="student")
+    assert sorted(ids(loaded.search("chem*"))) == ["f3", "r1"]
+
+
+def test_refresh_indexes_saved_and_deleted_records(tmp_path):
+    storage = tmp_path / "storage"
+    os.makedirs(storage)
+    for name, data in [
+        ("roadmap_r1", {"id": "r1", "student_id": "s1", "content": {"title": "Organic chemistry"}}),
+        ("feedback_f1", {"id": "f1", "student_id": "s1", "source_type": "teacher", "content": "Good optics work",
+                         "response": "Thanks"}),
+        ("progress_p1", {"id": "p1", "student_id": "s1"}),
+    ]:
+        with open(storage / f"{name}.json", "w") as f:
+            json.dump(data, f)
+    index = SearchIndex(path=str(tmp_path / "search_index.npz"), data_dir=str(storage))
+
+    assert index.refresh() == 2
+    assert ids(index.search("organic")) == ["r1"] and ids(index.search("thanks")) == ["f1"]
+    assert os.path.exists(index.path)
+
+    os.remove(storage / "feedback_f1.json")
+    assert index.refresh(force=True) == 1
+    assert index.search("optics") == []
+    assert index.refresh(force=True) == 0
+
+
+def test_snippet_centers_on_the_first_match():
+    text = "intro " * 50 + "Optics chapter review"
+
+    assert snippet(text, "optics", width=40).startswith("…")
+    assert "Optics" in snippet(text, "opt*", width=40)
+    assert snippet("Short text", "missing") == "Short text"
@@ -0,0 +1,413 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from utils.data_models import Feedback, Model
+
+# Where DataStore keeps its records
+DATA_DIR = 'data/storage'
+
+_NAT = np.datetime64('NaT', 'us')
+
+# Assessment fields kept as coded columns in ProgressBatch
+SCORE_FIELDS = ('subject', 'topic', 'title')
+
+
+def _encode(values):
+    """Integer codes for a list of labels, plus the labels in code order"""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+def _timestamps(values):
+    """datetime64[us] column from ISO strings, datetimes or None"""
+    try:
+        return np.array(values, dtype='datetime64[us]')
+    except (TypeError, ValueError):
+        # Timezone offsets and other forms numpy does not parse
+        return np.array([
+            np.datetime64(datetime.fromisoformat(v) if isinstance(v, str) else v, 'us') if v else _NAT
+            for v in values
+        ], dtype='datetime64[us]')
+
+
+def _number(value):
+    """A score as a float, NaN when missing or not numeric"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _rows(records):
+    """Dicts for records that may be dicts or data model objects"""
+    for record in records:
+        yield record.to_dict() if isinstance(record, Model) else record
+
+
+def _read_json(paths):
+    for path in paths:
+        with open(path, 'r') as f:
+            yield json.load(f)
+
+
+def _storage_rows(prefix, data_dir, student_id=None, roadmap_id=None):
+    """Stored records of one kind as dicts, optionally for one student and/or roadmap"""
+    if not os.path.exists(data_dir):
+        return
+    for entry in os.scandir(data_dir):
+        if entry.name.startswith(prefix) and entry.name.endswith('.json'):
+            with open(entry.path, 'r') as f:
+                data = json.load(f)
+            if student_id is not None and data.get('student_id') != student_id:
+                continue
+            if roadmap_id is not None and data.get('roadmap_id') != roadmap_id:
+                continue
+            yield data
+
+
+def _coalesce(fields, default):
+    """Per-row label from the first field whose label is set (not None or empty), as (codes, labels)
+
+    Args:
+        fields: (codes, labels) pairs over the same rows, in order of preference
+        default: Label for rows where no field is set
+    """
+    index = {default: 0}
+    codes = None
+    for field_codes, field_labels in reversed(fields):
+        if codes is None:
+            codes = np.zeros(len(field_codes), dtype=np.int32)
+        remap = np.array(
+            [-1 if not label else index.setdefault(label, len(index)) for label in field_labels],
+            dtype=np.int32
+        )
+        if len(remap):
+            mapped = remap[field_codes]
+            codes = np.where(mapped >= 0, mapped, codes)
+    return codes if codes is not None else np.zeros(0, dtype=np.int32), list(index)
+
+
+def _merge_codes(pairs):
+    """(codes, labels) pairs over consecutive row ranges as one codes column over merged labels"""
+    index = {}
+    merged = []
+    for codes, labels in pairs:
+        remap = np.array([index.setdefault(label, len(index)) for label in labels], dtype=np.int32)
+        merged.append(remap[codes])
+    return np.concatenate(merged), list(index)
+
+
+class ProgressBatch:
+    """Progress updates stored column by column
+
+    One row per update: coded student and roadmap ids, updated_at as
+    datetime64[us], task counts and a minutes matrix with one column per
+    subject (NaN where an update recorded no time for it). Assessment
+    scores are a second, longer set of columns, each score pointing at its
+    update through score_entry.
+    """
+
+    def __init__(self, ids, student_codes, student_ids, roadmap_codes, roadmap_ids, updated_at,
+                 tasks_done, tasks_total, subjects, minutes, score_entry, score, score_fields):
+        self.ids = ids
+        self.student_codes = student_codes
+        self.student_ids = student_ids
+        self.roadmap_codes = roadmap_codes
+        self.roadmap_ids = roadmap_ids
+        self.updated_at = updated_at
+        self.tasks_done = tasks_done
+        self.tasks_total = tasks_total
+        self.subjects = subjects
+        self.minutes = minutes
+        self.score_entry = score_entry
+        self.score = score
+        self.score_fields = score_fields
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> 'ProgressBatch':
+        """Build from Progress dicts (or objects) in one pass, without creating Progress objects
+
+        Labels are coded as they are met and every value is written straight
+        into a preallocated column, through a memoryview since numpy item
+        assignment costs several times more per value. Score columns start
+        at two per update and double when full; each subject gets its own
+        minutes column the first time it is met.
+        """
+        rows = [row.to_dict() if isinstance(row, Model) else row for row in rows]
+        n = len(rows)
+        ids = [None] * n
+        updated_at = [None] * n
+        student_index, roadmap_index, subject_index = {}, {}, {}
+        student_codes, roadmap_codes, tasks_done, tasks_total = (np.empty(n, dtype=np.int32) for _ in range(4))
+        students, roadmaps, done, total = student_codes.data, roadmap_codes.data, tasks_done.data, tasks_total.data
+        minutes, minutes_views = [], []
+        score_index = {field: {} for field in SCORE_FIELDS}
+        score_columns = [np.empty(2 * n, dtype=np.int64), np.empty(2 * n)] + [
+            np.empty(2 * n, dtype=np.int32) for _ in SCORE_FIELDS
+        ]
+        entries, scores, *field_codes = (column.data for column in score_columns)
+        fields = list(zip(score_index.values(), field_codes))
+        k = 0
+
+        for i, row in enumerate(rows):
+            get = row.get
+            ids[i] = get('id')
+            updated_at[i] = get('updated_at')
+            students[i] = student_index.setdefault(get('student_id'), len(student_index))
+            roadmaps[i] = roadmap_index.setdefault(get('roadmap_id'), len(roadmap_index))
+
+            completed = get('completed_tasks')
+            if completed:
+                done[i] = sum(map(bool, completed.values()))
+                total[i] = len(completed)
+            else:
+                done[i] = total[i] = 0
+
+            time_spent = get('time_spent')
+            if time_spent:
+                for subject, value in time_spent.items():
+                    column = subject_index.get(subject)
+                    if column is None:
+                        column = subject_index[subject] = len(minutes)
+                        minutes.append(np.full(n, np.nan))
+                        minutes_views.append(minutes[-1].data)
+                    minutes_views[column][i] = value
+
+            assessments = get('assessment_results')
+            if assessments:
+                for assessment in assessments:
+                    if k == len(entries):
+                        score_columns = [np.concatenate([column, np.empty_like(column)]) for column in score_columns]
+                        entries, scores, *field_codes = (column.data for column in score_columns)
+                        fields = list(zip(score_index.values(), field_codes))
+                    aget = assessment.get
+                    entries[k] = i
+                    score = aget('score')
+                    scores[k] = score if type(score) is float else _number(score)
+                    for field, (index, codes) in zip(SCORE_FIELDS, fields):
+                        codes[k] = index.setdefault(aget(field), len(index))
+                    k += 1
+
+        score_entry, score, *codes = (column[:k].copy() for column in score_columns)
+        return cls(
+            ids=ids,
+            student_codes=student_codes,
+            student_ids=list(student_index),
+            roadmap_codes=roadmap_codes,
+            roadmap_ids=list(roadmap_index),
+            updated_at=_timestamps(updated_at),
+            tasks_done=tasks_done,
+            tasks_total=tasks_total,
+            subjects=list(subject_index),
+            minutes=np.column_stack(minutes) if minutes else np.full((n, 0), np.nan),
+            score_entry=score_entry,
+            score=score,
+            score_fields={field: (field_codes, list(score_index[field])) for field, field_codes in zip(SCORE_FIELDS, codes)}
+        )
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> 'ProgressBatch':
+        """Build from stored progress files"""
+        return cls.from_rows(_read_json(paths))
+
+    @classmethod
+    def from_storage(cls, student_id: Optional[str] = None, roadmap_id: Optional[str] = None,
+                     data_dir: str = DATA_DIR) -> 'ProgressBatch':
+        """Build from every stored progress update, optionally for one student and/or roadmap"""
+        return cls.from_rows(_storage_rows('progress_', data_dir, student_id, roadmap_id))
+
+    @classmethod
+    def concat(cls, batches: Sequence['ProgressBatch']) -> 'ProgressBatch':
+        """The rows of one or more batches one after another, with ids and labels merged"""
+        offsets = np.cumsum([0] + [len(batch) for batch in batches])
+        subject_codes, subjects = _merge_codes((np.arange(len(b.subjects)), b.subjects) for b in batches)
+        subject_columns = np.split(subject_codes, np.cumsum([len(b.subjects) for b in batches])[:-1])
+        minutes = np.full((offsets[-1], len(subjects)), np.nan)
+        for batch, start, columns in zip(batches, offsets, subject_columns):
+            minutes[start:start + len(batch), columns] = batch.minutes
+        student_codes, student_ids = _merge_codes((b.student_codes, b.student_ids) for b in batches)
+        roadmap_codes, roadmap_ids = _merge_codes((b.roadmap_codes, b.roadmap_ids) for b in batches)
+        return cls(
+            ids=[i for batch in batches for i in batch.ids],
+            student_codes=student_codes,
+            student_ids=student_ids,
+            roadmap_codes=roadmap_codes,
+            roadmap_ids=roadmap_ids,
+            updated_at=np.concatenate([b.updated_at for b in batches]),
+            tasks_done=np.concatenate([b.tasks_done for b in batches]),
+            tasks_total=np.concatenate([b.tasks_total for b in batches]),
+            subjects=subjects,
+            minutes=minutes,
+            score_entry=np.concatenate([b.score_entry + start for b, start in zip(batches, offsets)]),
+            score=np.concatenate([b.score for b in batches]),
+            score_fields={field: _merge_codes(b.score_fields[field] for b in batches) for field in SCORE_FIELDS}
+        )
+
+    def take(self, positions) -> 'ProgressBatch':
+        """The rows at the given positions, in that order, with their scores"""
+        positions = np.asarray(positions, dtype=np.int64)
+        new_position = np.full(len(self), -1, dtype=np.int64)
+        new_position[positions] = np.arange(len(positions))
+        score_position = new_position[self.score_entry]
+        kept = np.flatnonzero(score_position >= 0)
+        kept = kept[np.argsort(score_position[kept], kind='stable')]
+        minutes = self.minutes[positions]
+        recorded = ~np.isnan(minutes).all(axis=0)
+        return ProgressBatch(
+            ids=[self.ids[i] for i in positions],
+            student_codes=self.student_codes[positions],
+            student_ids=self.student_ids,
+            roadmap_codes=self.roadmap_codes[positions],
+            roadmap_ids=self.roadmap_ids,
+            updated_at=self.updated_at[positions],
+            tasks_done=self.tasks_done[positions],
+            tasks_total=self.tasks_total[positions],
+            subjects=[subject for subject, keep in zip(self.subjects, recorded) if keep],
+            minutes=minutes[:, recorded],
+            score_entry=score_position[kept],
+            score=self.score[kept],
+            score_fields={field: (codes[kept], labels) for field, (codes, labels) in self.score_fields.items()}
+        )
+
+    def select(self, mask) -> 'ProgressBatch':
+        """The rows where mask is true, with their scores"""
+        return self.take(np.flatnonzero(mask))
+
+    def for_student(self, student_id: str) -> 'ProgressBatch':
+        """The rows of one student"""
+        if student_id not in self.student_ids:
+            return self.select(np.zeros(len(self), dtype=bool))
+        return self.select(self.student_codes == self.student_ids.index(student_id))
+
+    def minutes_by_subject(self) -> np.ndarray:
+        """Total minutes per subject, in the order of subjects"""
+        return np.nansum(self.minutes, axis=0)
+
+    def seconds(self) -> np.ndarray:
+        """updated_at as seconds since the epoch (float, NaN when missing)"""
+        seconds = self.updated_at.astype(np.int64) / 1e6
+        seconds[np.isnat(self.updated_at)] = np.nan
+        return seconds
+
+    def score_labels(self, fields: Sequence[str], default: str = "General"):
+        """Per-score label from the first of the given assessment fields that is set
+
+        Returns:
+            tuple: Integer code per score, and the labels the codes index
+        """
+        return _coalesce([self.score_fields[field] for field in fields], default)
+
+    def updates_per_student(self) -> Dict[str, int]:
+        """Number of rows per student id"""
+        counts = np.bincount(self.student_codes, minlength=len(self.student_ids))
+        return {student_id: int(count) for student_id, count in zip(self.student_ids, counts) if count}
+
+
+class FeedbackBatch:
+    """Feedback records stored column by column
+
+    Ids, source types and creation times are coded or numeric columns; the
+    free text (content, response) is kept as plain lists.
+    """
+
+    def __init__(self, ids, student_codes, student_ids, roadmap_codes, roadmap_ids, source_codes, source_types,
+                 source_ids, created_at, processed, content, response):
+        self.ids = ids
+        self.student_codes = student_codes
+        self.student_ids = student_ids
+        self.roadmap_codes = roadmap_codes
+        self.roadmap_ids = roadmap_ids
+        self.source_codes = source_codes
+        self.source_types = source_types
+        self.source_ids = source_ids
+        self.created_at = created_at
+        self.processed = processed
+        self.content = content
+        self.response = response
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> 'FeedbackBatch':
+        """Build from Feedback dicts (or objects) in one pass, without creating Feedback objects"""
+        columns = {name: [] for name in (
+            'id', 'student_id', 'roadmap_id', 'source_type', 'source_id', 'created_at', 'processed', 'content', 'response'
+        )}
+        appends = [(name, values.append) for name, values in columns.items()]
+        for row in _rows(rows):
+            get = row.get
+            for name, append in appends:
+                append(get(name))
+
+        student_codes, student_ids = _encode(columns['student_id'])
+        roadmap_codes, roadmap_ids = _encode(columns['roadmap_id'])
+        source_codes, source_types = _encode(columns['source_type'])
+        return cls(
+            ids=columns['id'],
+            student_codes=student_codes,
+            student_ids=student_ids,
+            roadmap_codes=roadmap_codes,
+            roadmap_ids=roadmap_ids,
+            source_codes=source_codes,
+            source_types=source_types,
+            source_ids=columns['source_id'],
+            created_at=_timestamps(columns['created_at']),
+            processed=np.array([bool(p) for p in columns['processed']], dtype=bool),
+            content=columns['content'],
+            response=columns['response']
+        )
+
+    @classmethod
+    def from_storage(cls, student_id: Optional[str] = None, roadmap_id: Optional[str] = None,
+                     data_dir: str = DATA_DIR) -> 'FeedbackBatch':
+        """Build from every stored feedback record, optionally for one student and/or roadmap"""
+        return cls.from_rows(_storage_rows('feedback_', data_dir, student_id, roadmap_id))
+
+    def source_mask(self, source_type: str) -> np.ndarray:
+        """Rows from one source ('teacher', 'parent' or 'student')"""
+        if source_type not in self.source_types:
+            return np.zeros(len(self), dtype=bool)
+        return self.source_codes == self.source_types.index(source_type)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Records and unprocessed records per source type"""
+        n = len(self.source_types)
+        total = np.bincount(self.source_codes, minlength=n)
+        pending = np.bincount(self.source_codes, weights=~self.processed, minlength=n)
+        return {
+            source: {"total": int(total[k]), "unprocessed": int(pending[k])}
+            for k, source in enumerate(self.source_types)
+        }
+
+    def latest(self, source_type: Optional[str] = None) -> Optional[int]:
+        """Position of the most recently created row, optionally from one source"""
+        mask = self.source_mask(source_type) if source_type is not None else np.ones(len(self), dtype=bool)
+        mask &= ~np.isnat(self.created_at)
+        if not mask.any():
+            return None
+        positions = np.flatnonzero(mask)
+        return int(positions[np.argmax(self.created_at[positions])])
+
+    def record(self, i: int) -> Feedback:
+        """One row as a Feedback object"""
+        created_at = self.created_at[i]
+        return Feedback(
+            id=self.ids[i],
+            student_id=self.student_ids[self.student_codes[i]],
+            roadmap_id=self.roadmap_ids[self.roadmap_codes[i]],
+            source_type=self.source_types[self.source_codes[i]],
+            source_id=self.source_ids[i],
+            content=self.content[i],
+            created_at=None if np.isnat(created_at) else created_at.astype(datetime),
+            processed=bool(self.processed[i]),
+            response=self.response[i]
+        )
@@ -0,0 +1,60 @@
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Shared data is read-only; call mutable(key) on the session's copy to change it")
+
+
+class FrozenDict(dict):
+    """dict that refuses in-place changes; still a dict for isinstance checks and json"""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """list that refuses in-place changes; still a list for isinstance checks and json"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value):
+    """Read-only deep copy of nested dicts and lists"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Mutable deep copy of nested dicts and lists"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class CopyOnWriteDict(dict):
+    """A session's view of a frozen, process-wide dict
+
+    Only the top level is copied; nested values stay shared and read-only
+    until mutable(key) swaps in a private copy of that one value.
+    Assigning a top-level key never touches the shared data.
+    """
+
+    def mutable(self, key):
+        """The value at key, made private to this dict on first use"""
+        value = self[key]
+        if isinstance(value, (FrozenDict, FrozenList)):
+            value = thaw(value)
+            self[key] = value
+        return value
+
+    def __reduce__(self):
+        return (CopyOnWriteDict, (dict(self),))
@@ -1,9 +1,74 @@
+import sys
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
-class Student:
+# Strings repeated across many records (foreign keys, subject names, source
+# types) are interned so each distinct value is held once; `x and _intern(x)`
+# keeps None as is
+_intern = sys.intern
+
+def _intern_list(values):
+    """Copy a list of names with each string interned; anything else is kept as is"""
+    if isinstance(values, list):
+        return [_intern(v) if type(v) is str else v for v in values]
+    return values or []
+
+def _intern_keys(mapping):
+    """Copy a dict with its keys interned; anything else is kept as is"""
+    if isinstance(mapping, dict):
+        return {_intern(k): v for k, v in mapping.items()}
+    return mapping or {}
+
+def _isoformat(value):
+    """Serialize a timestamp field, passing through one that was never parsed"""
+    return value if type(value) is str else value.isoformat()
+
+
+class Timestamp:
+    """A datetime field kept as the stored ISO string until it is first read
+    
+    Loaded records are often only filtered by id or written back out, so
+    parsing every timestamp in from_dict is wasted work.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.slot = "_" + name
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if type(value) is str:
+            value = datetime.fromisoformat(value)
+            setattr(obj, self.slot, value)
+        return value
+    
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+
+class Model:
+    """Base for the slotted data models, with bulk conversion helpers"""
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_dicts(cls, rows):
+        """Create many records from dictionaries"""
+        from_dict = cls.from_dict
+        return [from_dict(row) for row in rows]
+    
+    @staticmethod
+    def to_dicts(records):
+        """Convert many records to dictionaries"""
+        return [record.to_dict() for record in records]
+
+
+class Student(Model):
     """Student data model"""
     
+    __slots__ = ('id', 'name', 'grade', 'subjects', 'strengths', 'weaknesses', 'goals', 'performance')
+    
     def __init__(
         self,
         id: str,
@@ -18,9 +83,9 @@ class Student:
         self.id = id
         self.name = name
         self.grade = grade
-        self.subjects = subjects
-        self.strengths = strengths or []
-        self.weaknesses = weaknesses or []
+        self.subjects = _intern_list(subjects)
+        self.strengths = _intern_list(strengths)
+        self.weaknesses = _intern_list(weaknesses)
         self.goals = goals or {}
         self.performance = performance or {}
         
@@ -40,21 +105,27 @@ class Student:
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
+        get = data.get
         return cls(
-            id=data.get("id"),
-            name=data.get("name"),
-            grade=data.get("grade"),
-            subjects=data.get("subjects", []),
-            strengths=data.get("strengths", []),
-            weaknesses=data.get("weaknesses", []),
-            goals=data.get("goals", {}),
-            performance=data.get("performance", {})
+            get("id"),
+            get("name"),
+            get("grade"),
+            get("subjects"),
+            get("strengths"),
+            get("weaknesses"),
+            get("goals"),
+            get("performance")
         )
 
 
-class Roadmap:
+class Roadmap(Model):
     """Roadmap data model"""
     
+    __slots__ = ('id', 'student_id', 'content', '_created_at', '_updated_at', 'version', 'approved_by')
+    
+    created_at = Timestamp()
+    updated_at = Timestamp()
+    
     def __init__(
         self,
         id: str,
@@ -66,10 +137,10 @@ class Roadmap:
         approved_by: str = None
     ):
         self.id = id
-        self.student_id = student_id
+        self.student_id = student_id and _intern(student_id)
         self.content = content
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
+        self._created_at = created_at or datetime.now()
+        self._updated_at = updated_at or datetime.now()
         self.version = version
         self.approved_by = approved_by
         
@@ -79,8 +150,8 @@ class Roadmap:
             "id": self.id,
             "student_id": self.student_id,
             "content": self.content,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": _isoformat(self._created_at),
+            "updated_at": _isoformat(self._updated_at),
             "version": self.version,
             "approved_by": self.approved_by
         }
@@ -88,20 +159,25 @@ class Roadmap:
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
+        get = data.get
         return cls(
-            id=data.get("id"),
-            student_id=data.get("student_id"),
-            content=data.get("content"),
-            created_at=datetime.fromisoformat(data.get("created_at")) if data.get("created_at") else None,
-            updated_at=datetime.fromisoformat(data.get("updated_at")) if data.get("updated_at") else None,
-            version=data.get("version", 1),
-            approved_by=data.get("approved_by")
+            get("id"),
+            get("student_id"),
+            get("content"),
+            get("created_at"),
+            get("updated_at"),
+            get("version", 1),
+            get("approved_by")
         )
 
 
-class Progress:
+class Progress(Model):
     """Student progress data model"""
     
+    __slots__ = ('id', 'student_id', 'roadmap_id', 'completed_tasks', 'time_spent', 'assessment_results', 'notes', '_updated_at')
+    
+    updated_at = Timestamp()
+    
     def __init__(
         self,
         id: str,
@@ -114,13 +190,14 @@ class Progress:
         updated_at: datetime = None
     ):
         self.id = id
-        self.student_id = student_id
-        self.roadmap_id = roadmap_id
+        self.student_id = student_id and _intern(student_id)
+        self.roadmap_id = roadmap_id and _intern(roadmap_id)
         self.completed_tasks = completed_tasks or {}
-        self.time_spent = time_spent or {}
+        # Keyed by subject name
+        self.time_spent = _intern_keys(time_spent)
         self.assessment_results = assessment_results or []
         self.notes = notes
-        self.updated_at = updated_at or datetime.now()
+        self._updated_at = updated_at or datetime.now()
         
     def to_dict(self):
         """Convert to dictionary for serialization"""
@@ -132,27 +209,32 @@ class Progress:
             "time_spent": self.time_spent,
             "assessment_results": self.assessment_results,
             "notes": self.notes,
-            "updated_at": self.updated_at.isoformat()
+            "updated_at": _isoformat(self._updated_at)
         }
     
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
+        get = data.get
         return cls(
-            id=data.get("id"),
-            student_id=data.get("student_id"),
-            roadmap_id=data.get("roadmap_id"),
-            completed_tasks=data.get("completed_tasks", {}),
-            time_spent=data.get("time_spent", {}),
-            assessment_results=data.get("assessment_results", []),
-            notes=data.get("notes"),
-            updated_at=datetime.fromisoformat(data.get("updated_at")) if data.get("updated_at") else None
+            get("id"),
+            get("student_id"),
+            get("roadmap_id"),
+            get("completed_tasks"),
+            get("time_spent"),
+            get("assessment_results"),
+            get("notes"),
+            get("updated_at")
         )
 
 
-class Feedback:
+class Feedback(Model):
     """Feedback data model"""
     
+    __slots__ = ('id', 'student_id', 'roadmap_id', 'source_type', 'source_id', 'content', '_created_at', 'processed', 'response')
+    
+    created_at = Timestamp()
+    
     def __init__(
         self,
         id: str,
@@ -166,12 +248,12 @@ class Feedback:
         response: str = None
     ):
         self.id = id
-        self.student_id = student_id
-        self.roadmap_id = roadmap_id
-        self.source_type = source_type
+        self.student_id = student_id and _intern(student_id)
+        self.roadmap_id = roadmap_id and _intern(roadmap_id)
+        self.source_type = source_type and _intern(source_type)
         self.source_id = source_id
         self.content = content
-        self.created_at = created_at or datetime.now()
+        self._created_at = created_at or datetime.now()
         self.processed = processed
         self.response = response
         
@@ -184,7 +266,7 @@ class Feedback:
             "source_type": self.source_type,
             "source_id": self.source_id,
             "content": self.content,
-            "created_at": self.created_at.isoformat(),
+            "created_at": _isoformat(self._created_at),
             "processed": self.processed,
             "response": self.response
         }
@@ -192,16 +274,17 @@ class Feedback:
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
+        get = data.get
         return cls(
-            id=data.get("id"),
-            student_id=data.get("student_id"),
-            roadmap_id=data.get("roadmap_id"),
-            source_type=data.get("source_type"),
-            source_id=data.get("source_id"),
-            content=data.get("content"),
-            created_at=datetime.fromisoformat(data.get("created_at")) if data.get("created_at") else None,
-            processed=data.get("processed", False),
-            response=data.get("response")
+            get("id"),
+            get("student_id"),
+            get("roadmap_id"),
+            get("source_type"),
+            get("source_id"),
+            get("content"),
+            get("created_at"),
+            get("processed", False),
+            get("response")
         )
 
 # Add aliases for the classes that app.py is trying to import
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+# Figures kept across all sessions of this process; least recently used are evicted
+FIGURE_CACHE_MAX_ENTRIES = int(os.getenv("FIGURE_CACHE_MAX_ENTRIES", "256"))
+
+
+def data_key(*parts):
+    """Stable hash of the data a chart is built from (dicts, lists, scalars, DataFrames)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(repr(list(part.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Bounded LRU cache of built chart objects, shared by every session
+
+    Cached values are shared; callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.build_ms = 0.0
+        self.saved_ms = 0.0
+
+    def get_or_build(self, builder, *args, **kwargs):
+        """Return builder(*args, **kwargs), building it only for data not seen before"""
+        key = (builder.__module__, builder.__qualname__, data_key(args, kwargs))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_ms += entry[1]
+                return entry[0]
+
+        start = time.perf_counter()
+        value = builder(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.misses += 1
+            self.build_ms += elapsed_ms
+            self._entries[key] = (value, elapsed_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Hit rate and the build time spent and saved so far"""
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / calls, 3) if calls else None,
+                "build_ms": round(self.build_ms, 1),
+                "saved_ms": round(self.saved_ms, 1)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self.build_ms = self.saved_ms = 0.0
+
+
+figure_cache = FigureCache()
+
+
+def plotly_chart(builder, *args, **kwargs):
+    """Render a Plotly figure built by builder(*args, **kwargs), reusing it while the data is unchanged"""
+    st.plotly_chart(figure_cache.get_or_build(builder, *args, **kwargs), use_container_width=True)
+
+
+def _vega_lite_spec(builder, *args, **kwargs):
+    return builder(*args, **kwargs).to_dict()
+
+
+def altair_chart(builder, *args, **kwargs):
+    """Render an Altair chart built by builder(*args, **kwargs)
+
+    The serialized Vega-Lite spec is cached rather than the chart, so Altair's
+    validation and to_dict() also only run when the data changes.
+    """
+    spec = figure_cache.get_or_build(_vega_lite_spec, builder, *args, **kwargs)
+    st.vega_lite_chart(spec, use_container_width=True)
@@ -0,0 +1,18 @@
+import streamlit as st
+
+
+def lazy_tabs(labels, key):
+    """Tabs that track which one is selected, so hidden tabs can skip their work
+
+    Switching tabs reruns the app; on Streamlit versions without tab state
+    every tab stays open and renders as before.
+    """
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        return st.tabs(labels)
+
+
+def is_open(tab):
+    """Whether a tab from lazy_tabs is selected (always True without tab state)"""
+    return getattr(tab, "open", None) is not False
@@ -0,0 +1,250 @@
+import numpy as np
+from datetime import datetime
+from typing import List, Dict, Optional, Union
+
+from utils.batches import ProgressBatch
+from utils.progress_parser import canonical_subject
+
+# Topics whose recent average is below this score (%) are flagged
+DEFAULT_THRESHOLD = 80
+
+# Number of most recent scores in a topic's rolling mean
+ROLLING_WINDOW = 3
+
+_SECONDS_PER_WEEK = 7 * 24 * 3600
+
+# Scores spread over less time than this (in weeks) get a flat trend
+MIN_TREND_SPAN_WEEKS = 1 / 7
+
+
+def _isoformat(seconds):
+    """ISO string for seconds since the epoch, in the timestamps' own (naive) time"""
+    return np.datetime64(round(seconds * 1e6), "us").astype(datetime).isoformat()
+
+
+def _group_slopes(group_codes, x, y, n_groups):
+    """Least-squares slope of y over x for every group at once"""
+    n = np.bincount(group_codes, minlength=n_groups).astype(np.float64)
+    sx = np.bincount(group_codes, weights=x, minlength=n_groups)
+    sy = np.bincount(group_codes, weights=y, minlength=n_groups)
+    sxx = np.bincount(group_codes, weights=x * x, minlength=n_groups)
+    sxy = np.bincount(group_codes, weights=x * y, minlength=n_groups)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0)
+    return slopes
+
+
+def analyze_progress_history(
+    history: Union[ProgressBatch, List],
+    plan_hours: Optional[Dict[str, float]] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    window: int = ROLLING_WINDOW
+) -> Dict:
+    """Compute progress analytics over a student's full Progress history
+
+    Args:
+        history: A ProgressBatch, or Progress records (objects or dicts), in any order
+        plan_hours: Planned study hours per subject per week
+        threshold: Score (%) under which a topic is flagged
+        window: Number of most recent scores in each topic's rolling mean
+
+    Returns:
+        dict: Completion rate, hours per subject versus plan, score trends per
+        topic (mean, latest, rolling mean, slope per week) and flagged topics
+    """
+    batch = history if isinstance(history, ProgressBatch) else ProgressBatch.from_rows(history)
+    if not len(batch):
+        return {"entries": 0, "completion_rate": None, "hours_by_subject": {}, "score_trends": {}, "flagged_topics": []}
+
+    ts = batch.seconds()
+    start, end = np.nanmin(ts), np.nanmax(ts)
+    weeks = max((end - start) / _SECONDS_PER_WEEK, 1.0)
+
+    # Task completion
+    total_tasks = int(batch.tasks_total.sum())
+    done_tasks = int(batch.tasks_done.sum())
+
+    # Hours per subject versus plan
+    plan = {canonical_subject(k): float(v) for k, v in (plan_hours or {}).items()}
+    hours_by_subject = {}
+    if batch.subjects:
+        subjects = batch.subjects
+        totals = batch.minutes_by_subject() / 60
+        for k in np.argsort(subjects):
+            subject = subjects[k]
+            weekly = totals[k] / weeks
+            planned = plan.get(subject)
+            hours_by_subject[subject] = {
+                "total_hours": round(float(totals[k]), 2),
+                "weekly_hours": round(float(weekly), 2),
+                "planned_weekly_hours": planned,
+                "adherence": round(float(weekly / planned), 3) if planned else None
+            }
+    for subject, planned in plan.items():
+        hours_by_subject.setdefault(subject, {
+            "total_hours": 0.0,
+            "weekly_hours": 0.0,
+            "planned_weekly_hours": planned,
+            "adherence": 0.0
+        })
+
+    # Score trends per topic
+    score_trends = {}
+    flagged = []
+    valid = ~np.isnan(batch.score)
+    if valid.any():
+        topic_codes, topics = batch.score_labels(("topic", "subject", "title"))
+        topic_codes = topic_codes[valid]
+        n_topics = len(topics)
+        x = (ts[batch.score_entry[valid]] - start) / _SECONDS_PER_WEEK
+        y = batch.score[valid]
+        record_of = np.flatnonzero(valid)
+        score_subjects, subject_labels = batch.score_fields["subject"]
+
+        # Sort by topic, then time, so each topic's last rows are its most recent scores
+        order = np.lexsort((x, topic_codes))
+        topic_codes, x, y, record_of = topic_codes[order], x[order], y[order], record_of[order]
+
+        counts = np.bincount(topic_codes, minlength=n_topics)
+        present = counts > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.bincount(topic_codes, weights=y, minlength=n_topics) / counts
+        slopes = _group_slopes(topic_codes, x, y, n_topics)
+
+        ends = np.cumsum(counts)
+        last = np.maximum(ends - 1, 0)
+        first = np.minimum(ends - counts, len(x) - 1)
+        slopes[x[last] - x[first] < MIN_TREND_SPAN_WEEKS] = 0.0
+        position_from_end = ends[topic_codes] - np.arange(len(topic_codes))
+        recent = position_from_end <= window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rolling = (
+                np.bincount(topic_codes[recent], weights=y[recent], minlength=n_topics)
+                / np.bincount(topic_codes[recent], minlength=n_topics)
+            )
+
+        for k in sorted(np.flatnonzero(present), key=lambda k: topics[k]):
+            topic = topics[k]
+            trend = {
+                "subject": subject_labels[score_subjects[record_of[last[k]]]],
+                "count": int(counts[k]),
+                "mean": round(float(means[k]), 1),
+                "latest": round(float(y[last[k]]), 1),
+                "rolling_mean": round(float(rolling[k]), 1),
+                "slope_per_week": round(float(slopes[k]), 2)
+            }
+            score_trends[topic] = trend
+            if trend["rolling_mean"] < threshold:
+                flagged.append({"topic": topic, **trend})
+
+    flagged.sort(key=lambda t: t["rolling_mean"])
+
+    return {
+        "entries": len(batch),
+        "period": {
+            "start": _isoformat(start),
+            "end": _isoformat(end),
+            "weeks": round(float(weeks), 1)
+        },
+        "completion_rate": round(done_tasks / total_tasks, 3) if total_tasks else None,
+        "tasks": {"completed": done_tasks, "total": total_tasks},
+        "hours_by_subject": hours_by_subject,
+        "score_trends": score_trends,
+        "flagged_topics": flagged,
+        "threshold": threshold
+    }
+
+
+def render_progress_report(result: Dict) -> str:
+    """Render analytics from analyze_progress_history as markdown"""
+    if not result.get("entries"):
+        return "## Progress History\nNo progress updates recorded yet."
+
+    lines = [
+        "## Progress History",
+        f"{result['entries']} updates over {result['period']['weeks']} weeks."
+    ]
+
+    if result["completion_rate"] is not None:
+        lines.append(
+            f"\n**Task completion:** {result['completion_rate']:.0%} "
+            f"({result['tasks']['completed']} of {result['tasks']['total']} tasks)"
+        )
+
+    if result["hours_by_subject"]:
+        lines.append("\n### Study Hours vs Plan\n| Subject | Hours/Week | Planned | Adherence |\n|---|---|---|---|")
+        for subject, h in result["hours_by_subject"].items():
+            planned = f"{h['planned_weekly_hours']:.1f}" if h["planned_weekly_hours"] else "-"
+            adherence = f"{h['adherence']:.0%}" if h["adherence"] is not None else "-"
+            lines.append(f"| {subject} | {h['weekly_hours']:.1f} | {planned} | {adherence} |")
+
+    if result["score_trends"]:
+        lines.append("\n### Score Trends\n| Topic | Assessments | Recent Avg | Trend/Week |\n|---|---|---|---|")
+        for topic, t in result["score_trends"].items():
+            arrow = "📈" if t["slope_per_week"] > 0.5 else "📉" if t["slope_per_week"] < -0.5 else "➡️"
+            lines.append(f"| {topic} | {t['count']} | {t['rolling_mean']:.1f}% | {arrow} {t['slope_per_week']:+.1f} |")
+
+    if result["flagged_topics"]:
+        lines.append(f"\n### Topics Below {result['threshold']}%")
+        for t in result["flagged_topics"]:
+            lines.append(f"- **{t['topic']}**: recent average {t['rolling_mean']:.1f}% ({t['slope_per_week']:+.1f} per week)")
+
+    return "\n".join(lines)
+
+
+def weekly_progress(batch: ProgressBatch) -> List[Dict]:
+    """Aggregate progress updates into calendar weeks (Monday to Sunday), oldest first
+
+    Returns:
+        list: One dict per week with updates, shaped like the weekly_data
+        entries of the parent dashboard (study and subject hours, tasks,
+        average score and the change from the previous week)
+    """
+    dated = ~np.isnat(batch.updated_at)
+    if not dated.any():
+        return []
+    days = batch.updated_at.astype("datetime64[D]")
+    # 1970-01-01 was a Thursday, so Mondays are 3 days before a multiple of 7
+    monday = days - (days.astype(np.int64) + 3) % 7
+    weeks, week_codes = np.unique(monday[dated], return_inverse=True)
+    n_weeks = len(weeks)
+
+    minutes = np.nan_to_num(batch.minutes[dated])
+    subject_hours = np.stack([
+        np.bincount(week_codes, weights=minutes[:, k], minlength=n_weeks) / 60 for k in range(len(batch.subjects))
+    ], axis=1) if batch.subjects else np.zeros((n_weeks, 0))
+    tasks_done = np.bincount(week_codes, weights=batch.tasks_done[dated], minlength=n_weeks)
+    tasks_total = np.bincount(week_codes, weights=batch.tasks_total[dated], minlength=n_weeks)
+
+    row_week = np.full(len(batch), -1)
+    row_week[dated] = week_codes
+    score_week = row_week[batch.score_entry]
+    scored = (score_week >= 0) & ~np.isnan(batch.score)
+    score_counts = np.bincount(score_week[scored], minlength=n_weeks)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_scores = np.bincount(score_week[scored], weights=batch.score[scored], minlength=n_weeks) / score_counts
+
+    result = []
+    previous = None
+    for w in range(n_weeks):
+        week = {
+            "week": w + 1,
+            "week_of": str(weeks[w]),
+            "subject_hours": {
+                subject: round(float(subject_hours[w, k]), 1)
+                for k, subject in enumerate(batch.subjects) if subject_hours[w, k]
+            },
+            "study_hours": round(float(subject_hours[w].sum()), 1),
+            "tasks_completed": int(tasks_done[w]),
+            "total_tasks": int(tasks_total[w]),
+            "avg_score": round(float(avg_scores[w]), 1) if score_counts[w] else None
+        }
+        if previous is not None:
+            week["study_hours_change"] = round(week["study_hours"] - previous["study_hours"], 1)
+            week["tasks_completed_change"] = week["tasks_completed"] - previous["tasks_completed"]
+            if week["avg_score"] is not None and previous["avg_score"] is not None:
+                week["avg_score_change"] = round(week["avg_score"] - previous["avg_score"], 1)
+        result.append(week)
+        previous = week
+    return result
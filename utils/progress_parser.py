@@ -0,0 +1,231 @@
+import re
+import sys
+from typing import List, Dict, Optional, Any
+from utils.data_models import Progress
+
+# Common shorthand students type for subject names
+SUBJECT_ALIASES = {
+    "math": "Mathematics",
+    "maths": "Mathematics",
+    "mathematics": "Mathematics",
+    "phy": "Physics",
+    "phys": "Physics",
+    "physics": "Physics",
+    "chem": "Chemistry",
+    "chemistry": "Chemistry",
+    "bio": "Biology",
+    "biology": "Biology",
+    "sci": "Science",
+    "science": "Science"
+}
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_CHECKBOX = re.compile(r"^\[(?P<mark>[ xX✓])\]\s*")
+# One part of a duration; "1h30m" and "1 hr 30 min" are two consecutive parts
+_DURATION = re.compile(
+    r"\s*(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>hours?|hrs?|h|minutes?|mins?|m)?(?![a-z])",
+    re.IGNORECASE
+)
+_SEPARATOR = re.compile(r"\s*(?::|\s[-–]\s)\s*")
+_SUBJECT_HEADING = re.compile(r"^\s*[-*]\s*\*\*(?P<subject>[^*:]+):?\*\*")
+_DAILY_HOURS = re.compile(r"\((?P<hours>\d+(?:\.\d+)?)\s*hours?\s*(?:/|per\s+)day\)", re.IGNORECASE)
+_SCORE = re.compile(
+    r"(?P<score>\d+(?:\.\d+)?)\s*(?:%|(?:/|out of)\s*(?P<max>\d+(?:\.\d+)?))?",
+    re.IGNORECASE
+)
+
+
+def canonical_subject(name):
+    """Normalize a subject name ("maths" -> "Mathematics") and intern it"""
+    name = name.strip().strip(":-").strip()
+    canonical = SUBJECT_ALIASES.get(name.lower(), name.title() if name.islower() else name)
+    return sys.intern(canonical)
+
+
+def _entries(text):
+    """Split free text into entries on newlines, semicolons and commas"""
+    if not text:
+        return []
+    entries = []
+    for line in re.split(r"[\n;]", text):
+        # Commas separate entries only when each part carries its own number
+        parts = [p for p in line.split(",") if p.strip()]
+        if len(parts) > 1 and all(re.search(r"\d", p) for p in parts):
+            entries.extend(parts)
+        else:
+            entries.append(line)
+    return [_LIST_MARKER.sub("", e).strip() for e in entries if e.strip()]
+
+
+def _split_label(entry, value_pattern):
+    """Split "Label: value" / "Label - value" into its two parts
+
+    Labels may contain numbers ("Chapter 5 Physics - 2h") and values may
+    contain separators ("Quiz 1: 85% - good"), so the split is at the first
+    separator followed by something value_pattern finds, else at the last.
+    """
+    separators = [m for m in _SEPARATOR.finditer(entry) if entry[:m.start()].strip()]
+    for separator in separators:
+        if value_pattern.search(entry, separator.end()):
+            return entry[:separator.start()].strip(), entry[separator.end():]
+    if separators:
+        return entry[:separators[-1].start()].strip(), entry[separators[-1].end():]
+    # "Math 4 hours": the label is everything before the first number
+    match = re.match(r"^(?P<label>\D*?)\s*(?P<value>\d.*)$", entry)
+    if match and match.group("label"):
+        return match.group("label"), match.group("value")
+    return None, entry
+
+
+def _duration_minutes(value):
+    """Minutes in the first duration of value, adding up its parts ("1h 30m"); amounts without a unit are hours"""
+    minutes = 0.0
+    match = _DURATION.search(value)
+    while match:
+        unit = (match.group("unit") or "h").lower()
+        amount = float(match.group("amount"))
+        minutes += amount if unit.startswith("m") else amount * 60
+        match = _DURATION.match(value, match.end())
+        # Only parts with a unit continue a duration ("2 hours 15" is 2 hours)
+        if match and not match.group("unit"):
+            break
+    return minutes
+
+
+def parse_time_spent(text):
+    """Parse "Math: 4 hours" style lines into minutes per subject
+
+    Args:
+        text: Free text such as "Math: 4 hours\\nScience: 1h 30m"
+
+    Returns:
+        Dict[str, int]: Minutes studied per (canonical) subject. Amounts without
+        a unit are taken as hours.
+    """
+    if isinstance(text, dict):
+        return {canonical_subject(k): int(v) for k, v in text.items()}
+
+    time_spent = {}
+    for entry in _entries(text):
+        label, value = _split_label(entry, _DURATION)
+        if not label:
+            continue
+        minutes = _duration_minutes(value)
+        if minutes:
+            subject = canonical_subject(label)
+            time_spent[subject] = time_spent.get(subject, 0) + int(round(minutes))
+    return time_spent
+
+
+def _match_subject(title, subjects):
+    """Find which known subject an assessment title refers to"""
+    words = re.findall(r"[A-Za-z]+", title.lower())
+    for word in words:
+        if word in SUBJECT_ALIASES:
+            return sys.intern(SUBJECT_ALIASES[word])
+    for subject in subjects:
+        if subject.lower() in title.lower():
+            return subject
+    return None
+
+
+def parse_assessment_results(text, subjects=None):
+    """Parse "Quiz 1: 85%" style lines into assessment records
+
+    Args:
+        text: Free text such as "Quiz 1: 85%\\nPhysics Test: 42/50"
+        subjects: Known subject names used to tag each assessment
+
+    Returns:
+        List[Dict]: One dict per assessment with title, subject (or None),
+        score (percent, 0-100) and the raw score / max score as entered
+    """
+    if isinstance(text, list):
+        return text
+
+    subjects = list(subjects or [])
+    results = []
+    for entry in _entries(text):
+        label, value = _split_label(entry, _SCORE)
+        match = _SCORE.search(value)
+        if not match:
+            continue
+        raw = float(match.group("score"))
+        max_score = float(match.group("max")) if match.group("max") else 100.0
+        if max_score <= 0:
+            continue
+        title = (label or entry[:match.start()]).strip() or f"Assessment {len(results) + 1}"
+        results.append({
+            "title": title,
+            "subject": _match_subject(title, subjects),
+            "score": round(raw / max_score * 100, 1),
+            "raw_score": raw,
+            "max_score": max_score
+        })
+    return results
+
+
+def parse_completed_tasks(text):
+    """Parse a task list into {task: completed}
+
+    Every listed task counts as completed unless it is an unchecked "[ ]" box.
+    """
+    if isinstance(text, dict):
+        return text
+
+    tasks = {}
+    for line in (text or "").splitlines():
+        line = _LIST_MARKER.sub("", line).strip()
+        if not line:
+            continue
+        completed = True
+        checkbox = _CHECKBOX.match(line)
+        if checkbox:
+            completed = checkbox.group("mark") != " "
+            line = line[checkbox.end():].strip()
+        if line:
+            tasks[line] = completed
+    return tasks
+
+
+def extract_planned_hours(roadmap_text):
+    """Read weekly planned hours per subject from a generated roadmap
+
+    Looks for "(N hours/day)" under "- **Subject:**" headings and uses the
+    first week that mentions each subject.
+
+    Returns:
+        Dict[str, float]: Planned hours per week per (canonical) subject
+    """
+    planned = {}
+    subject = None
+    for line in (roadmap_text or "").splitlines():
+        heading = _SUBJECT_HEADING.match(line)
+        if heading:
+            subject = canonical_subject(heading.group("subject"))
+            continue
+        daily = _DAILY_HOURS.search(line)
+        if daily and subject and subject not in planned:
+            planned[subject] = float(daily.group("hours")) * 7
+    return planned
+
+
+def build_progress(
+    student_id: str,
+    roadmap_id: Optional[str],
+    completed_tasks: Any,
+    time_spent: Any,
+    assessment_results: Any,
+    notes: str = None
+) -> Progress:
+    """Build a typed Progress record from the Progress Tracking form fields"""
+    time_by_subject = parse_time_spent(time_spent)
+    return Progress(
+        id=None,
+        student_id=student_id,
+        roadmap_id=roadmap_id,
+        completed_tasks=parse_completed_tasks(completed_tasks),
+        time_spent=time_by_subject,
+        assessment_results=parse_assessment_results(assessment_results, subjects=time_by_subject.keys()),
+        notes=notes
+    )
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+
+from utils.batches import DATA_DIR, SCORE_FIELDS, ProgressBatch
+
+# Arrow IPC export of every stored progress update, opened with memory mapping
+SNAPSHOT_FILE = os.getenv("PROGRESS_SNAPSHOT_FILE", os.path.join(DATA_DIR, 'snapshot_progress.arrow'))
+
+_METADATA_KEY = b'roadmap_ai'
+
+
+def _dictionary(codes, labels, order=None):
+    """Dictionary-encoded column; with order, the dictionary is labels[order] and codes are remapped to it"""
+    if order is not None:
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        codes, labels = rank[codes], [labels[k] for k in order]
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(labels, type=pa.string()))
+
+
+def _array(column):
+    """A table column as one array; a view when it is a single chunk, as written"""
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _codes(array):
+    """Codes and labels of a dictionary-encoded array (codes are a view)"""
+    return array.indices.to_numpy(zero_copy_only=False), array.dictionary.to_pylist()
+
+
+def snapshot_table(batch: ProgressBatch, created_at: Optional[datetime] = None) -> pa.Table:
+    """Arrow table of a ProgressBatch, one row per update, sorted by student then time
+
+    Student ids are dictionary-encoded with a sorted dictionary, so one
+    student's updates are a contiguous run of rows found by binary search.
+    Minutes per subject are a fixed-size list column (subjects in the
+    schema metadata) and scores a list of structs per update.
+    """
+    student_order = np.argsort(np.array([s or '' for s in batch.student_ids], dtype=object), kind='stable')
+    student_rank = np.empty(len(student_order), dtype=np.int64)
+    student_rank[student_order] = np.arange(len(student_order))
+    batch = batch.take(np.lexsort((batch.updated_at, student_rank[batch.student_codes])))
+
+    score_offsets = np.searchsorted(batch.score_entry, np.arange(len(batch) + 1)).astype(np.int32)
+    scores = pa.StructArray.from_arrays(
+        [pa.array(batch.score, type=pa.float64())] + [_dictionary(*batch.score_fields[f]) for f in SCORE_FIELDS],
+        names=['score', *SCORE_FIELDS]
+    )
+    columns = {
+        'id': pa.array(batch.ids, type=pa.string()),
+        'student_id': _dictionary(batch.student_codes, batch.student_ids, student_order),
+        'roadmap_id': _dictionary(batch.roadmap_codes, batch.roadmap_ids),
+        'updated_at': pa.array(batch.updated_at, type=pa.timestamp('us')),
+        'tasks_done': pa.array(batch.tasks_done, type=pa.int32()),
+        'tasks_total': pa.array(batch.tasks_total, type=pa.int32()),
+        'scores': pa.ListArray.from_arrays(pa.array(score_offsets), scores)
+    }
+    if batch.subjects:
+        # Arrow has no zero-width fixed-size lists, so the column is left out when no time was recorded
+        columns['minutes'] = pa.FixedSizeListArray.from_arrays(pa.array(batch.minutes.ravel()), len(batch.subjects))
+    metadata = {'subjects': batch.subjects, 'created_at': (created_at or datetime.now()).isoformat()}
+    return pa.table(columns, metadata={_METADATA_KEY: json.dumps(metadata)})
+
+
+def write_progress_snapshot(path: str = SNAPSHOT_FILE, data_dir: str = DATA_DIR) -> str:
+    """Export every stored progress update to an Arrow IPC file
+
+    The file is written next to the old one and swapped in, so processes
+    with the old snapshot mapped keep reading it until they reopen.
+
+    Returns:
+        str: The snapshot path
+    """
+    # Taken before reading, so updates saved during the export are newer than the snapshot
+    created_at = datetime.now()
+    table = snapshot_table(ProgressBatch.from_storage(data_dir=data_dir), created_at)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ProgressSnapshot:
+    """A memory-mapped progress snapshot
+
+    Columns stay in the mapped file and are shared by every process that
+    opens it through the page cache; slices by student and time are
+    zero-copy, and batch() wraps them as a ProgressBatch for the analytics.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_FILE):
+        self.path = path
+        stat = os.stat(path)
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        metadata = json.loads(self.table.schema.metadata[_METADATA_KEY])
+        self.subjects = metadata['subjects']
+        self.created_at = datetime.fromisoformat(metadata['created_at'])
+        self._student_codes, self.student_ids = _codes(_array(self.table.column('student_id')))
+        self._student_keys = np.array([s or '' for s in self.student_ids], dtype=object)
+        self._updated_at = _array(self.table.column('updated_at')).to_numpy(zero_copy_only=False)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def ids(self):
+        """Progress id of every row, in row order"""
+        return self.table.column('id').to_pylist()
+
+    def rows(self, student_id: Optional[str] = None, start: Optional[datetime] = None,
+             end: Optional[datetime] = None):
+        """Row range (lo, hi) of one student's updates, optionally those from start up to (not including) end"""
+        lo, hi = 0, len(self)
+        if student_id is not None:
+            code = int(np.searchsorted(self._student_keys, student_id))
+            if code == len(self.student_ids) or self.student_ids[code] != student_id:
+                return 0, 0
+            lo, hi = (int(i) for i in np.searchsorted(self._student_codes, [code, code + 1]))
+        elif start is not None or end is not None:
+            raise ValueError("Updates are only in time order within a student; pass student_id")
+        updated_at = self._updated_at[lo:hi]
+        first = int(np.searchsorted(updated_at, np.datetime64(start, 'us'))) if start is not None else 0
+        last = int(np.searchsorted(updated_at, np.datetime64(end, 'us'))) if end is not None else hi - lo
+        return lo + first, lo + max(first, last)
+
+    def slice(self, student_id: Optional[str] = None, start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> pa.Table:
+        """The rows from rows(), as a zero-copy slice of the mapped table"""
+        lo, hi = self.rows(student_id, start, end)
+        return self.table.slice(lo, hi - lo)
+
+    def batch(self, student_id: Optional[str] = None, start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> ProgressBatch:
+        """The rows from rows() as a ProgressBatch whose numeric columns are views of the mapped file"""
+        table = self.slice(student_id, start, end)
+        n = table.num_rows
+        if not n:
+            return ProgressBatch.from_rows([])
+        columns = {name: _array(table.column(name)) for name in table.column_names}
+
+        scores = columns['scores']
+        offsets = scores.offsets.to_numpy()
+        values = scores.flatten()
+        subjects = self.subjects
+        if 'minutes' in columns:
+            minutes = columns['minutes'].flatten().to_numpy(zero_copy_only=False).reshape(n, len(subjects))
+            recorded = ~np.isnan(minutes).all(axis=0)
+            if not recorded.all():
+                # Subjects nobody in the slice studied are dropped, as ProgressBatch.take does
+                subjects = [subject for subject, keep in zip(subjects, recorded) if keep]
+                minutes = minutes[:, recorded]
+        else:
+            minutes = np.full((n, 0), np.nan)
+        student_codes, student_ids = _codes(columns['student_id'])
+        roadmap_codes, roadmap_ids = _codes(columns['roadmap_id'])
+        return ProgressBatch(
+            ids=columns['id'].to_pylist(),
+            student_codes=student_codes,
+            student_ids=student_ids,
+            roadmap_codes=roadmap_codes,
+            roadmap_ids=roadmap_ids,
+            updated_at=columns['updated_at'].to_numpy(zero_copy_only=False),
+            tasks_done=columns['tasks_done'].to_numpy(zero_copy_only=False),
+            tasks_total=columns['tasks_total'].to_numpy(zero_copy_only=False),
+            subjects=subjects,
+            minutes=minutes,
+            score_entry=np.repeat(np.arange(n), np.diff(offsets)),
+            score=values.field('score').to_numpy(zero_copy_only=False),
+            score_fields={field: _codes(values.field(field)) for field in SCORE_FIELDS}
+        )
+
+    def current_batch(self, student_id: str, data_dir: str = DATA_DIR) -> ProgressBatch:
+        """batch(student_id) with the updates saved since the export read from their files instead
+
+        Finding those updates stats every stored progress file, so callers
+        should first check that the student saved progress after created_at.
+        """
+        exported_at = self.created_at.timestamp()
+        saved = {
+            entry.name[len('progress_'):-len('.json')]: entry.path
+            for entry in os.scandir(data_dir)
+            if entry.name.startswith('progress_') and entry.name.endswith('.json')
+            and entry.stat().st_mtime >= exported_at
+        } if os.path.exists(data_dir) else {}
+        batch = self.batch(student_id)
+        if not saved:
+            return batch
+        exported = batch.select(np.array([pid not in saved for pid in batch.ids], dtype=bool))
+        return ProgressBatch.concat([exported, ProgressBatch.from_files(saved.values()).for_student(student_id)])
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def open_progress_snapshot(path: str = SNAPSHOT_FILE) -> Optional[ProgressSnapshot]:
+    """The current snapshot, mapped once per process and reopened when the file is replaced"""
+    global _snapshot
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.path != path or _snapshot.version != (stat.st_mtime_ns, stat.st_size):
+            _snapshot = ProgressSnapshot(path)
+        return _snapshot
+
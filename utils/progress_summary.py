@@ -0,0 +1,199 @@
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Weight of the newest score in each topic's exponentially weighted average
+EWMA_ALPHA = 0.3
+
+# Number of most recent updates kept for windowed metrics
+RECENT_WINDOW = 8
+
+# Number of most recent weeks kept for the progress-over-time chart
+MAX_WEEKS = 52
+
+
+def _week_key(moment):
+    """ISO year-week label ("2025-W07") for a datetime"""
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class ProgressSummary:
+    """Running aggregates of a student's progress updates
+
+    Updated in O(1) per saved Progress record so dashboards never have to
+    scan the history.
+    """
+
+    def __init__(
+        self,
+        student_id: str,
+        entries: int = 0,
+        first_at: datetime = None,
+        last_at: datetime = None,
+        tasks_completed: int = 0,
+        tasks_total: int = 0,
+        minutes_by_subject: Dict[str, int] = None,
+        score_sum: float = 0.0,
+        score_count: int = 0,
+        scores_by_subject: Dict[str, Dict[str, float]] = None,
+        topics: Dict[str, Dict[str, Any]] = None,
+        weeks: Dict[str, Dict[str, float]] = None,
+        recent: List[Dict[str, Any]] = None
+    ):
+        self.student_id = student_id
+        self.entries = entries
+        self.first_at = first_at
+        self.last_at = last_at
+        self.tasks_completed = tasks_completed
+        self.tasks_total = tasks_total
+        self.minutes_by_subject = minutes_by_subject or {}
+        self.score_sum = score_sum
+        self.score_count = score_count
+        self.scores_by_subject = scores_by_subject or {}
+        self.topics = topics or {}
+        self.weeks = weeks or {}
+        self.recent = deque(recent or [], maxlen=RECENT_WINDOW)
+
+    def update(self, progress):
+        """Fold one Progress record into the aggregates"""
+        at = progress.updated_at or datetime.now()
+        self.entries += 1
+        self.first_at = min(self.first_at, at) if self.first_at else at
+        self.last_at = max(self.last_at, at) if self.last_at else at
+
+        # Tasks
+        done = sum(1 for completed in progress.completed_tasks.values() if completed)
+        self.tasks_completed += done
+        self.tasks_total += len(progress.completed_tasks)
+
+        # Study time
+        minutes = 0
+        for subject, subject_minutes in progress.time_spent.items():
+            self.minutes_by_subject[subject] = self.minutes_by_subject.get(subject, 0) + subject_minutes
+            minutes += subject_minutes
+
+        # Scores, per subject and per topic
+        scores = []
+        for assessment in progress.assessment_results:
+            score = assessment.get("score")
+            if score is None:
+                continue
+            scores.append(score)
+            subject = assessment.get("subject")
+            if subject:
+                totals = self.scores_by_subject.setdefault(subject, {"sum": 0.0, "count": 0})
+                totals["sum"] += score
+                totals["count"] += 1
+            topic = assessment.get("topic") or subject or assessment.get("title") or "General"
+            stats = self.topics.get(topic)
+            if stats is None:
+                self.topics[topic] = {"ewma": score, "latest": score, "count": 1, "subject": subject}
+            else:
+                stats["ewma"] = EWMA_ALPHA * score + (1 - EWMA_ALPHA) * stats["ewma"]
+                stats["latest"] = score
+                stats["count"] += 1
+        self.score_sum += sum(scores)
+        self.score_count += len(scores)
+
+        # Weekly buckets for the progress-over-time chart
+        week = self.weeks.setdefault(_week_key(at), {"score_sum": 0.0, "score_count": 0, "minutes": 0})
+        week["score_sum"] += sum(scores)
+        week["score_count"] += len(scores)
+        week["minutes"] += minutes
+        if len(self.weeks) > MAX_WEEKS:
+            del self.weeks[min(self.weeks)]
+
+        self.recent.append({
+            "at": at.isoformat(),
+            "minutes": minutes,
+            "average_score": round(sum(scores) / len(scores), 1) if scores else None,
+            "tasks_completed": done,
+            "tasks_total": len(progress.completed_tasks)
+        })
+        return self
+
+    @property
+    def average_score(self) -> Optional[float]:
+        return round(self.score_sum / self.score_count, 1) if self.score_count else None
+
+    @property
+    def completion_rate(self) -> Optional[float]:
+        return round(self.tasks_completed / self.tasks_total, 3) if self.tasks_total else None
+
+    def subject_scores(self) -> Dict[str, float]:
+        """Average score per subject"""
+        return {
+            subject: round(totals["sum"] / totals["count"], 1)
+            for subject, totals in sorted(self.scores_by_subject.items())
+            if totals["count"]
+        }
+
+    def weekly_hours(self) -> Dict[str, float]:
+        """Average study hours per week per subject since the first update"""
+        weeks = 1.0
+        if self.first_at and self.last_at:
+            weeks = max((self.last_at - self.first_at).days / 7, 1.0)
+        return {
+            subject: round(minutes / 60 / weeks, 1)
+            for subject, minutes in sorted(self.minutes_by_subject.items())
+        }
+
+    def performance_history(self) -> List[Dict[str, Any]]:
+        """Weekly average score and study hours, oldest week first"""
+        return [
+            {
+                "week": week,
+                "average_score": round(totals["score_sum"] / totals["score_count"], 1) if totals["score_count"] else None,
+                "hours": round(totals["minutes"] / 60, 1)
+            }
+            for week, totals in sorted(self.weeks.items())
+        ]
+
+    def week_over_week(self) -> Dict[str, Optional[float]]:
+        """Change in average score and study hours between the last two weeks"""
+        history = self.performance_history()
+        if len(history) < 2:
+            return {"average_score": None, "hours": None}
+        previous, current = history[-2], history[-1]
+        score_change = None
+        if current["average_score"] is not None and previous["average_score"] is not None:
+            score_change = round(current["average_score"] - previous["average_score"], 1)
+        return {"average_score": score_change, "hours": round(current["hours"] - previous["hours"], 1)}
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {
+            "student_id": self.student_id,
+            "entries": self.entries,
+            "first_at": self.first_at.isoformat() if self.first_at else None,
+            "last_at": self.last_at.isoformat() if self.last_at else None,
+            "tasks_completed": self.tasks_completed,
+            "tasks_total": self.tasks_total,
+            "minutes_by_subject": self.minutes_by_subject,
+            "score_sum": self.score_sum,
+            "score_count": self.score_count,
+            "scores_by_subject": self.scores_by_subject,
+            "topics": self.topics,
+            "weeks": self.weeks,
+            "recent": list(self.recent)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary"""
+        return cls(
+            student_id=data.get("student_id"),
+            entries=data.get("entries", 0),
+            first_at=datetime.fromisoformat(data["first_at"]) if data.get("first_at") else None,
+            last_at=datetime.fromisoformat(data["last_at"]) if data.get("last_at") else None,
+            tasks_completed=data.get("tasks_completed", 0),
+            tasks_total=data.get("tasks_total", 0),
+            minutes_by_subject=data.get("minutes_by_subject", {}),
+            score_sum=data.get("score_sum", 0.0),
+            score_count=data.get("score_count", 0),
+            scores_by_subject=data.get("scores_by_subject", {}),
+            topics=data.get("topics", {}),
+            weeks=data.get("weeks", {}),
+            recent=data.get("recent", [])
+        )
@@ -0,0 +1,189 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Trained weights, written by scripts/train_readiness_model.py
+MODEL_PATH = os.getenv("READINESS_MODEL_PATH", os.path.join("data", "models", "readiness_model.json"))
+
+# Inputs of the model, one row per (student, subject)
+FEATURES = [
+    "subject_score",
+    "topic_mean",
+    "topic_min",
+    "topic_spread",
+    "mastery_high_share",
+    "weekly_hours",
+    "trend_per_week"
+]
+
+# Subjects predicted below this readiness (%) get a recommendation
+RECOMMEND_BELOW = 75
+
+
+def _trend(history):
+    """Least-squares slope of average_score per week over performance_history"""
+    points = [(h.get('week'), h.get('average_score')) for h in history or []]
+    points = [(w, s) for w, s in points if isinstance(w, (int, float)) and s is not None]
+    if len(points) < 2:
+        return 0.0
+    x, y = np.array(points, dtype=np.float64).T
+    x = x - x.mean()
+    denominator = (x * x).sum()
+    return float((x * (y - y.mean())).sum() / denominator) if denominator else 0.0
+
+
+def _weekly_hours(student, subject):
+    weeks = [w.get('subject_hours', {}).get(subject) for w in student.get('weeks_data') or []]
+    weeks = [h for h in weeks if h is not None]
+    if weeks:
+        return float(np.mean(weeks))
+    study_hours = student.get('metrics', {}).get('study_hours')
+    subjects = student.get('subjects') or []
+    return float(study_hours) / len(subjects) if study_hours and subjects else np.nan
+
+
+def subject_features(student: Dict):
+    """Feature rows for each scored subject of a sample_data-shaped student record
+
+    Returns:
+        tuple: (subject names, float array of shape (n_subjects, len(FEATURES)) with NaN for unknowns)
+    """
+    trend = _trend(student.get('performance_history'))
+    names, rows = [], []
+    for subject in student.get('subjects') or []:
+        if not isinstance(subject, dict):
+            continue
+        topics = [t for t in subject.get('topics', []) if t.get('score') is not None]
+        scores = np.array([t['score'] for t in topics], dtype=np.float64)
+        subject_score = subject.get('score')
+        if subject_score is None and not len(scores):
+            continue
+        rows.append([
+            float(subject_score) if subject_score is not None else scores.mean(),
+            scores.mean() if len(scores) else np.nan,
+            scores.min() if len(scores) else np.nan,
+            np.ptp(scores) if len(scores) else np.nan,
+            np.mean([t.get('mastery') == 'High' for t in topics]) if topics else np.nan,
+            _weekly_hours(student, subject.get('name')),
+            trend
+        ])
+        names.append(subject.get('name', f'Subject {len(names) + 1}'))
+    return names, np.array(rows, dtype=np.float64).reshape(len(rows), len(FEATURES))
+
+
+class ReadinessModel:
+    """Ridge regression from subject features to predicted exam readiness (0-100)"""
+
+    def __init__(self, weights, bias, means, scales, alpha=1.0, metrics=None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.scales = np.asarray(scales, dtype=np.float64)
+        self.alpha = alpha
+        self.metrics = metrics or {}
+
+    @classmethod
+    def fit(cls, X, y, alpha=1.0):
+        """Fit on standardized features; missing values are imputed with the training mean"""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        means = np.nanmean(X, axis=0)
+        scales = np.nanstd(X, axis=0)
+        scales[scales == 0] = 1.0
+        Z = np.nan_to_num((X - means) / scales)
+        bias = y.mean()
+        weights = np.linalg.solve(Z.T @ Z + alpha * np.eye(Z.shape[1]), Z.T @ (y - bias))
+        return cls(weights, bias, means, scales, alpha)
+
+    def predict(self, X) -> np.ndarray:
+        """Predicted readiness for each feature row, clipped to 0-100"""
+        Z = np.nan_to_num((np.asarray(X, dtype=np.float64) - self.means) / self.scales)
+        return np.clip(Z @ self.weights + self.bias, 0, 100)
+
+    def predict_students(self, students: List[Dict]) -> List[Optional[Dict]]:
+        """Exam readiness for many students with a single matrix product
+
+        Returns:
+            List[Dict]: Per student, {'overall', 'by_subject', 'recommendations'}
+            in the shape the teacher view expects, or None without scored subjects
+        """
+        features = [subject_features(s) for s in students]
+        rows = [matrix for _, matrix in features]
+        predictions = self.predict(np.vstack(rows)) if rows else np.empty(0)
+
+        results = []
+        offset = 0
+        for (names, matrix), student in zip(features, students):
+            scores = predictions[offset:offset + len(names)]
+            offset += len(names)
+            if not names:
+                results.append(None)
+                continue
+            by_subject = {name: round(float(score), 1) for name, score in zip(names, scores)}
+            results.append({
+                'overall': round(float(scores.mean()), 1),
+                'by_subject': by_subject,
+                'recommendations': _recommendations(student, by_subject)
+            })
+        return results
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {
+            "features": FEATURES,
+            "weights": self.weights.tolist(),
+            "bias": self.bias,
+            "means": self.means.tolist(),
+            "scales": self.scales.tolist(),
+            "alpha": self.alpha,
+            "metrics": self.metrics
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary"""
+        if data.get("features") != FEATURES:
+            raise ValueError("Readiness model was trained on different features; retrain it")
+        return cls(data["weights"], data["bias"], data["means"], data["scales"], data.get("alpha", 1.0), data.get("metrics"))
+
+    def save(self, path=MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _recommendations(student, by_subject):
+    """Recommendations for the subjects furthest from exam ready"""
+    topics_by_subject = {
+        s.get('name'): s.get('topics', []) for s in student.get('subjects') or [] if isinstance(s, dict)
+    }
+    recommendations = []
+    for subject, readiness in sorted(by_subject.items(), key=lambda item: item[1]):
+        if readiness >= RECOMMEND_BELOW:
+            break
+        weakest = sorted(
+            (t for t in topics_by_subject.get(subject, []) if t.get('score') is not None),
+            key=lambda t: t['score']
+        )[:2]
+        focus = ", ".join(f"{t.get('name')} ({t['score']}%)" for t in weakest)
+        recommendations.append({
+            'title': f"Strengthen {subject}",
+            'details': f"Predicted readiness {readiness:.0f}%." + (f" Start with {focus}." if focus else "")
+        })
+    return recommendations
+
+
+@lru_cache(maxsize=1)
+def get_readiness_model() -> Optional[ReadinessModel]:
+    """Load the trained model once per process, or None if it has not been trained"""
+    if not os.path.exists(MODEL_PATH):
+        return None
+    return ReadinessModel.load(MODEL_PATH)
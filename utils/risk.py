@@ -0,0 +1,260 @@
+import heapq
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.state import DataStore
+
+# Per-student risk inputs from the progress summaries, kept as columns in one file
+RISK_INPUTS_FILE = 'data/storage/risk_inputs.npz'
+
+# Weight of each risk signal in the combined score
+RISK_WEIGHTS = {
+    "adherence": 0.35,
+    "trend": 0.25,
+    "inactivity": 0.25,
+    "missed": 0.15
+}
+
+# Students scoring at or above this (0-100) are considered at risk
+RISK_THRESHOLD = 50
+
+# Points of weekly average score lost at which the trend signal saturates
+TREND_SATURATION = 10
+
+# Days without activity at which the inactivity signal saturates
+INACTIVE_DAYS = 14
+
+# Missed assessments at which the missed-assessment signal saturates
+MISSED_SATURATION = 3
+
+RISK_LABELS = {
+    "adherence": "behind plan",
+    "trend": "score drop",
+    "inactivity": "inactivity",
+    "missed": "missed assessments"
+}
+
+RISK_REASONS = {
+    "adherence": "Falling behind the study plan",
+    "trend": "Scores are dropping",
+    "inactivity": "Inactive recently",
+    "missed": "Missed assessments"
+}
+
+
+def _number(value):
+    return np.nan if value is None else float(value)
+
+
+class RiskInputs:
+    """What the risk scores need from each student's progress summary, as columns
+
+    One row per student with a summary: task completion rate and the change
+    in average score over the last two weeks (NaN when unknown). version is
+    the summaries log position the columns are current up to, so refresh()
+    only reads the summaries saved since.
+    """
+
+    def __init__(self, student_ids=(), completion_rate=None, score_change=None, version=0):
+        self.student_ids = list(student_ids)
+        self.index = {student_id: i for i, student_id in enumerate(self.student_ids)}
+        self.completion_rate = np.asarray(completion_rate if completion_rate is not None else [], dtype=np.float64)
+        self.score_change = np.asarray(score_change if score_change is not None else [], dtype=np.float64)
+        self.version = version
+
+    @classmethod
+    def load(cls, path: str = RISK_INPUTS_FILE) -> 'RiskInputs':
+        """Read the columns from their file, or start empty if there is none"""
+        try:
+            with np.load(path) as data:
+                return cls(data['student_ids'].tolist(), data['completion_rate'], data['score_change'], int(data['version']))
+        except (FileNotFoundError, KeyError, ValueError):
+            return cls()
+
+    def save(self, path: str = RISK_INPUTS_FILE):
+        """Write the columns to a temp file and swap it in, so readers never see half a file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+        np.savez(
+            tmp_path,
+            student_ids=np.array(self.student_ids, dtype=str),
+            completion_rate=self.completion_rate,
+            score_change=self.score_change,
+            version=self.version
+        )
+        os.replace(tmp_path, path)
+
+    def refresh(self) -> bool:
+        """Read the summaries saved since version into the columns; returns whether any were"""
+        if DataStore.get_summaries_version() < self.version:
+            # The log was removed or replaced, so every summary is read again
+            self.__init__()
+        changed, version = DataStore.get_summaries_saved_since(self.version)
+        if not changed:
+            self.version = version
+            return False
+        new_ids = [student_id for student_id in changed if student_id not in self.index]
+        for student_id in new_ids:
+            self.index[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+        self.completion_rate = np.concatenate([self.completion_rate, np.full(len(new_ids), np.nan)])
+        self.score_change = np.concatenate([self.score_change, np.full(len(new_ids), np.nan)])
+        for student_id in changed:
+            summary = DataStore.get_progress_summary(student_id)
+            i = self.index[student_id]
+            self.completion_rate[i] = _number(summary.completion_rate if summary else None)
+            self.score_change[i] = _number(summary.week_over_week()['average_score'] if summary else None)
+        self.version = version
+        return True
+
+    def lookup(self, student_ids):
+        """Completion rate and score change for each given id, NaN for students without a summary"""
+        rows = np.fromiter((self.index.get(i, -1) for i in student_ids), dtype=np.int64, count=len(student_ids))
+        found = rows >= 0
+        completion_rate = np.full(len(rows), np.nan)
+        score_change = np.full(len(rows), np.nan)
+        completion_rate[found] = self.completion_rate[rows[found]]
+        score_change[found] = self.score_change[rows[found]]
+        return completion_rate, score_change
+
+
+_risk_inputs = None
+_risk_inputs_lock = threading.Lock()
+
+
+def get_risk_inputs(version=None) -> RiskInputs:
+    """The risk inputs, loaded once per process and brought up to date with the summaries log
+
+    Only summaries saved since the stored columns are read, and the columns
+    are written back so other processes start from them.
+    """
+    global _risk_inputs
+    if version is None:
+        version = DataStore.get_summaries_version()
+    with _risk_inputs_lock:
+        if _risk_inputs is None:
+            _risk_inputs = RiskInputs.load()
+        if _risk_inputs.version != version and _risk_inputs.refresh():
+            _risk_inputs.save()
+        return _risk_inputs
+
+
+def _signals(students, inputs, today):
+    """Raw inputs per student: adherence (0-1), score change per week, idle days, missed assessments"""
+    completion_rate, score_change = inputs.lookup([student.get('id') for student in students])
+    plan_adherence, trend, missed = [], [], []
+    for student in students:
+        metrics = student.get('metrics', {})
+        plan_adherence.append(_number(student.get('plan_adherence', metrics.get('plan_adherence'))))
+        trend.append(_number(student.get('avg_score_change', metrics.get('score_trend'))))
+        value = student.get('missed_assessments', metrics.get('missed_assessments'))
+        missed.append(len(value) if isinstance(value, list) else _number(value))
+
+    # Summaries win over the values on the roster
+    adherence = np.where(np.isnan(completion_rate), np.asarray(plan_adherence, dtype=np.float64) / 100, completion_rate)
+    trend = np.where(np.isnan(score_change), np.asarray(trend, dtype=np.float64), score_change)
+
+    last_active = pd.to_datetime(
+        [student.get('last_active') for student in students],
+        format='%Y-%m-%d',
+        errors='coerce'
+    )
+    idle_days = (pd.Timestamp(today) - last_active).days.to_numpy(dtype=np.float64, na_value=np.nan)
+    return adherence, trend, idle_days, np.asarray(missed, dtype=np.float64)
+
+
+def _roster_key(students):
+    """What identifies a roster for caching: its student ids, in order"""
+    return tuple(student.get('id') for student in students)
+
+
+class RiskScores:
+    """At-risk scores for a whole roster, computed in one vectorized batch
+
+    Each signal is scaled to 0-1; the score is the weighted mean of the
+    signals known for a student (unknown signals are left out rather than
+    counted as zero), times 100.
+    """
+
+    def __init__(self, students: List[Dict], inputs: Optional[RiskInputs] = None, today=None, version=None):
+        self.students = students
+        self.size = len(students)
+        self.key = _roster_key(students)
+        self.version = version
+        self.today = today or datetime.now().date()
+        if inputs is None:
+            inputs = get_risk_inputs(version)
+
+        adherence, trend, idle_days, missed = _signals(students, inputs, self.today)
+        self.components = {
+            "adherence": np.clip(1 - adherence, 0, 1),
+            "trend": np.clip(-trend / TREND_SATURATION, 0, 1),
+            "inactivity": np.clip(idle_days / INACTIVE_DAYS, 0, 1),
+            "missed": np.clip(missed / MISSED_SATURATION, 0, 1)
+        }
+
+        names = list(RISK_WEIGHTS)
+        signals = np.column_stack([self.components[name] for name in names]) if self.size else np.empty((0, len(names)))
+        weights = np.array([RISK_WEIGHTS[name] for name in names])
+        known = ~np.isnan(signals)
+        weighted = np.where(known, signals, 0.0) @ weights
+        total_weight = known @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.score = np.where(total_weight > 0, weighted / total_weight * 100, 0.0)
+
+        # Students flagged by hand stay at the top
+        flagged = np.fromiter((bool(s.get('at_risk', False)) for s in students), dtype=bool, count=self.size)
+        self.score[flagged] = 100.0
+
+        # The signal contributing most to each score explains it
+        contribution = np.where(known, signals, 0.0) * weights
+        self.main_signal = [names[k] for k in contribution.argmax(axis=1)] if self.size else []
+
+    def matches(self, students: List[Dict], version=None) -> bool:
+        """Whether these scores are still valid for the roster (by student ids) and stored summaries"""
+        return (
+            version == self.version
+            and datetime.now().date() == self.today
+            and len(students) == self.size
+            and _roster_key(students) == self.key
+        )
+
+    def top_at_risk(self, k: int = 10, threshold: float = RISK_THRESHOLD) -> List[Dict]:
+        """The k highest-risk students at or above the threshold, highest first
+
+        Uses a heap over the candidates, so the roster is never fully sorted.
+        """
+        candidates = np.flatnonzero(self.score >= threshold)
+        top = heapq.nlargest(k, candidates, key=self.score.__getitem__)
+        return [self.explain(i) for i in top]
+
+    def explain(self, i: int) -> Dict:
+        """A student's dict with risk_score, risk_reason and risk_details filled in"""
+        student = self.students[i]
+        signal = self.main_signal[i]
+        details = ", ".join(
+            f"{RISK_LABELS[name]} {self.components[name][i]:.0%}"
+            for name in RISK_WEIGHTS
+            if not np.isnan(self.components[name][i])
+        )
+        return {
+            **student,
+            'risk_score': round(float(self.score[i]), 1),
+            'risk_reason': student.get('risk_reason') or RISK_REASONS[signal],
+            'risk_details': student.get('risk_details') or f"Risk score {self.score[i]:.0f}/100 ({details})"
+        }
+
+
+def get_risk_scores(state, students: List[Dict]) -> RiskScores:
+    """Get the roster's risk scores from session state, recomputing only when inputs change"""
+    version = DataStore.get_summaries_version()
+    scores = state.get('student_risk')
+    if scores is None or not scores.matches(students, version):
+        scores = RiskScores(students, version=version)
+        state.student_risk = scores
+    return scores
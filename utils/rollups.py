@@ -0,0 +1,217 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.batches import ProgressBatch
+from utils.progress_snapshot import open_progress_snapshot
+
+# Materialized class-wide views for the teacher Performance Analytics tab
+ROLLUPS_FILE = 'data/storage/rollups.json'
+
+# Progress file id -> modification time of every update already folded into the rollups
+ROLLUPS_INDEX_FILE = 'data/storage/rollups_index.json'
+
+# Seconds before get_class_rollups checks for new progress updates
+ROLLUP_REFRESH_S = float(os.getenv("ROLLUP_REFRESH_S", "300"))
+
+_PROGRESS_PREFIX = 'progress_'
+
+
+def _week_label(timestamps):
+    """ISO year-week labels ("2025-W07") for a Series of timestamps"""
+    iso = timestamps.dt.isocalendar()
+    return iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+
+
+def _assessment_frame(batch):
+    """One row per scored assessment: week, subject, topic, score"""
+    subject_codes, subjects = batch.score_labels(("subject",))
+    topic_codes, topics = batch.score_labels(("topic", "title", "subject"))
+    updated_at = batch.updated_at[batch.score_entry]
+    keep = ~np.isnan(batch.score) & ~np.isnat(updated_at)
+    frame = pd.DataFrame({
+        "subject": pd.Categorical.from_codes(subject_codes[keep], categories=subjects),
+        "topic": pd.Categorical.from_codes(topic_codes[keep], categories=topics),
+        "score": batch.score[keep]
+    })
+    frame["week"] = _week_label(pd.Series(updated_at[keep]))
+    return frame
+
+
+def _accumulate(totals, grouped):
+    """Add grouped (sum, count) rows into a nested {key: ... {key: [sum, count]}} dict"""
+    for keys, row in grouped.iterrows():
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        node = totals
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        bucket = node.setdefault(keys[-1], [0.0, 0])
+        bucket[0] += float(row["sum"])
+        bucket[1] += int(row["count"])
+
+
+def _average(bucket):
+    return round(bucket[0] / bucket[1], 1) if bucket[1] else None
+
+
+class ClassRollups:
+    """Sums and counts of assessment scores per week, subject and topic across all students"""
+
+    def __init__(self, weeks=None, subjects=None, topics=None, students=None, refreshed_at=None):
+        self.weeks = weeks or {}
+        self.subjects = subjects or {}
+        self.topics = topics or {}
+        self.students = students or {}
+        self.refreshed_at = refreshed_at
+
+    def add(self, progress: Union[ProgressBatch, List[Dict]]):
+        """Fold progress updates (a ProgressBatch, or dicts) into the rollups in one vectorized pass"""
+        batch = progress if isinstance(progress, ProgressBatch) else ProgressBatch.from_rows(progress)
+        for student_id, count in batch.updates_per_student().items():
+            self.students[student_id] = self.students.get(student_id, 0) + count
+
+        frame = _assessment_frame(batch)
+        if frame.empty:
+            return self
+        aggregations = {"sum": ("score", "sum"), "count": ("score", "count")}
+        _accumulate(self.weeks, frame.groupby("week").agg(**aggregations))
+        _accumulate(self.subjects, frame.groupby(["subject", "week"], observed=True).agg(**aggregations))
+        _accumulate(self.topics, frame.groupby(["subject", "topic"], observed=True).agg(**aggregations))
+        return self
+
+    def performance_data(self):
+        """Class averages in the shape render_performance_analytics expects"""
+        return {
+            "overall": [
+                {"week": week, "avg_score": _average(bucket)}
+                for week, bucket in sorted(self.weeks.items())
+            ],
+            "by_subject": {
+                subject: [
+                    {"week": week, "avg_score": _average(bucket)}
+                    for week, bucket in sorted(weeks.items())
+                ]
+                for subject, weeks in sorted(self.subjects.items())
+            }
+        }
+
+    def topics_performance(self):
+        """Average score per topic, grouped by subject"""
+        return {
+            subject: [
+                {"topic": topic, "avg_score": _average(bucket), "assessments": bucket[1]}
+                for topic, bucket in sorted(topics.items())
+            ]
+            for subject, topics in sorted(self.topics.items())
+        }
+
+    def to_dict(self):
+        """Convert to dictionary for serialization, with the derived views materialized"""
+        return {
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+            "weeks": self.weeks,
+            "subjects": self.subjects,
+            "topics": self.topics,
+            "students": self.students,
+            "available_subjects": sorted(self.subjects),
+            "performance_data": self.performance_data(),
+            "topics_performance": self.topics_performance()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary"""
+        return cls(
+            weeks=data.get("weeks", {}),
+            subjects=data.get("subjects", {}),
+            topics=data.get("topics", {}),
+            students=data.get("students", {}),
+            refreshed_at=datetime.fromisoformat(data["refreshed_at"]) if data.get("refreshed_at") else None
+        )
+
+
+def _progress_files(data_dir):
+    """Map of progress id -> modification time for every stored progress update"""
+    if not os.path.exists(data_dir):
+        return {}
+    return {
+        entry.name[len(_PROGRESS_PREFIX):-len('.json')]: entry.stat().st_mtime
+        for entry in os.scandir(data_dir)
+        if entry.name.startswith(_PROGRESS_PREFIX) and entry.name.endswith('.json')
+    }
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def refresh_class_rollups(full=False):
+    """Bring the materialized rollups up to date with stored progress
+
+    Only progress updates saved since the last refresh are read. A full
+    rebuild happens when requested, when no rollups exist yet, or when an
+    already counted update was edited (its old scores cannot be subtracted);
+    it starts from the progress snapshot, if one has been exported, and
+    reads only the files saved since.
+
+    Returns:
+        dict: The materialized rollups as written to ROLLUPS_FILE
+    """
+    data_dir = os.path.dirname(ROLLUPS_FILE)
+    files = _progress_files(data_dir)
+
+    index = {}
+    rollups = None
+    if not full and os.path.exists(ROLLUPS_FILE) and os.path.exists(ROLLUPS_INDEX_FILE):
+        with open(ROLLUPS_INDEX_FILE, 'r') as f:
+            index = json.load(f)
+        edited = any(files.get(pid, mtime) != mtime for pid, mtime in index.items())
+        if not edited:
+            with open(ROLLUPS_FILE, 'r') as f:
+                rollups = ClassRollups.from_dict(json.load(f))
+    if rollups is None:
+        index = {}
+        rollups = ClassRollups()
+        snapshot = open_progress_snapshot()
+        if snapshot is not None:
+            # Updates not saved since the snapshot was exported are read from it rather than their files
+            exported_at = snapshot.created_at.timestamp()
+            ids = snapshot.ids()
+            current = np.array([files.get(pid, exported_at) < exported_at for pid in ids], dtype=bool)
+            rollups.add(snapshot.batch().select(current))
+            index.update((pid, files[pid]) for pid, keep in zip(ids, current) if keep)
+
+    new_ids = [pid for pid in files if pid not in index]
+    rollups.add(ProgressBatch.from_files(
+        os.path.join(data_dir, f'{_PROGRESS_PREFIX}{pid}.json') for pid in new_ids
+    ))
+    index.update((pid, files[pid]) for pid in new_ids)
+    rollups.refreshed_at = datetime.now()
+
+    view = rollups.to_dict()
+    _write_json(ROLLUPS_FILE, view)
+    _write_json(ROLLUPS_INDEX_FILE, index)
+    return view
+
+
+def get_class_rollups(max_age_s=None):
+    """Load the materialized rollups, refreshing them first if they are stale
+
+    Args:
+        max_age_s: Seconds after which the rollups are refreshed (default ROLLUP_REFRESH_S)
+
+    Returns:
+        dict: performance_data, topics_performance and available_subjects for the teacher view
+    """
+    max_age_s = ROLLUP_REFRESH_S if max_age_s is None else max_age_s
+    if os.path.exists(ROLLUPS_FILE) and time.time() - os.path.getmtime(ROLLUPS_FILE) < max_age_s:
+        with open(ROLLUPS_FILE, 'r') as f:
+            return json.load(f)
+    return refresh_class_rollups()
@@ -0,0 +1,101 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Students without a last_active date sort as if last seen on this day
+DEFAULT_LAST_ACTIVE = '2025-01-01'
+
+# Sort options of the teacher Student Overview: (column, descending)
+SORT_KEYS = {
+    "Name": ("name", False),
+    "Progress (High to Low)": ("progress", True),
+    "Progress (Low to High)": ("progress", False),
+    "Last Active": ("last_active", True)
+}
+
+
+def subject_names(student: Dict) -> List[str]:
+    """A student's subject names; subjects may be names or sample_data-style dicts"""
+    return [s.get('name', '') if isinstance(s, dict) else s for s in student.get('subjects', [])]
+
+
+class Roster:
+    """Columnar copy of a teacher's student list for vectorized filtering and sorting
+
+    Dates are parsed once, each student's subjects are packed into a bitmask
+    and the sort orders are computed once and reused, so a rerun only does
+    array operations over the roster.
+    """
+
+    def __init__(self, students: List[Dict]):
+        self.students = students
+        self.size = len(students)
+
+        self.table = pd.DataFrame({
+            "name": [s.get('name', '') for s in students],
+            "progress": np.fromiter((s.get('progress', 0) for s in students), dtype=np.float64, count=self.size),
+            "last_active": pd.to_datetime(
+                [s.get('last_active') or DEFAULT_LAST_ACTIVE for s in students],
+                format='%Y-%m-%d',
+                errors='coerce'
+            ).fillna(pd.Timestamp(DEFAULT_LAST_ACTIVE))
+        })
+
+        # One bit per subject, in as many 64-bit words as there are subjects
+        self.subject_bits = {}
+        bitmasks = [
+            sum(1 << self.subject_bits.setdefault(subject, len(self.subject_bits)) for subject in set(subject_names(s)))
+            for s in students
+        ]
+        words = max(1, (len(self.subject_bits) + 63) // 64)
+        self.subject_mask = np.empty((self.size, words), dtype=np.uint64)
+        for word in range(words):
+            self.subject_mask[:, word] = np.fromiter(
+                ((m >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for m in bitmasks), dtype=np.uint64, count=self.size
+            )
+
+        self._orders = {}
+
+    def matches(self, students: List[Dict]) -> bool:
+        """Whether this roster was built from the given student list"""
+        return students is self.students and len(students) == self.size
+
+    def _query_mask(self, subjects: Sequence[str]):
+        query = np.zeros(self.subject_mask.shape[1], dtype=np.uint64)
+        for subject in subjects:
+            bit = self.subject_bits.get(subject)
+            if bit is not None:
+                query[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return query
+
+    def filter_mask(self, subjects: Sequence[str] = (), min_progress: float = 0) -> np.ndarray:
+        """Boolean row mask of students taking any of the subjects with at least min_progress"""
+        keep = np.ones(self.size, dtype=bool)
+        if subjects:
+            keep &= (self.subject_mask & self._query_mask(subjects)).any(axis=1)
+        if min_progress > 0:
+            keep &= self.table["progress"].to_numpy() >= min_progress
+        return keep
+
+    def order(self, sort_by: str) -> np.ndarray:
+        """Row positions in the order of a Student Overview sort option"""
+        if sort_by not in self._orders:
+            column, descending = SORT_KEYS.get(sort_by, ("name", False))
+            values = self.table[column].to_numpy()
+            if column == "name":
+                values = values.astype(str)
+            elif column == "last_active":
+                values = values.astype(np.int64)
+            # Stable sorts keep ties in roster order, like sorted() does
+            self._orders[sort_by] = np.argsort(-values if descending else values, kind="stable")
+        return self._orders[sort_by]
+
+    def query(self, subjects: Sequence[str] = (), min_progress: float = 0, sort_by: str = "Name") -> np.ndarray:
+        """Row positions of the filtered students, sorted"""
+        order = self.order(sort_by)
+        return order[self.filter_mask(subjects, min_progress)[order]]
+
+    def records(self, positions) -> List[Dict]:
+        """Student dicts at the given row positions"""
+        return [self.students[i] for i in positions]
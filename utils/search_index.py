@@ -0,0 +1,530 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.batches import DATA_DIR
+
+# Persisted index over stored roadmaps and feedback
+SEARCH_INDEX_FILE = os.path.join(DATA_DIR, 'search_index.npz')
+
+# Seconds between background scans for records saved by other processes
+SEARCH_REFRESH_S = float(os.getenv("SEARCH_REFRESH_S", "60"))
+
+# Most vocabulary terms a prefix query ("chem*") expands to
+PREFIX_MAX_TERMS = int(os.getenv("SEARCH_PREFIX_MAX_TERMS", "64"))
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Stored record kinds that are indexed, by file name prefix
+INDEXED_KINDS = ('roadmap', 'feedback')
+
+SOURCE_TYPES = ('teacher', 'parent', 'student')
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+logger = logging.getLogger("roadmap_ai.search_index")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_QUERY_TOKEN = re.compile(r"[a-z0-9]+\*?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words and numbers, without stopwords"""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def record_text(kind: str, data: Dict) -> str:
+    """The searchable text of a stored record (dict)"""
+    if kind == 'roadmap':
+        content = data.get('content')
+        return content if isinstance(content, str) else json.dumps(content)
+    return " ".join(part for part in (data.get('content'), data.get('response')) if isinstance(part, str))
+
+
+def snippet(text: str, query: str, width: int = 160) -> str:
+    """A window of text around the first query term it contains"""
+    flat = " ".join(text.split())
+    terms = [t.rstrip('*') for t in _QUERY_TOKEN.findall(query.lower())]
+    lowered = flat.lower()
+    positions = [p for p in (lowered.find(t) for t in terms if t) if p >= 0]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    text = flat[start:start + width]
+    return ("…" if start else "") + text + ("…" if start + width < len(flat) else "")
+
+
+def _encode(strings):
+    """Strings as a UTF-8 bytes array, far smaller on disk than fixed-width unicode"""
+    return np.array([s.encode() for s in strings], dtype=bytes)
+
+
+def _decode(array):
+    return [b.decode() for b in array.tolist()]
+
+
+def _indexed_files(data_dir):
+    """Map of (kind, id) -> modification time for every stored record that is indexed"""
+    if not os.path.exists(data_dir):
+        return {}
+    files = {}
+    for entry in os.scandir(data_dir):
+        kind, _, rest = entry.name.partition('_')
+        if kind in INDEXED_KINDS and rest.endswith('.json'):
+            files[(kind, rest[:-len('.json')])] = entry.stat().st_mtime
+    return files
+
+
+def _term_counts(text):
+    counts = {}
+    for token in tokenize(text):
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+def _index_state(arrays):
+    """In-memory index attributes for saved (or just compacted) index arrays; an empty index for None"""
+    state = {
+        '_terms': {},
+        # Sorted for prefix queries; new terms are appended and sorted in on the next refresh or prefix query
+        '_vocabulary': [],
+        '_vocabulary_sorted': True,
+        '_base_offsets': np.zeros(1, dtype=np.int64),
+        '_base_docs': np.zeros(0, dtype=np.int32),
+        '_base_counts': np.zeros(0, dtype=np.int32),
+        # Postings added since the base: being compacted by save(), and being appended to
+        '_frozen': [],
+        '_delta': {},
+        '_keys': [],
+        '_doc_of': {},
+        '_mtimes': [],
+        '_indexed_mtimes': {},
+        '_students': [],
+        '_kinds': array('b'),
+        '_sources': array('b'),
+        '_lengths': array('i'),
+        '_alive': bytearray(),
+        '_live_docs': 0,
+        '_live_length': 0,
+        '_version': 0,
+        '_dirty': False
+    }
+    if arrays is None:
+        return state
+    terms = arrays['terms'].tolist()
+    if len(terms) > 1 and not (arrays['terms'][:-1] <= arrays['terms'][1:]).all():
+        # Saved before terms were stored in alphabetical order
+        terms_sorted = [terms[i] for i in np.argsort(arrays['terms'])]
+    else:
+        terms_sorted = terms
+    keys = list(zip(arrays['kinds_names'][arrays['kinds']].tolist(), _decode(arrays['ids'])))
+    mtimes = arrays['mtimes'].tolist()
+    lengths = array('i', arrays['lengths'].tobytes())
+    state.update({
+        '_terms': {term: i for i, term in enumerate(terms)},
+        '_vocabulary': terms_sorted,
+        '_base_offsets': arrays['offsets'],
+        '_base_docs': arrays['docs'],
+        '_base_counts': arrays['counts'],
+        '_keys': keys,
+        '_doc_of': {key: doc for doc, key in enumerate(keys)},
+        '_mtimes': mtimes,
+        '_indexed_mtimes': dict(zip(keys, mtimes)),
+        '_students': [s or None for s in _decode(arrays['students'])],
+        '_kinds': array('b', arrays['kinds'].tobytes()),
+        '_sources': array('b', arrays['sources'].tobytes()),
+        '_lengths': lengths,
+        '_alive': bytearray(b'\x01' * len(keys)),
+        '_live_docs': len(keys),
+        '_live_length': int(np.frombuffer(lengths, dtype=np.int32).sum())
+    })
+    return state
+
+
+def _compact(snapshot):
+    """Index arrays for saving from a snapshot taken by SearchIndex.save, without dead documents
+
+    Documents are renumbered in order; terms no live document uses are
+    dropped and the rest renumbered alphabetically, so the saved terms are
+    already the sorted vocabulary. Sorting is left to NumPy, which releases
+    the GIL, so queries in other threads keep running meanwhile.
+    """
+    alive = np.frombuffer(snapshot['alive'], dtype=np.bool_)
+    base_offsets, base_docs, base_counts = snapshot['base']
+    n_terms = len(snapshot['terms'])
+    term_ids, docs, counts = [np.repeat(np.arange(len(base_offsets) - 1), np.diff(base_offsets))], [base_docs], [base_counts]
+    for deltas in snapshot['deltas']:
+        for term, (delta_docs, delta_counts) in deltas.items():
+            term_ids.append(np.full(len(delta_docs), term))
+            docs.append(np.frombuffer(delta_docs, dtype=np.int32))
+            counts.append(np.frombuffer(delta_counts, dtype=np.int32))
+    term_ids, docs, counts = np.concatenate(term_ids), np.concatenate(docs), np.concatenate(counts)
+
+    live = alive[docs]
+    term_ids, docs, counts = term_ids[live], docs[live], counts[live]
+    kept = np.flatnonzero(np.bincount(term_ids, minlength=n_terms))
+    terms = np.array(snapshot['terms'], dtype=str)[kept]
+    alphabetical = np.argsort(terms)
+    new_term = np.empty(n_terms, dtype=np.int64)
+    new_term[kept[alphabetical]] = np.arange(len(kept))
+
+    # Postings grouped by term; documents were numbered in order, so stay sorted within a term
+    term_ids = new_term[term_ids]
+    order = np.argsort(term_ids, kind='stable')
+    docs, counts = docs[order], counts[order]
+    per_term = np.bincount(term_ids, minlength=len(kept))
+    live_docs = np.flatnonzero(alive)
+    new_doc = np.cumsum(alive, dtype=np.int64) - 1
+    return {
+        'terms': terms[alphabetical],
+        'offsets': np.concatenate(([0], np.cumsum(per_term))).astype(np.int64),
+        'docs': new_doc[docs].astype(np.int32),
+        'counts': counts.astype(np.int32),
+        'kinds_names': np.array(INDEXED_KINDS, dtype=str),
+        'kinds': np.frombuffer(snapshot['kinds'], dtype=np.int8)[live_docs],
+        'ids': _encode([snapshot['keys'][d][1] for d in live_docs]),
+        'students': _encode([snapshot['students'][d] or '' for d in live_docs]),
+        'sources': np.frombuffer(snapshot['sources'], dtype=np.int8)[live_docs],
+        'lengths': np.frombuffer(snapshot['lengths'], dtype=np.int32)[live_docs],
+        'mtimes': np.array([snapshot['mtimes'][d] for d in live_docs], dtype=np.float64)
+    }
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking over roadmaps and feedback
+
+    Documents are numbered as they are added. Each term's postings (document
+    numbers and term counts) are a read-only NumPy base, as loaded from
+    disk, plus arrays appended to since; a changed or deleted document is
+    marked dead and left in the postings until the index is next saved.
+    Queries score every matching posting at once with NumPy.
+
+    The lock guards the in-memory index and is held only for work in
+    memory: refresh() scans and reads files outside it, and save() compacts
+    and writes outside it too, swapping the compacted index in afterwards.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_FILE, data_dir: str = DATA_DIR):
+        self.path = path
+        self.data_dir = data_dir
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refresher = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.__dict__.update(_index_state(None))
+
+    def __len__(self):
+        return self._live_docs
+
+    # Building
+
+    def add(self, kind: str, doc_id: str, text: str, student_id: Optional[str] = None,
+            source_type: Optional[str] = None, mtime: Optional[float] = None):
+        """Index a document, replacing any earlier version with the same kind and id"""
+        counts = _term_counts(text)
+        with self._lock:
+            self._add_counts(kind, doc_id, counts, student_id, source_type, mtime)
+
+    def add_record(self, kind: str, data: Dict, mtime: Optional[float] = None):
+        """Index a stored record (dict)"""
+        self.add(kind, data.get('id'), record_text(kind, data), data.get('student_id'), data.get('source_type'), mtime)
+
+    def _add_counts(self, kind, doc_id, counts, student_id, source_type, mtime):
+        self.remove(kind, doc_id)
+        doc = len(self._keys)
+        self._keys.append((kind, doc_id))
+        self._doc_of[(kind, doc_id)] = doc
+        self._mtimes.append(mtime or 0.0)
+        self._indexed_mtimes[(kind, doc_id)] = mtime or 0.0
+        self._students.append(student_id)
+        self._kinds.append(INDEXED_KINDS.index(kind))
+        self._sources.append(SOURCE_TYPES.index(source_type) if source_type in SOURCE_TYPES else -1)
+        length = sum(counts.values())
+        self._lengths.append(length)
+        self._alive.append(1)
+        self._live_docs += 1
+        self._live_length += length
+        for token, count in counts.items():
+            term = self._terms.get(token)
+            if term is None:
+                term = self._terms[token] = len(self._terms)
+                self._vocabulary.append(token)
+                self._vocabulary_sorted = False
+            delta = self._delta.get(term)
+            if delta is None:
+                delta = self._delta[term] = (array('i'), array('i'))
+            delta[0].append(doc)
+            delta[1].append(count)
+        self._version += 1
+        self._dirty = True
+
+    def remove(self, kind: str, doc_id: str):
+        """Drop a document from results; its postings go when the index is next saved"""
+        with self._lock:
+            doc = self._doc_of.pop((kind, doc_id), None)
+            self._indexed_mtimes.pop((kind, doc_id), None)
+            if doc is not None and self._alive[doc]:
+                self._alive[doc] = 0
+                self._live_docs -= 1
+                self._live_length -= self._lengths[doc]
+                self._version += 1
+                self._dirty = True
+
+    # Querying
+
+    def _postings(self, term):
+        """Document numbers and term counts of one term, base and appended"""
+        lo, hi = (self._base_offsets[term], self._base_offsets[term + 1]) if term + 1 < len(self._base_offsets) else (0, 0)
+        docs, counts = [self._base_docs[lo:hi]], [self._base_counts[lo:hi]]
+        for deltas in self._frozen + [self._delta]:
+            delta = deltas.get(term)
+            if delta is not None:
+                docs.append(np.frombuffer(delta[0], dtype=np.int32))
+                counts.append(np.frombuffer(delta[1], dtype=np.int32))
+        if len(docs) == 1:
+            return docs[0], counts[0]
+        return np.concatenate(docs), np.concatenate(counts)
+
+    def _sort_vocabulary(self):
+        """Sort terms added since the last sort; one sort per batch of additions, not an insertion per new term"""
+        if not self._vocabulary_sorted:
+            self._vocabulary.sort()
+            self._vocabulary_sorted = True
+
+    def _expand(self, token):
+        """Term numbers for a query token; "chem*" matches every term starting with "chem" """
+        if not token.endswith('*'):
+            term = self._terms.get(token)
+            return [] if term is None else [term]
+        prefix = token[:-1]
+        self._sort_vocabulary()
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for word in self._vocabulary[start:start + PREFIX_MAX_TERMS]:
+            if not word.startswith(prefix):
+                break
+            terms.append(self._terms[word])
+        return terms
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None, source_type: Optional[str] = None,
+               student_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Documents matching any query term, best BM25 score first
+
+        Args:
+            query: Words to look for; a word ending in * matches as a prefix
+            kinds: Only these record kinds ('roadmap', 'feedback')
+            source_type: Only feedback from this source ('teacher', 'parent', 'student')
+            student_id: Only this student's records
+            limit: Most results returned
+
+        Returns:
+            list: {"kind", "id", "student_id", "source_type", "score"} per result
+        """
+        tokens = [t for t in _QUERY_TOKEN.findall(query.lower()) if t.rstrip('*') and t not in STOPWORDS]
+        with self._lock:
+            n_docs = len(self._keys)
+            if not tokens or not self._live_docs:
+                return []
+            # A copy: a view would stop add() from appending until it was garbage collected
+            lengths = np.array(self._lengths, dtype=np.int32)
+            average_length = self._live_length / self._live_docs or 1.0
+            scores = np.zeros(n_docs, dtype=np.float64)
+            for term in {term for token in tokens for term in self._expand(token)}:
+                docs, counts = self._postings(term)
+                idf = math.log(1 + (self._live_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / average_length)
+                scores[docs] += idf * counts * (BM25_K1 + 1) / (counts + norm)
+
+            matches = np.flatnonzero(scores)
+            matches = matches[np.frombuffer(self._alive, dtype=np.bool_)[matches]]
+            if kinds is not None:
+                kind_codes = [INDEXED_KINDS.index(k) for k in kinds]
+                matches = matches[np.isin(np.frombuffer(self._kinds, dtype=np.int8)[matches], kind_codes)]
+            if source_type is not None:
+                matches = matches[np.frombuffer(self._sources, dtype=np.int8)[matches] == SOURCE_TYPES.index(source_type)]
+            if student_id is not None:
+                matches = matches[[self._students[d] == student_id for d in matches]]
+            if len(matches) > limit:
+                matches = matches[np.argpartition(-scores[matches], limit)[:limit]]
+            matches = matches[np.argsort(-scores[matches], kind='stable')]
+            return [
+                {
+                    "kind": self._keys[d][0],
+                    "id": self._keys[d][1],
+                    "student_id": self._students[d],
+                    "source_type": SOURCE_TYPES[self._sources[d]] if self._sources[d] >= 0 else None,
+                    "score": round(float(scores[d]), 3)
+                }
+                for d in matches
+            ]
+
+    # Storage
+
+    def refresh(self, force: bool = False):
+        """Load the saved index on first use, then index records saved or deleted since
+
+        Runs at most every SEARCH_REFRESH_S unless forced, and saves the
+        index when anything changed. Files are scanned and read without
+        holding the lock; each change is applied under it on its own, and
+        only if nothing else has updated that document since the scan.
+
+        Returns:
+            int: Records indexed or removed
+        """
+        with self._refresh_lock:
+            if not self._loaded:
+                self.load()
+            elif not force and time.monotonic() - self._refreshed_at < SEARCH_REFRESH_S:
+                return 0
+            self._refreshed_at = time.monotonic()
+            files = _indexed_files(self.data_dir)
+            with self._lock:
+                indexed = dict(self._indexed_mtimes)
+            changed = [key for key, mtime in files.items() if indexed.get(key) != mtime]
+            deleted = [key for key in indexed if key not in files]
+
+            applied = 0
+            for key in deleted:
+                with self._lock:
+                    if self._indexed_mtimes.get(key) == indexed[key]:
+                        self.remove(*key)
+                        applied += 1
+            for kind, doc_id in changed:
+                try:
+                    with open(os.path.join(self.data_dir, f'{kind}_{doc_id}.json'), 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    # Deleted or half-written since the scan; picked up next time
+                    continue
+                counts = _term_counts(record_text(kind, data))
+                with self._lock:
+                    if self._indexed_mtimes.get((kind, doc_id)) == indexed.get((kind, doc_id)):
+                        mtime = files[(kind, doc_id)]
+                        self._add_counts(kind, doc_id, counts, data.get('student_id'), data.get('source_type'), mtime)
+                        applied += 1
+            with self._lock:
+                self._sort_vocabulary()
+                dirty = self._dirty
+            if dirty:
+                self.save()
+            return applied
+
+    def start(self):
+        """Load the index if needed and keep it current from a background thread
+
+        The thread runs refresh() every SEARCH_REFRESH_S, so queries never
+        wait for a scan of data/storage or a save.
+        """
+        if not self._loaded:
+            with self._refresh_lock:
+                if not self._loaded:
+                    self.load()
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_forever, name="search-index-refresh", daemon=True)
+                self._refresher.start()
+
+    def _refresh_forever(self):
+        while True:
+            try:
+                self.refresh(force=True)
+            except Exception:
+                logger.exception("Search index refresh failed")
+            time.sleep(SEARCH_REFRESH_S)
+
+    def index_saved(self, kind: str, data: Dict, file_path: str):
+        """Index a record DataStore has just written, if this process has the index loaded
+
+        Otherwise the record is picked up by the next refresh.
+        """
+        if self._loaded:
+            self.add_record(kind, data, os.path.getmtime(file_path))
+
+    def load(self):
+        """Replace the in-memory index with the saved one (empty if there is none)"""
+        arrays = None
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                arrays = {name: data[name] for name in data.files}
+        state = _index_state(arrays)
+        with self._lock:
+            self.__dict__.update(state)
+            self._loaded = True
+
+    def save(self):
+        """Write the index, leaving out dead documents, and continue from the compacted index
+
+        Only taking a snapshot holds the lock: postings added so far are
+        frozen (later ones go to a new delta), and the compacted index is
+        swapped in only if no document was added or removed meanwhile.
+        Otherwise it is left dirty and compacted again by the next save.
+        """
+        with self._lock:
+            self._frozen.append(self._delta)
+            self._delta = {}
+            version = self._version
+            snapshot = {
+                'terms': list(self._terms),
+                'base': (self._base_offsets, self._base_docs, self._base_counts),
+                'deltas': list(self._frozen),
+                'alive': bytes(self._alive),
+                'keys': list(self._keys),
+                'students': list(self._students),
+                'mtimes': list(self._mtimes),
+                'kinds': bytes(self._kinds),
+                'sources': bytes(self._sources),
+                'lengths': bytes(self._lengths)
+            }
+            self._dirty = False
+        arrays = _compact(snapshot)
+        state = _index_state(arrays)
+        with self._lock:
+            if self._version == version:
+                self.__dict__.update(state)
+            else:
+                self._dirty = True
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        with self._lock:
+            postings = len(self._base_docs) + sum(
+                len(docs) for deltas in self._frozen + [self._delta] for docs, _ in deltas.values()
+            )
+            return {
+                "documents": self._live_docs,
+                "dead_documents": len(self._keys) - self._live_docs,
+                "terms": len(self._terms),
+                "postings": postings
+            }
+
+
+search_index = SearchIndex()
+
+
+def search(query: str, **filters) -> List[Dict]:
+    """Search stored roadmaps and feedback
+
+    The first search loads the saved index and starts its background
+    refresh; records saved by other processes show up after the next scan.
+    """
+    search_index.start()
+    return search_index.search(query, **filters)
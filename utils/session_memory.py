@@ -0,0 +1,359 @@
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.copy_on_write import CopyOnWriteDict, FrozenDict, FrozenList
+from utils.state import AGENT_CLASSES, DataStore
+
+# How often a session re-measures its own state and sweeps idle sessions
+SESSION_MEMORY_SAMPLE_S = float(os.getenv("SESSION_MEMORY_SAMPLE_S", "30"))
+
+# Sessions without a rerun for this long have their large values moved out
+SESSION_IDLE_S = float(os.getenv("SESSION_IDLE_S", "600"))
+
+# Values at least this large are spilled from idle sessions
+SESSION_SPILL_MIN_BYTES = int(os.getenv("SESSION_SPILL_MIN_BYTES", "32768"))
+
+# Resident session state across all sessions; above it, least recently used sessions spill first
+SESSION_MEMORY_BUDGET_BYTES = int(os.getenv("SESSION_MEMORY_BUDGET_BYTES", str(256 * 2**20)))
+
+# Recreated on demand by get_agent(), so dropped rather than stored
+EVICTABLE_KEYS = tuple(AGENT_CLASSES)
+
+logger = logging.getLogger("roadmap_ai.session_memory")
+
+# Not followed when sizing: shared by every session, or not data at all
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, FrozenDict, FrozenList)
+
+
+def deep_sizeof(value):
+    """Bytes held by a value and everything it references, counting shared objects once
+
+    Frozen sample data (shared across sessions), classes, modules and
+    functions are not counted.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+            attrs = getattr(obj, "__dict__", None)
+            if isinstance(attrs, dict):
+                stack.append(attrs)
+            for slot in getattr(type(obj), "__slots__", ()):
+                if isinstance(slot, str) and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+
+def _spillable(value):
+    """Whether a value survives a JSON round trip unchanged (and unshared)"""
+    if isinstance(value, str):
+        return True
+    if isinstance(value, CopyOnWriteDict):
+        # Reloading would turn the shared sample data into a private copy
+        return False
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def _widget_keys(state):
+    """User keys bound to widgets, which a run may not set and so are never spilled"""
+    mapper = getattr(state, "_key_id_mapper", None)
+    return set(mapper.id_key_mapping.values()) if mapper is not None else set()
+
+
+class SessionRecord:
+    """What the accounting knows about one session"""
+
+    def __init__(self, session_id, state):
+        self.session_id = session_id
+        self.state = state
+        self.sizes = {}
+        self.measured_at = 0.0
+        self.last_run = time.monotonic()
+        self.running = 0
+        self.spilled = {}
+        self.evicted = []
+        self.spill_requested = False
+
+    @property
+    def total_bytes(self):
+        return sum(self.sizes.values())
+
+    def to_dict(self):
+        largest = max(self.sizes.items(), key=lambda item: item[1], default=(None, 0))
+        return {
+            "session_id": self.session_id,
+            "total_bytes": self.total_bytes,
+            "keys": len(self.sizes),
+            "largest_key": largest[0],
+            "largest_bytes": largest[1],
+            "idle_s": round(time.monotonic() - self.last_run, 1),
+            "spilled_bytes": sum(self.spilled.values()),
+            "spilled_keys": sorted(self.spilled),
+            "spill_requested": self.spill_requested,
+            "evicted_keys": list(self.evicted)
+        }
+
+
+class SessionMemory:
+    """Per-session state sizes, with spill-to-DataStore for idle sessions
+
+    Each session measures its own state at most every sample interval. A
+    sweep then marks idle sessions and asks them to rerun; at the end of that
+    run the session moves its large JSON-serialisable, non-widget values into
+    DataStore and drops its agents, and both come back on its next run. If
+    sessions still hold more than the budget, the least recently used
+    sessions that are not mid-run are marked too, idle or not, and spill at
+    the end of their next run.
+    """
+
+    def __init__(self, sample_s=SESSION_MEMORY_SAMPLE_S, idle_s=SESSION_IDLE_S,
+                 spill_min_bytes=SESSION_SPILL_MIN_BYTES, budget_bytes=SESSION_MEMORY_BUDGET_BYTES):
+        self.sample_s = sample_s
+        self.idle_s = idle_s
+        self.spill_min_bytes = spill_min_bytes
+        self.budget_bytes = budget_bytes
+        self._sessions = {}
+        self._lock = threading.RLock()
+        self._swept_at = 0.0
+        self.spills = 0
+        self.restores = 0
+
+    def _current(self):
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return None
+        # Each run wraps the session's SessionState in a new SafeSessionState,
+        # so hold on to the SessionState itself, which lives as long as the session
+        state = getattr(ctx.session_state, "_state", ctx.session_state)
+        with self._lock:
+            record = self._sessions.get(ctx.session_id)
+            if record is None or record.state is not state:
+                record = self._sessions[ctx.session_id] = SessionRecord(ctx.session_id, state)
+        return record
+
+    def start_run(self, full=False):
+        """Mark the current session as running and bring back anything it spilled
+
+        Fragments start nested runs; a full run resets the count, since a run
+        stopped by st.rerun() never reaches end_run().
+        """
+        record = self._current()
+        if record is None:
+            return
+        with self._lock:
+            record.running = 1 if full else record.running + 1
+            # A rerun asked for by the sweep doesn't make the session active
+            if not record.spill_requested:
+                record.last_run = time.monotonic()
+            spilled, record.spilled = record.spilled, {}
+            record.evicted = []
+        if spilled:
+            values = DataStore.pop_session_values(record.session_id)
+            for key, value in values.items():
+                st.session_state[key] = value
+            self.restores += 1
+
+    def end_run(self):
+        """Re-measure the current session if due, spill it if marked, then sweep other sessions if due"""
+        record = self._current()
+        if record is None:
+            return
+        now = time.monotonic()
+        if now - record.measured_at >= self.sample_s:
+            self.measure(record)
+        with self._lock:
+            record.running = max(0, record.running - 1)
+            spill = record.spill_requested and not record.running
+            if not spill:
+                record.last_run = now
+            sweep = now - self._swept_at >= self.sample_s
+            if sweep:
+                self._swept_at = now
+        if spill:
+            self.spill(record)
+        if sweep:
+            self.sweep()
+
+    def measure_current(self):
+        record = self._current()
+        if record is not None:
+            self.measure(record)
+
+    def measure(self, record):
+        sizes = {key: deep_sizeof(value) for key, value in record.state.filtered_state.items()}
+        with self._lock:
+            record.sizes = sizes
+            record.measured_at = time.monotonic()
+
+    def _closed(self, record, now):
+        """Whether a session has gone; disconnected ones are closed by Streamlit well before idle_s"""
+        if not Runtime.exists() or now - record.last_run < self.idle_s:
+            return False
+        return not Runtime.instance().is_active_session(record.session_id)
+
+    def _wake(self, record):
+        """Ask a session to rerun so it can spill for itself; returns whether it will
+
+        Streamlit's own file watcher requests reruns from its thread the same way.
+        """
+        if not Runtime.exists():
+            return False
+        info = Runtime.instance()._session_mgr.get_active_session_info(record.session_id)
+        if info is None:
+            return False
+        info.session.request_rerun(None)
+        return True
+
+    def sweep(self):
+        """Mark idle sessions, then least recently used ones while over budget, for spilling
+
+        Session state is only touched by its own session: marked sessions are
+        asked to rerun, and spill at the end of that run.
+
+        Returns:
+            int: Sessions marked for spilling
+        """
+        now = time.monotonic()
+        with self._lock:
+            closed = [r for r in self._sessions.values() if self._closed(r, now)]
+            for record in closed:
+                del self._sessions[record.session_id]
+            records = sorted(
+                (r for r in self._sessions.values()
+                 if not (r.running or r.spill_requested or r.spilled or r.evicted)),
+                key=lambda r: r.last_run
+            )
+            resident = sum(r.total_bytes for r in self._sessions.values() if not r.spill_requested)
+
+        for record in closed:
+            if record.spilled:
+                DataStore.delete_session_values(record.session_id)
+
+        marked, freed = 0, 0
+        for record in records:
+            idle = now - record.last_run >= self.idle_s
+            if not idle and resident - freed <= self.budget_bytes:
+                break
+            with self._lock:
+                record.spill_requested = True
+            if idle and not self._wake(record):
+                with self._lock:
+                    record.spill_requested = False
+                continue
+            marked += 1
+            freed += record.total_bytes
+        return marked
+
+    def spill(self, record):
+        """Move the current session's large values to DataStore and drop its agents; returns bytes freed
+
+        Only called from the session's own run; widget values stay, since
+        Streamlit won't let a run set a widget's key.
+        """
+        self.measure(record)
+        with self._lock:
+            record.spill_requested = False
+            sizes = dict(record.sizes)
+        widget_keys = _widget_keys(record.state)
+        values, evicted, freed = {}, [], 0
+        for key, size in sizes.items():
+            if key not in st.session_state or key in widget_keys:
+                continue
+            if key in EVICTABLE_KEYS:
+                del st.session_state[key]
+                evicted.append(key)
+                freed += size
+            elif size >= self.spill_min_bytes and _spillable(st.session_state[key]):
+                values[key] = st.session_state[key]
+        if values:
+            DataStore.save_session_values(record.session_id, {**DataStore.get_session_values(record.session_id), **values})
+            for key in values:
+                del st.session_state[key]
+                freed += sizes[key]
+        with self._lock:
+            for key in evicted:
+                record.sizes.pop(key, None)
+            for key in values:
+                record.spilled[key] = record.sizes.pop(key, sizes[key])
+            record.evicted.extend(evicted)
+        if freed:
+            self.spills += 1
+            logger.info(json.dumps({
+                "event": "session_spill",
+                "session_id": record.session_id,
+                "spilled": sorted(values),
+                "evicted": evicted,
+                "freed_bytes": freed
+            }))
+        return freed
+
+    def sessions(self):
+        """Per-session accounting, largest first"""
+        with self._lock:
+            records = list(self._sessions.values())
+            return sorted((r.to_dict() for r in records), key=lambda r: -r["total_bytes"])
+
+    def key_sizes(self, session_id):
+        """Bytes per state key for one session, largest first"""
+        with self._lock:
+            record = self._sessions.get(session_id)
+            sizes = dict(record.sizes) if record else {}
+        return sorted(sizes.items(), key=lambda item: -item[1])
+
+    def stats(self):
+        with self._lock:
+            records = list(self._sessions.values())
+            return {
+                "sessions": len(records),
+                "resident_bytes": sum(r.total_bytes for r in records),
+                "spilled_bytes": sum(sum(r.spilled.values()) for r in records),
+                "budget_bytes": self.budget_bytes,
+                "idle_s": self.idle_s,
+                "spills": self.spills,
+                "restores": self.restores
+            }
+
+
+session_memory = SessionMemory()
+
+
+def session_fragment(func):
+    """st.fragment that first restores the session's spilled values
+
+    Fragment reruns skip app.main(), so they restore for themselves.
+    """
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        session_memory.start_run()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session_memory.end_run()
+    return st.fragment(run)
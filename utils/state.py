@@ -3,7 +3,155 @@ import json
 import os
 from datetime import datetime
 import uuid
+import importlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from utils.batches import FeedbackBatch
 from utils.data_models import Student, Roadmap, Progress, Feedback
+from utils.progress_summary import ProgressSummary
+from utils.search_index import search_index
+
+try:
+    import fcntl
+except ImportError:
+    # No record locks (Windows): summaries are then only safe with a single writing process
+    fcntl = None
+
+# Records kept in memory across all sessions; least recently used are dropped
+RECORD_CACHE_MAX_ENTRIES = int(os.getenv("RECORD_CACHE_MAX_ENTRIES", "2048"))
+
+# Record ids also kept in the URL, so a reload or reconnect finds the session's records again
+URL_ID_KEYS = ('student_id', 'roadmap_id')
+
+# Student id of every progress summary save, one per line; its size versions the summaries,
+# so roster views can tell their cached scores are stale and which students changed
+SUMMARIES_LOG_FILE = 'data/storage/summaries_log'
+
+# Lock file whose bytes stand for groups of students, locked while one's summary is updated
+SUMMARIES_LOCK_FILE = 'data/storage/summaries.lock'
+
+# Number of student groups, and so of summary updates that can run at once
+SUMMARY_LOCK_STRIPES = 1024
+
+class RecordCache:
+    """Process-wide LRU cache of records loaded by DataStore, keyed by file path
+    
+    Every session reading a record gets the same object, so callers must treat
+    records as read-only and save a changed copy. Each hit checks the file's
+    modification time, so writes from other processes are picked up.
+    """
+    
+    def __init__(self, max_entries=RECORD_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, file_path, model):
+        """Load a record, from memory if the file has not changed"""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            self.discard(file_path)
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        with open(file_path, 'r') as f:
+            record = model.from_dict(json.load(f))
+        self._store(file_path, version, record)
+        return record
+    
+    def put(self, file_path, record):
+        """Remember a record that was just written to file_path"""
+        stat = os.stat(file_path)
+        self._store(file_path, (stat.st_mtime_ns, stat.st_size), record)
+    
+    def discard(self, file_path):
+        with self._lock:
+            self._entries.pop(file_path, None)
+    
+    def _store(self, file_path, version, record):
+        with self._lock:
+            self._entries[file_path] = (version, record)
+            self._entries.move_to_end(file_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+record_cache = RecordCache()
+
+# Summaries as last written by this process, so the next update skips reading and parsing the file.
+# Only used while holding the student's summary lock, which makes the objects safe to change in place
+summary_cache = RecordCache()
+
+class SummaryLocks:
+    """Per-student locks around progress summary updates, across threads and processes
+    
+    Students hash onto stripes; a stripe is a threading lock plus a lockf
+    lock on one byte of the lock file. The file stays open for the life of
+    the process, since closing any descriptor of a file drops all of the
+    process's record locks on it.
+    """
+    
+    def __init__(self, path=SUMMARIES_LOCK_FILE, stripes=SUMMARY_LOCK_STRIPES):
+        self.path = path
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._files = {}
+        self._files_lock = threading.Lock()
+    
+    def _fileno(self):
+        # Keyed by absolute path, so a process that changes directory locks the right store
+        path = os.path.abspath(self.path)
+        with self._files_lock:
+            if path not in self._files:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._files[path] = open(path, 'a+b')
+            return self._files[path].fileno()
+    
+    @contextmanager
+    def hold(self, student_id):
+        """Hold the lock on one student's summary"""
+        stripe = zlib.crc32(str(student_id).encode()) % self.stripes
+        with self._locks[stripe]:
+            if fcntl is None:
+                yield
+                return
+            fd = self._fileno()
+            fcntl.lockf(fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, stripe)
+
+summary_locks = SummaryLocks()
 
 class SessionState:
     """Helper class for managing session state across different pages"""
@@ -71,21 +219,14 @@ class DataStore:
         
         with open(file_path, 'w') as f:
             json.dump(student.to_dict(), f, indent=2)
+        record_cache.put(file_path, student)
             
         return student.id
     
     @staticmethod
     def get_student(student_id):
         """Get student data"""
-        file_path = f'data/storage/student_{student_id}.json'
-        
-        if not os.path.exists(file_path):
-            return None
-            
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            
-        return Student.from_dict(data)
+        return record_cache.get(f'data/storage/student_{student_id}.json', Student)
     
     @staticmethod
     def save_roadmap(roadmap):
@@ -102,23 +243,18 @@ class DataStore:
             
         file_path = f'data/storage/roadmap_{roadmap.id}.json'
         
+        data = roadmap.to_dict()
         with open(file_path, 'w') as f:
-            json.dump(roadmap.to_dict(), f, indent=2)
+            json.dump(data, f, indent=2)
+        record_cache.put(file_path, roadmap)
+        search_index.index_saved('roadmap', data, file_path)
             
         return roadmap.id
     
     @staticmethod
     def get_roadmap(roadmap_id):
         """Get roadmap data"""
-        file_path = f'data/storage/roadmap_{roadmap_id}.json'
-        
-        if not os.path.exists(file_path):
-            return None
-            
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            
-        return Roadmap.from_dict(data)
+        return record_cache.get(f'data/storage/roadmap_{roadmap_id}.json', Roadmap)
     
     @staticmethod
     def get_student_roadmap(student_id):
@@ -161,24 +297,30 @@ class DataStore:
         progress.updated_at = datetime.now()
             
         file_path = f'data/storage/progress_{progress.id}.json'
+        is_new = not os.path.exists(file_path)
         
         with open(file_path, 'w') as f:
             json.dump(progress.to_dict(), f, indent=2)
+        record_cache.put(file_path, progress)
+        
+        # Keep the student's running aggregates current; an edited entry
+        # cannot be subtracted out, so its summary is rebuilt instead
+        if is_new:
+            with summary_locks.hold(progress.student_id):
+                file_path = f'data/storage/summary_{progress.student_id}.json'
+                summary = summary_cache.get(file_path, ProgressSummary) or ProgressSummary(progress.student_id)
+                # Forgotten until saved, so a failed save can't leave an update that is not on disk
+                summary_cache.discard(file_path)
+                DataStore._save_progress_summary(summary.update(progress))
+        else:
+            DataStore.rebuild_progress_summary(progress.student_id)
             
         return progress.id
     
     @staticmethod
     def get_progress(progress_id):
         """Get progress data"""
-        file_path = f'data/storage/progress_{progress_id}.json'
-        
-        if not os.path.exists(file_path):
-            return None
-            
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            
-        return Progress.from_dict(data)
+        return record_cache.get(f'data/storage/progress_{progress_id}.json', Progress)
     
     @staticmethod
     def get_student_progress(student_id, roadmap_id=None):
@@ -207,6 +349,92 @@ class DataStore:
         # Return the most recent progress
         return sorted(progress_entries, key=lambda p: p.updated_at, reverse=True)[0]
     
+    @staticmethod
+    def get_student_progress_history(student_id, roadmap_id=None):
+        """Get every progress update for a student, oldest first"""
+        data_dir = 'data/storage'
+        
+        if not os.path.exists(data_dir):
+            return []
+            
+        progress_entries = []
+        
+        for filename in os.listdir(data_dir):
+            if filename.startswith('progress_') and filename.endswith('.json'):
+                file_path = os.path.join(data_dir, filename)
+                
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                    
+                if data.get('student_id') == student_id:
+                    if roadmap_id is None or data.get('roadmap_id') == roadmap_id:
+                        progress_entries.append(Progress.from_dict(data))
+        
+        return sorted(progress_entries, key=lambda p: p.updated_at)
+    
+    @staticmethod
+    def _save_progress_summary(summary):
+        """Save a student's progress summary; callers hold the student's summary lock"""
+        DataStore._ensure_data_dir()
+        
+        file_path = f'data/storage/summary_{summary.student_id}.json'
+        
+        # Written whole and swapped in, so readers never see a partly written summary;
+        # compact, since json only uses its C encoder without indent
+        tmp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(summary.to_dict(), separators=(',', ':')))
+        os.replace(tmp_path, file_path)
+        summary_cache.put(file_path, summary)
+        
+        # One write in append mode, so lines from other threads and processes never interleave
+        with open(SUMMARIES_LOG_FILE, 'a') as f:
+            f.write(f'{summary.student_id}\n')
+    
+    @staticmethod
+    def get_summaries_version():
+        """Bytes in the summaries log, which grows with every progress summary save (0 before the first)"""
+        try:
+            return os.path.getsize(SUMMARIES_LOG_FILE)
+        except FileNotFoundError:
+            return 0
+    
+    @staticmethod
+    def get_summaries_saved_since(version):
+        """Ids of students whose summary was saved after a given version, and the version they bring it to"""
+        try:
+            with open(SUMMARIES_LOG_FILE, 'rb') as f:
+                f.seek(version)
+                data = f.read()
+        except FileNotFoundError:
+            return set(), 0
+        # A save may be mid-append; its line is picked up next time
+        data = data[:data.rfind(b'\n') + 1]
+        return set(data.decode().split()), version + len(data)
+    
+    @staticmethod
+    def get_progress_summary(student_id):
+        """Get the running progress aggregates for a student"""
+        file_path = f'data/storage/summary_{student_id}.json'
+        
+        if not os.path.exists(file_path):
+            return None
+            
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+            
+        return ProgressSummary.from_dict(data)
+    
+    @staticmethod
+    def rebuild_progress_summary(student_id):
+        """Recompute a student's progress summary from their full history"""
+        with summary_locks.hold(student_id):
+            summary = ProgressSummary(student_id)
+            for progress in DataStore.get_student_progress_history(student_id):
+                summary.update(progress)
+            DataStore._save_progress_summary(summary)
+        return summary
+    
     @staticmethod
     def save_feedback(feedback):
         """Save feedback data"""
@@ -220,23 +448,47 @@ class DataStore:
             
         file_path = f'data/storage/feedback_{feedback.id}.json'
         
+        data = feedback.to_dict()
         with open(file_path, 'w') as f:
-            json.dump(feedback.to_dict(), f, indent=2)
+            json.dump(data, f, indent=2)
+        record_cache.put(file_path, feedback)
+        search_index.index_saved('feedback', data, file_path)
             
         return feedback.id
     
     @staticmethod
     def get_feedback(feedback_id):
         """Get feedback data"""
-        file_path = f'data/storage/feedback_{feedback_id}.json'
+        return record_cache.get(f'data/storage/feedback_{feedback_id}.json', Feedback)
+    
+    @staticmethod
+    def save_analysis(analysis):
+        """Save an agent's analysis (of progress, or reconciling feedback)
         
-        if not os.path.exists(file_path):
-            return None
+        Analyses are stored as Feedback records under their own file prefix, so
+        the feedback readers (latest_feedback, FeedbackBatch, rollups and the
+        search index) never mistake them for feedback someone gave.
+        """
+        DataStore._ensure_data_dir()
+        
+        if not isinstance(analysis, Feedback):
+            analysis = Feedback.from_dict(analysis)
             
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        if not analysis.id:
+            analysis.id = str(uuid.uuid4())
             
-        return Feedback.from_dict(data)
+        file_path = f'data/storage/analysis_{analysis.id}.json'
+        
+        with open(file_path, 'w') as f:
+            json.dump(analysis.to_dict(), f, indent=2)
+        record_cache.put(file_path, analysis)
+            
+        return analysis.id
+    
+    @staticmethod
+    def get_analysis(analysis_id):
+        """Get an agent's analysis"""
+        return record_cache.get(f'data/storage/analysis_{analysis_id}.json', Feedback)
     
     @staticmethod
     def get_roadmap_feedback(roadmap_id):
@@ -261,47 +513,198 @@ class DataStore:
         # Return feedback sorted by creation time
         return sorted(feedback_entries, key=lambda f: f.created_at)
 
-# Add the missing functions here that are imported in app.py
+    @staticmethod
+    def save_session_values(session_id, values):
+        """Save session state values spilled out of memory"""
+        DataStore._ensure_data_dir()
 
-def initialize_session_state():
-    """Initialize the session state variables needed for the application"""
-    # Initialize user if not already done
-    SessionState.get_current_user()
-    
-    # Initialize other common session state variables
-    if 'student_data' not in st.session_state:
-        st.session_state.student_data = {}
+        file_path = f'data/storage/session_{session_id}.json'
+
+        with open(file_path, 'w') as f:
+            json.dump(values, f)
+
+    @staticmethod
+    def get_session_values(session_id):
+        """Get a session's spilled values (empty if none)"""
+        file_path = f'data/storage/session_{session_id}.json'
+
+        if not os.path.exists(file_path):
+            return {}
+
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def pop_session_values(session_id):
+        """Get a session's spilled values and remove them from storage"""
+        values = DataStore.get_session_values(session_id)
+        DataStore.delete_session_values(session_id)
+        return values
+
+    @staticmethod
+    def delete_session_values(session_id):
+        """Remove a session's spilled values"""
+        file_path = f'data/storage/session_{session_id}.json'
+
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+# Agent classes by session state key, imported only when first requested
+AGENT_CLASSES = {
+    'roadmap_agent': ('agents.roadmap_agent', 'RoadmapAgent'),
+    'monitor_agent': ('agents.monitor_agent', 'MonitorAgent'),
+    'feedback_agent': ('agents.feedback_agent', 'FeedbackAgent')
+}
+
+def get_agent(name):
+    """Get an agent from session state, importing and constructing it on first use
     
-    if 'roadmap' not in st.session_state:
-        st.session_state.roadmap = None
+    Args:
+        name: Session state key of the agent ('roadmap_agent', 'monitor_agent', 'feedback_agent')
+        
+    Returns:
+        BaseAgent: The session's agent, created with the model selected in the sidebar
+    """
+    if name not in st.session_state:
+        module_name, class_name = AGENT_CLASSES[name]
+        agent_class = getattr(importlib.import_module(module_name), class_name)
+        st.session_state[name] = agent_class(model_name=st.session_state.get('model_selection'))
+    return st.session_state[name]
+
+def remember_id(key, record_id):
+    """Keep a record id in session state, and in the URL for the keys in URL_ID_KEYS"""
+    st.session_state[key] = record_id
+    if key in URL_ID_KEYS:
+        st.query_params[key] = record_id
+
+def forget_id(key):
+    """Drop a record id from session state and the URL"""
+    st.session_state.pop(key, None)
+    if key in st.query_params:
+        del st.query_params[key]
+
+def session_record(key, data_type):
+    """Load the record whose id the session keeps under key, or None
     
-    if 'progress_data' not in st.session_state:
-        st.session_state.progress_data = {}
+    The record comes from the cache shared by all sessions, so it must not be edited.
+    """
+    record_id = st.session_state.get(key)
+    return load_state(record_id, data_type) if record_id else None
+
+def current_student_id():
+    """Get the session's student id, saving the student's information first if needed"""
+    if 'student_id' not in st.session_state:
+        remember_id('student_id', save_state(st.session_state.get('student_data', {}), 'student'))
+    return st.session_state.student_id
+
+def current_roadmap():
+    """Get the roadmap record the session is viewing, or None"""
+    return session_record('roadmap_id', 'roadmap')
+
+def save_current_roadmap(content):
+    """Save roadmap content for the session's student as the next version of its roadmap
     
-    if 'progress_analysis' not in st.session_state:
-        st.session_state.progress_analysis = None
+    Args:
+        content: Markdown of the roadmap
+        
+    Returns:
+        Roadmap: The saved record
+    """
+    current = current_roadmap()
+    roadmap = Roadmap(
+        id=current.id if current else None,
+        student_id=current.student_id if current else current_student_id(),
+        content=content,
+        created_at=current.created_at if current else None,
+        version=current.version + 1 if current else 1
+    )
+    remember_id('roadmap_id', save_state(roadmap, 'roadmap'))
+    return roadmap
+
+def save_session_feedback(key, source_type, content, response, source_id=None):
+    """Save feedback on the session's roadmap and keep its id under key
     
-    if 'teacher_feedback' not in st.session_state:
-        st.session_state.teacher_feedback = None
+    Args:
+        key: Session state key for the feedback id
+        source_type: Who gave the feedback ('teacher', 'parent' or 'student')
+        content: The feedback itself
+        response: The agent's analysis of it
+        source_id: Id of whatever the feedback came from, if any
+        
+    Returns:
+        Feedback: The saved record
+    """
+    roadmap = current_roadmap()
+    feedback = Feedback(
+        id=None,
+        student_id=roadmap.student_id if roadmap else st.session_state.get('student_id'),
+        roadmap_id=roadmap.id if roadmap else None,
+        source_type=source_type,
+        source_id=source_id or SessionState.get_current_user().get('id'),
+        content=content,
+        processed=response is not None,
+        response=response
+    )
+    remember_id(key, save_state(feedback, 'feedback'))
+    return feedback
+
+def save_session_analysis(key, source_type, response, source_id=None):
+    """Save an agent's analysis for the session's roadmap and keep its id under key
     
-    if 'parent_feedback' not in st.session_state:
-        st.session_state.parent_feedback = None
+    Args:
+        key: Session state key for the analysis id
+        source_type: Whose input was analyzed ('student' progress, 'parent' feedback reconciled)
+        response: The agent's analysis
+        source_id: Id of the record that was analyzed
+        
+    Returns:
+        Feedback: The saved record
+    """
+    roadmap = current_roadmap()
+    analysis = Feedback(
+        id=None,
+        student_id=roadmap.student_id if roadmap else st.session_state.get('student_id'),
+        roadmap_id=roadmap.id if roadmap else None,
+        source_type=source_type,
+        source_id=source_id,
+        content="",
+        processed=True,
+        response=response
+    )
+    remember_id(key, save_state(analysis, 'analysis'))
+    return analysis
+
+def latest_feedback(roadmap_id, source_type):
+    """Get the most recent feedback of one type on a roadmap, from any session"""
+    feedback = FeedbackBatch.from_storage(roadmap_id=roadmap_id)
+    latest = feedback.latest(source_type)
+    return feedback.record(latest) if latest is not None else None
+
+def initialize_session_state():
+    """Initialize the session state variables needed for the application
     
-    if 'feedback_response' not in st.session_state:
-        st.session_state.feedback_response = None
+    Records (roadmaps, progress, feedback) stay in DataStore; the session only
+    keeps their ids, restored from the URL after a reload or reconnect.
+    """
+    # Initialize user if not already done
+    SessionState.get_current_user()
     
-    if 'parent_response' not in st.session_state:
-        st.session_state.parent_response = None
+    # Initialize other common session state variables
+    if 'student_data' not in st.session_state:
+        st.session_state.student_data = {}
     
-    if 'reconciled_feedback' not in st.session_state:
-        st.session_state.reconciled_feedback = None
+    # Ids from the URL become file names, so anything else is ignored
+    for key in URL_ID_KEYS:
+        record_id = st.query_params.get(key)
+        if key not in st.session_state and record_id and re.fullmatch(r'[\w-]+', record_id):
+            st.session_state[key] = record_id
 
 def save_state(data, data_type='student'):
     """Save the current state to persistent storage
     
     Args:
         data: The data to save
-        data_type: Type of data ('student', 'roadmap', 'progress', 'feedback')
+        data_type: Type of data ('student', 'roadmap', 'progress', 'feedback', 'analysis')
         
     Returns:
         str: ID of the saved data
@@ -314,6 +717,8 @@ def save_state(data, data_type='student'):
         return DataStore.save_progress(data)
     elif data_type == 'feedback':
         return DataStore.save_feedback(data)
+    elif data_type == 'analysis':
+        return DataStore.save_analysis(data)
     else:
         raise ValueError(f"Unsupported data type: {data_type}")
 
@@ -322,7 +727,7 @@ def load_state(id, data_type='student'):
     
     Args:
         id: The ID of the data to load
-        data_type: Type of data ('student', 'roadmap', 'progress', 'feedback')
+        data_type: Type of data ('student', 'roadmap', 'progress', 'feedback', 'analysis')
         
     Returns:
         Object: The loaded data or None if not found
@@ -335,5 +740,7 @@ def load_state(id, data_type='student'):
         return DataStore.get_progress(id)
     elif data_type == 'feedback':
         return DataStore.get_feedback(id)
+    elif data_type == 'analysis':
+        return DataStore.get_analysis(id)
     else:
         raise ValueError(f"Unsupported data type: {data_type}")
\ No newline at end of file
@@ -0,0 +1,174 @@
+import json
+import logging
+import math
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+# Structured (JSON) log of every agent call
+logger = logging.getLogger("roadmap_ai.telemetry")
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) when the API reports no usage"""
+    if not text:
+        return 0
+    return max(1, math.ceil(len(text) / 4))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class CallRecord:
+    """Telemetry for a single LLM call made by an agent"""
+
+    def __init__(
+        self,
+        agent: str,
+        method: str,
+        model: str,
+        tokens_in: int = 0,
+        tokens_out: int = 0,
+        wall_ms: float = 0.0,
+        ttft_ms: float = None,
+        cache_hit: bool = False,
+        tokens_estimated: bool = False,
+        error: str = None,
+        timestamp: datetime = None,
+        baseline_model: str = None,
+        fallback_from: str = None,
+        cost_usd: float = None,
+        cost_saved_usd: float = None,
+        latency_saved_ms: float = None
+    ):
+        self.agent = agent
+        self.method = method
+        self.model = model
+        self.tokens_in = tokens_in
+        self.tokens_out = tokens_out
+        self.wall_ms = wall_ms
+        self.ttft_ms = ttft_ms
+        self.cache_hit = cache_hit
+        self.tokens_estimated = tokens_estimated
+        self.error = error
+        self.timestamp = timestamp or datetime.now()
+        # Model routing: what the call would have used, and the estimated savings
+        self.baseline_model = baseline_model
+        self.fallback_from = fallback_from
+        self.cost_usd = cost_usd
+        self.cost_saved_usd = cost_saved_usd
+        self.latency_saved_ms = latency_saved_ms
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {
+            "agent": self.agent,
+            "method": self.method,
+            "model": self.model,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "wall_ms": round(self.wall_ms, 2),
+            "ttft_ms": round(self.ttft_ms, 2) if self.ttft_ms is not None else None,
+            "cache_hit": self.cache_hit,
+            "tokens_estimated": self.tokens_estimated,
+            "error": self.error,
+            "timestamp": self.timestamp.isoformat(),
+            "baseline_model": self.baseline_model,
+            "fallback_from": self.fallback_from,
+            "cost_usd": self.cost_usd,
+            "cost_saved_usd": self.cost_saved_usd,
+            "latency_saved_ms": round(self.latency_saved_ms, 2) if self.latency_saved_ms is not None else None
+        }
+
+
+class Telemetry:
+    """Process-wide, bounded store of agent call records shared by all sessions"""
+
+    def __init__(self, max_records=5000):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        """Store a call record and emit it as a structured log line"""
+        with self._lock:
+            self._records.append(call)
+        logger.info(json.dumps(call.to_dict()))
+        return call
+
+    def records(self, agent=None, method=None):
+        """Get stored call records, optionally filtered by agent class and method"""
+        with self._lock:
+            records = list(self._records)
+        return [
+            r for r in records
+            if (agent is None or r.agent == agent) and (method is None or r.method == method)
+        ]
+
+    def summary(self):
+        """Summarize latency and token usage per agent method
+
+        Returns:
+            list: One dict per (agent, method) with call counts, p50/p95/p99
+            wall time and time-to-first-token, token totals, cache hit rate and
+            the estimated cost/latency saved by model routing
+        """
+        groups = {}
+        for r in self.records():
+            groups.setdefault((r.agent, r.method), []).append(r)
+
+        rows = []
+        for (agent, method), calls in sorted(groups.items()):
+            wall = [c.wall_ms for c in calls]
+            ttft = [c.ttft_ms for c in calls]
+            rows.append({
+                "agent": agent,
+                "method": method,
+                "models": ", ".join(sorted({c.model for c in calls})),
+                "calls": len(calls),
+                "errors": sum(1 for c in calls if c.error),
+                "p50_ms": percentile(wall, 50),
+                "p95_ms": percentile(wall, 95),
+                "p99_ms": percentile(wall, 99),
+                "ttft_p50_ms": percentile(ttft, 50),
+                "ttft_p95_ms": percentile(ttft, 95),
+                "avg_tokens_in": round(sum(c.tokens_in for c in calls) / len(calls), 1),
+                "avg_tokens_out": round(sum(c.tokens_out for c in calls) / len(calls), 1),
+                "total_tokens": sum(c.tokens_in + c.tokens_out for c in calls),
+                "cache_hit_rate": round(sum(1 for c in calls if c.cache_hit) / len(calls), 3),
+                "fallbacks": sum(1 for c in calls if c.fallback_from),
+                "cost_usd": sum(c.cost_usd or 0 for c in calls),
+                "cost_saved_usd": sum(c.cost_saved_usd or 0 for c in calls),
+                "avg_latency_saved_ms": round(
+                    sum(c.latency_saved_ms or 0 for c in calls) / len(calls), 1
+                )
+            })
+        return rows
+
+    def clear(self):
+        """Drop all stored records"""
+        with self._lock:
+            self._records.clear()
+
+
+def _configure_file_sink():
+    """Append structured telemetry logs to TELEMETRY_LOG_FILE when it is set"""
+    log_file = os.getenv("TELEMETRY_LOG_FILE")
+    if not log_file or any(isinstance(h, logging.FileHandler) for h in logger.handlers):
+        return
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+_configure_file_sink()
+
+# Shared instance used by all agents in this process
+telemetry = Telemetry(max_records=int(os.getenv("TELEMETRY_MAX_RECORDS", "5000")))